@@ -0,0 +1,93 @@
+"""Throughput of AmqpConnector against a local broker stand-in.
+
+The stand-in replaces pika.BlockingConnection with an in-process object that
+charges a fixed cost for the connection handshake, channel opening, each
+publish and each confirm round trip, so the numbers compare connection
+handling rather than a particular RabbitMQ deployment.
+"""
+
+import argparse
+import time
+from unittest import mock
+
+import pika
+
+from qoa4ml.config.configs import AMQPConnectorConfig
+from qoa4ml.connector.amqp_connector import AmqpConnector
+
+
+class StandInChannel:
+    def __init__(self, args):
+        self.args = args
+        self.is_open = True
+        time.sleep(args.channel_ms / 1000)
+
+    def exchange_declare(self, exchange, exchange_type):
+        pass
+
+    def confirm_delivery(self):
+        self.confirm_each = True
+
+    def basic_publish(self, exchange, routing_key, properties, body):
+        time.sleep(self.args.publish_ms / 1000)
+        if getattr(self, "confirm_each", False):
+            time.sleep(self.args.confirm_ms / 1000)
+
+
+class StandInConnection:
+    opened = 0
+
+    def __init__(self, args):
+        self.args = args
+        self.is_open = True
+
+    def __call__(self, parameters):
+        StandInConnection.opened += 1
+        time.sleep(self.args.handshake_ms / 1000)
+        connection = StandInConnection(self.args)
+        return connection
+
+    def channel(self):
+        return StandInChannel(self.args)
+
+    def close(self):
+        self.is_open = False
+
+
+def run(args, name: str, **config_kwargs) -> None:
+    StandInConnection.opened = 0
+    config = AMQPConnectorConfig(
+        end_point="localhost",
+        exchange_name="qoa4ml",
+        exchange_type="topic",
+        out_routing_key="qoa.report.ml",
+        **config_kwargs,
+    )
+    body = '{"metric": 1.0}' * (args.report_size // 15 + 1)
+    with mock.patch.object(pika, "BlockingConnection", StandInConnection(args)):
+        connector = AmqpConnector(config)
+        start = time.perf_counter()
+        for _ in range(args.reports):
+            connector.send_report(body)
+        connector.close()
+        elapsed = time.perf_counter() - start
+    print(
+        f"{name:<32} {args.reports / elapsed:>10.0f} reports/s "
+        f"{elapsed / args.reports * 1e6:>10.1f} us/report "
+        f"{StandInConnection.opened:>6} connections"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", type=int, default=2000)
+    parser.add_argument("--report-size", type=int, default=1024)
+    parser.add_argument("--handshake-ms", type=float, default=2.0)
+    parser.add_argument("--channel-ms", type=float, default=0.5)
+    parser.add_argument("--publish-ms", type=float, default=0.01)
+    parser.add_argument("--confirm-ms", type=float, default=0.2)
+    args = parser.parse_args()
+
+    run(args, "connection per report", persistent_connection=False)
+    run(args, "persistent connection")
+    run(args, "persistent + publisher confirms", publisher_confirms=True)
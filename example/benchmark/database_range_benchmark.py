@@ -0,0 +1,61 @@
+"""Range query time of the NodeAggregator database backends.
+
+Stores hours of 1 Hz node and process points in the TinyFlux and the columnar
+backends, then times a query for the last hour of one process.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from qoa4ml.observability.odop_obs.columnar_database import ColumnarDatabase
+from qoa4ml.observability.odop_obs.embedded_database import EmbeddedDatabase
+
+FIELDS = {
+    "cpu.usage.value": 12.5,
+    "cpu.usage.unit": 3,
+    "mem.usage.value": 2048.0,
+    "mem.usage.unit": 2,
+}
+
+
+def fill(database, hours: int, processes: int) -> float:
+    now = time.time()
+    start = now - hours * 3600
+    begin = time.perf_counter()
+    for second in range(hours * 3600):
+        timestamp = start + second
+        database.insert(timestamp, {"type": "node", "node_name": "node-1"}, FIELDS)
+        for pid in range(processes):
+            database.insert(timestamp, {"type": "process", "pid": str(pid)}, FIELDS)
+    return time.perf_counter() - begin
+
+
+def query(database, repeat: int) -> float:
+    now = time.time()
+    begin = time.perf_counter()
+    for _ in range(repeat):
+        database.query_range(now - 3600, now, {"type": "process", "pid": "0"})
+    return (time.perf_counter() - begin) / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hours", type=int, default=4)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, database in (
+            ("tinyflux", EmbeddedDatabase(Path(tmp) / "node.csv")),
+            ("columnar", ColumnarDatabase(Path(tmp) / "node")),
+        ):
+            insert_time = fill(database, args.hours, args.processes)
+            query_time = query(database, args.repeat)
+            database.close()
+            print(
+                f"{name:<10} insert {insert_time:>8.1f}s "
+                f"last hour of one process {query_time * 1e3:>10.2f}ms"
+            )
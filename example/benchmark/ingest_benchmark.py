@@ -0,0 +1,87 @@
+"""Sustained NodeAggregator ingest rate, per-report inserts vs write-behind batches.
+
+Feeds HPC process reports to process_report, as the collector workers do, and
+times until every point is in the database. A batch size of 1 without the
+writer thread is the synchronous single-point insert NodeAggregator used
+before reports were written in batches.
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from qoa4ml.config.configs import NodeAggregatorConfig
+from qoa4ml.observability.odop_obs.node_aggregator import NodeAggregator
+
+UNIT_CONVERSION = {
+    "cpu": {"usage": {"milicpu": 1, "cputime": 2, "percentage": 3}},
+    "mem": {"Gb": 1, "Mb": 2, "Kb": 3},
+}
+
+
+def process_report(pid: int, timestamp: float) -> str:
+    return json.dumps(
+        {
+            "type": "process",
+            "metadata": {"pid": str(pid), "user": "bench"},
+            "timestamp": timestamp,
+            "cpu": {"usage": {"value": 12.5, "unit": "percentage"}},
+            "mem": {"usage": {"value": 256, "unit": "Mb"}},
+        }
+    )
+
+
+def ingest_rate(
+    backend: str, batch_size: int, background: bool, reports: list
+) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        aggregator = NodeAggregator(
+            NodeAggregatorConfig(
+                socket_collector_config={
+                    "host": "127.0.0.1",
+                    "port": 0,
+                    "backlog": 5,
+                    "bufsize": 4096,
+                },
+                environment="HPC",
+                query_method="GET",
+                data_separator="dot",
+                unit_conversion=UNIT_CONVERSION,
+                database_backend=backend,
+                write_batch_size=batch_size,
+            ),
+            Path(tmp),
+        )
+        if background:
+            aggregator.write_buffer.start()
+        start = time.perf_counter()
+        for report in reports:
+            aggregator.process_report(report)
+        aggregator.write_buffer.stop()
+        elapsed = time.perf_counter() - start
+        aggregator.embedded_database.close()
+        assert aggregator.write_buffer.get_stats()["failed"] == 0
+    return len(reports) / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", type=int, default=20_000)
+    parser.add_argument("--processes", type=int, default=16)
+    args = parser.parse_args()
+
+    now = time.time()
+    reports = [
+        process_report(i % args.processes, now + i / args.processes)
+        for i in range(args.reports)
+    ]
+    for backend in ("tinyflux", "columnar"):
+        for name, batch_size, background in (
+            ("per-report", 1, False),
+            ("batch 100", 100, True),
+            ("batch 500", 500, True),
+        ):
+            rate = ingest_rate(backend, batch_size, background, reports)
+            print(f"{backend:<9} {name:<11} {rate:>10.0f} points/s")
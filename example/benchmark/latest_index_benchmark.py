@@ -0,0 +1,70 @@
+"""Latency of the NodeAggregator latest-metrics query against database size.
+
+Fills an EmbeddedDatabase with points from a fixed set of node and process
+series, then compares the TinyFlux time query that used to answer /metrics
+with the in-memory latest-point index. As in a running aggregator, a report
+is inserted before every query.
+"""
+
+import argparse
+import functools
+import math
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from tinyflux import Point, TimeQuery
+
+from qoa4ml.observability.odop_obs.embedded_database import EmbeddedDatabase
+
+
+def fill(database: EmbeddedDatabase, points: int, series: int) -> None:
+    start = time.time() - points / series
+    batch = []
+    for i in range(points):
+        tags = {"type": "process", "metadata.pid": str(i % series)}
+        point_time = datetime.fromtimestamp(start + i / series)
+        batch.append(Point(time=point_time, tags=tags, fields={"cpu.value": 1.0}))
+        if len(batch) == 10_000:
+            database.db.insert_multiple(batch, compact_key_prefixes=True)
+            database.latest_index.warm(batch)
+            batch = []
+    database.db.insert_multiple(batch, compact_key_prefixes=True)
+    database.latest_index.warm(batch)
+
+
+def time_query(database: EmbeddedDatabase, query, repeat: int) -> float:
+    elapsed = 0.0
+    for _ in range(repeat):
+        database.insert(time.time(), {"type": "node"}, {"cpu.value": 1.0})
+        start = time.perf_counter()
+        query()
+        elapsed += time.perf_counter() - start
+    return elapsed / repeat
+
+
+def scan(database: EmbeddedDatabase) -> list:
+    since = datetime.fromtimestamp(math.floor(time.time()))
+    return database.db.search(TimeQuery() >= since)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--points", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--series", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'points':>10} {'time query':>14} {'index':>12}")
+    for points in args.points:
+        with tempfile.TemporaryDirectory() as tmp:
+            database = EmbeddedDatabase(Path(tmp) / "node.csv", latest_ttl=None)
+            fill(database, points, args.series)
+            scanned = time_query(
+                database, functools.partial(scan, database), args.repeat
+            )
+            indexed = time_query(database, database.get_lastest_timestamp, args.repeat)
+            print(f"{points:>10} {scanned * 1e3:>12.1f}ms {indexed * 1e6:>10.1f}us")
@@ -0,0 +1,51 @@
+"""Per-observation cost of observe_metric.
+
+Compares building and validating a Metric model on every observation with
+recording a slotted MetricRecord that is only validated when the report is
+generated. The reported time includes generate_report, amortised over the
+observations of a report.
+"""
+
+import argparse
+import time
+import uuid
+
+from qoa4ml.config.configs import ClientInfo
+from qoa4ml.lang.common_models import Metric
+from qoa4ml.lang.datamodel_enum import ReportTypeEnum
+from qoa4ml.reports.ml_reports import MLReport
+
+
+def observe_model(report: MLReport, i: int) -> None:
+    report.observe_metric(
+        ReportTypeEnum.service,
+        "gateway",
+        Metric(metric_name=f"metric_{i % 10}", records=[0.1], description=""),
+    )
+
+
+def observe_record(report: MLReport, i: int) -> None:
+    report.record_metric(ReportTypeEnum.service, "gateway", f"metric_{i % 10}", 0.1)
+
+
+def measure(observe, args) -> float:
+    report = MLReport(client_info)
+    start = time.perf_counter()
+    for _ in range(args.reports):
+        for i in range(args.observations):
+            observe(report, i)
+        report.generate_report(reset=True)
+    return (time.perf_counter() - start) / (args.reports * args.observations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", type=int, default=1_000)
+    parser.add_argument("--observations", type=int, default=20)
+    args = parser.parse_args()
+
+    client_info = ClientInfo(
+        name="benchmark", instance_id=str(uuid.uuid4()), functionality="REST"
+    )
+    for name, observe in (("model", observe_model), ("record", observe_record)):
+        print(f"{name:<8} {measure(observe, args) * 1e6:>8.2f}us per observation")
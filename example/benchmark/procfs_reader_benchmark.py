@@ -0,0 +1,54 @@
+"""Probe sampling cost, psutil vs the procfs reader backend.
+
+Times the reads a process and a system probe make on every report: the
+process memory and CPU times, the per-core CPU utilization and the system
+memory, through psutil and through ProcfsReader, which keeps the procfs
+files open and re-reads them with pread.
+"""
+
+import argparse
+import os
+import time
+
+import psutil
+
+from qoa4ml.utils.procfs_reader import ProcfsReader
+
+
+def per_call(function, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - start) / calls
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    pid = os.getpid()
+    process = psutil.Process(pid)
+    reader = ProcfsReader()
+    reads = {
+        "process memory": (process.memory_info, lambda: reader.process_memory(pid)),
+        "process cpu times": (
+            process.cpu_times,
+            lambda: reader.process_cpu_times(pid),
+        ),
+        "per-core cpu util": (
+            lambda: psutil.cpu_percent(percpu=True),
+            reader.system_cpu_util,
+        ),
+        "system memory": (psutil.virtual_memory, reader.system_memory),
+    }
+
+    print(f"{'read':>18} {'psutil us':>10} {'procfs us':>10} {'speedup':>8}")
+    for name, (psutil_read, procfs_read) in reads.items():
+        psutil_time = per_call(psutil_read, args.calls)
+        procfs_time = per_call(procfs_read, args.calls)
+        print(
+            f"{name:>18} {psutil_time * 1e6:>10.2f} {procfs_time * 1e6:>10.2f}"
+            f" {psutil_time / procfs_time:>7.1f}x"
+        )
+    reader.close()
@@ -0,0 +1,70 @@
+"""Prometheus scrape latency of NodeAggregator, rendered per scrape vs cached.
+
+Fills the latest-point index with one system series and a number of process
+series, then times scrapes of the Prometheus endpoint while no new point
+arrives, with the cache and with the payload rendered again for every scrape.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from qoa4ml.config.configs import NodeAggregatorConfig
+from qoa4ml.observability.odop_obs.node_aggregator import NodeAggregator
+
+
+def per_scrape(aggregator: NodeAggregator, scrapes: int, cached: bool) -> float:
+    start = time.perf_counter()
+    for _ in range(scrapes):
+        if not cached:
+            aggregator.prometheus_version = None
+        aggregator.get_prometheus_metrics()
+    return (time.perf_counter() - start) / scrapes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=500)
+    parser.add_argument("--scrapes", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        aggregator = NodeAggregator(
+            NodeAggregatorConfig(
+                socket_collector_config={
+                    "host": "127.0.0.1",
+                    "port": 0,
+                    "backlog": 5,
+                    "bufsize": 4096,
+                },
+                environment="HPC",
+                query_method="GET",
+                data_separator="dot",
+                unit_conversion={"cpu": {"usage": {"percentage": 3}}, "mem": {"Mb": 2}},
+                database_backend="columnar",
+            ),
+            Path(tmp),
+        )
+        now = time.time()
+        fields = {
+            "cpu.usage.value": 12.5,
+            "cpu.usage.unit": 3,
+            "mem.usage.value": 256.0,
+            "mem.usage.unit": 2,
+        }
+        aggregator.embedded_database.insert_multiple(
+            [(now, {"type": "node", "metadata.node_name": "node-1"}, fields)]
+            + [
+                (now, {"type": "process", "metadata.pid": str(pid)}, fields)
+                for pid in range(args.processes)
+            ]
+        )
+        rendered = per_scrape(aggregator, args.scrapes, cached=False)
+        cached = per_scrape(aggregator, args.scrapes, cached=True)
+        print(
+            f"series {args.processes + 1}, payload {len(aggregator.prometheus_payload)} bytes"
+        )
+        print(f"rendered per scrape {rendered * 1e3:>8.3f}ms")
+        print(f"cached              {cached * 1e3:>8.3f}ms")
+        aggregator.embedded_database.close()
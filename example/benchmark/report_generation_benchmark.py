@@ -0,0 +1,60 @@
+"""Report generation time against report size.
+
+Compares generate_report(reset=True), which hands the report off and swaps in
+an empty one, with generate_report(reset=False), which still deep-copies the
+report, for growing predictions and numbers of stages.
+"""
+
+import argparse
+import time
+import uuid
+
+from qoa4ml.config.configs import ClientInfo
+from qoa4ml.lang.common_models import Metric
+from qoa4ml.lang.datamodel_enum import ReportTypeEnum
+from qoa4ml.reports.ml_reports import MLReport
+from qoa4ml.reports.rohe_reports import RoheReport
+
+
+def fill(report, prediction_size: int, stages: int) -> None:
+    for stage in range(stages):
+        report.observe_metric(
+            ReportTypeEnum.service,
+            f"stage_{stage}",
+            Metric(metric_name="response_time", records=[0.1]),
+        )
+    report.observe_inference({"values": [0.5] * prediction_size})
+
+
+def measure(report, reset: bool, args) -> float:
+    elapsed = 0.0
+    for _ in range(args.repeat):
+        fill(report, args.prediction_size, args.stages)
+        start = time.perf_counter()
+        report.generate_report(reset=reset)
+        elapsed += time.perf_counter() - start
+        if not reset:
+            report.reset()
+    return elapsed / args.repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--stages", type=int, default=10)
+    args = parser.parse_args()
+
+    client_info = ClientInfo(
+        name="benchmark", instance_id=str(uuid.uuid4()), functionality="REST"
+    )
+    print(f"{'report':<8} {'prediction':>10} {'deepcopy':>12} {'swap':>12}")
+    for report_cls in (MLReport, RoheReport):
+        for prediction_size in (10, 100, 1_000, 10_000, 100_000):
+            args.prediction_size = prediction_size
+            report = report_cls(client_info)
+            copied = measure(report, False, args)
+            swapped = measure(report, True, args)
+            print(
+                f"{report_cls.__name__:<8} {prediction_size:>10} "
+                f"{copied * 1e6:>10.1f}us {swapped * 1e6:>10.1f}us"
+            )
@@ -0,0 +1,72 @@
+"""Reports per second from a socket connector to the node aggregator collector.
+
+Sends system-probe sized reports to an in-process SocketCollector with a
+connection per report, with a persistent connection, and with a persistent
+connection writing batches of reports at once, and reports how many reports/s
+the collector received.
+"""
+
+import argparse
+import json
+import threading
+import time
+
+from qoa4ml.collector.socket_collector import SocketCollector
+from qoa4ml.config.configs import SocketCollectorConfig, SocketConnectorConfig
+from qoa4ml.connector.socket_connector import SocketConnector
+
+REPORT = json.dumps(
+    {
+        "type": "system",
+        "metadata": {"node_name": "node-1"},
+        "timestamp": time.time(),
+        "cpu": {"usage": {"value": 12.5, "unit": "percentage"}},
+        "mem": {"usage": {"value": 2048, "unit": "Mb"}},
+        "gpu": {"usage": {"value": 40.0, "unit": "percentage"}},
+    }
+)
+
+
+def measure(port: int, received: list, persistent: bool, batch: int, args) -> float:
+    connector = SocketConnector(
+        SocketConnectorConfig(
+            host="127.0.0.1", port=port, persistent_connection=persistent
+        )
+    )
+    received.clear()
+    start = time.perf_counter()
+    for _ in range(args.reports // batch):
+        if batch == 1:
+            connector.send_report(REPORT)
+        else:
+            connector.send_report_batch([REPORT] * batch)
+    while len(received) < args.reports:
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    connector.close()
+    return args.reports / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", type=int, default=20_000)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    received: list = []
+    collector = SocketCollector(
+        SocketCollectorConfig(host="127.0.0.1", port=0, backlog=128, bufsize=65536),
+        received.append,
+    )
+    threading.Thread(target=collector.start_collecting, daemon=True).start()
+    collector.ready.wait()
+    port = collector.server_socket.getsockname()[1]
+
+    for name, persistent, batch in (
+        ("connection per report", False, 1),
+        ("persistent", True, 1),
+        (f"persistent, batch of {args.batch}", True, args.batch),
+    ):
+        rate = measure(port, received, persistent, batch, args)
+        print(f"{name:<28} {rate:>12.0f} reports/s")
+    collector.stop()
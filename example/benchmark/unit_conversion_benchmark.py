@@ -0,0 +1,155 @@
+"""NodeAggregator ingest cost with name-based and planned unit conversion.
+
+Times the unit conversion of a flattened system report, then the full
+process_report ingest of an HPC system report into the columnar backend. The
+name-based conversion is the implementation NodeAggregator used before
+conversion plans were cached per key set.
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from flatten_dict import flatten
+
+from qoa4ml.config.configs import NodeAggregatorConfig
+from qoa4ml.observability.odop_obs.node_aggregator import NodeAggregator
+
+UNIT_CONVERSION = {
+    "cpu": {"usage": {"milicpu": 1, "cputime": 2, "percentage": 3}},
+    "gpu": {"usage": {"percentage": 1}},
+    "mem": {"Gb": 1, "Mb": 2, "Kb": 3},
+    "frequency": {"GHz": 1, "MHz": 2},
+}
+
+
+def system_report(cores: int) -> dict:
+    return {
+        "type": "system",
+        "metadata": {"node_name": "node-1"},
+        "timestamp": time.time(),
+        "cpu": {
+            "metadata": {"frequency": {"value": 3.2, "unit": "GHz"}},
+            "usage": {
+                **{
+                    f"core_{i}": {"value": 12.5, "unit": "percentage"}
+                    for i in range(cores)
+                },
+            },
+        },
+        "gpu": {
+            "metadata": {"frequency": {"value": 1.2, "unit": "GHz"}},
+            "usage": {
+                "core": {"value": 40.0, "unit": "percentage"},
+                "mem": {"value": 512, "unit": "Mb"},
+            },
+        },
+        "mem": {
+            "metadata": {"capacity": {"value": 16, "unit": "Gb"}},
+            "usage": {"value": 2048, "unit": "Mb"},
+        },
+    }
+
+
+def name_based_convert(report: dict) -> dict:
+    converted_report = report
+    for key, value in report.items():
+        if isinstance(value, str):
+            if "frequency" in key:
+                converted_report[key] = UNIT_CONVERSION["frequency"][value]
+            elif "mem" in key:
+                converted_report[key] = UNIT_CONVERSION["mem"][value]
+            elif "cpu" in key:
+                if "usage" in key:
+                    converted_report[key] = UNIT_CONVERSION["cpu"]["usage"][value]
+            elif "gpu" in key:
+                if "usage" in key:
+                    converted_report[key] = UNIT_CONVERSION["gpu"]["usage"][value]
+    return converted_report
+
+
+def name_based_revert(converted_report: dict) -> dict:
+    original_report = converted_report.copy()
+    for key, value in converted_report.items():
+        if "unit" in key:
+            if "frequency" in key:
+                for original_unit, converted_unit in UNIT_CONVERSION[
+                    "frequency"
+                ].items():
+                    if converted_unit == value:
+                        original_report[key] = original_unit
+                        break
+            elif "mem" in key:
+                for original_unit, converted_unit in UNIT_CONVERSION["mem"].items():
+                    if converted_unit == value:
+                        original_report[key] = original_unit
+                        break
+            elif "cpu" in key:
+                if "usage" in key:
+                    for original_unit, converted_unit in UNIT_CONVERSION["cpu"][
+                        "usage"
+                    ].items():
+                        if converted_unit == value:
+                            original_report[key] = original_unit
+                            break
+            elif "gpu" in key:
+                if "usage" in key:
+                    for original_unit, converted_unit in UNIT_CONVERSION["gpu"][
+                        "usage"
+                    ].items():
+                        if converted_unit == value:
+                            original_report[key] = original_unit
+                            break
+    return original_report
+
+
+def per_call(function, reports: list) -> float:
+    start = time.perf_counter()
+    for report in reports:
+        function(report)
+    return (time.perf_counter() - start) / len(reports)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", type=int, default=20_000)
+    parser.add_argument("--cores", type=int, default=32)
+    args = parser.parse_args()
+
+    flat = flatten(system_report(args.cores), "dot")
+    with tempfile.TemporaryDirectory() as tmp:
+        aggregator = NodeAggregator(
+            NodeAggregatorConfig(
+                socket_collector_config={
+                    "host": "127.0.0.1",
+                    "port": 0,
+                    "backlog": 5,
+                    "bufsize": 4096,
+                },
+                environment="HPC",
+                query_method="GET",
+                data_separator="dot",
+                unit_conversion=UNIT_CONVERSION,
+                database_backend="columnar",
+                segment_size=100_000,
+            ),
+            Path(tmp),
+        )
+        converted = aggregator.convert_unit(dict(flat))
+        for name, convert, revert in (
+            ("name-based", name_based_convert, name_based_revert),
+            ("planned", aggregator.convert_unit, aggregator.revert_unit),
+        ):
+            convert_time = per_call(convert, [dict(flat) for _ in range(args.reports)])
+            revert_time = per_call(revert, [converted] * args.reports)
+            print(
+                f"{name:<12} convert {convert_time * 1e6:>8.2f}us revert {revert_time * 1e6:>8.2f}us"
+            )
+
+        reports = [json.dumps(system_report(args.cores)) for _ in range(args.reports)]
+        ingest_time = per_call(aggregator.process_report, reports)
+        print(f"process_report ingest {1 / ingest_time:>10.0f} reports/s")
+        aggregator.flush()
+        aggregator.embedded_database.close()
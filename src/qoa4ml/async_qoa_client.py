@@ -0,0 +1,289 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Generic, Optional
+
+import requests
+
+from qoa4ml.config.configs import AMQPConnectorConfig, ConnectorConfig
+from qoa4ml.connector.async_amqp_connector import AsyncAmqpConnector
+from qoa4ml.connector.async_base_connector import (
+    AsyncBaseConnector,
+    AsyncConnectorAdapter,
+)
+from qoa4ml.lang.datamodel_enum import ServiceAPIEnum
+from qoa4ml.qoa_client import BaseQoaClient, T, headers
+from qoa4ml.reports.ml_reports import MLReport
+from qoa4ml.utils.logger import qoa_logger
+
+
+class RequestState(Generic[T]):
+    """
+    RequestState holds the report and the timer of one request served by an `AsyncQoaClient`.
+    """
+
+    __slots__ = ("report", "timer_start")
+
+    def __init__(self, report: T) -> None:
+        self.report = report
+        self.timer_start: Optional[float] = None
+
+
+class AsyncQoaClient(BaseQoaClient[T]):
+    """
+    AsyncQoaClient observes metrics and reports them from an asyncio application without blocking the event loop.
+
+    Parameters
+    ----------
+    report_cls : type[T], optional
+        The class type for reports, default is MLReport.
+    config_dict : dict, optional
+        A dictionary to load the client's configuration from.
+    config_path : str, optional
+        Path to a JSON or YAML configuration file.
+    registration_url : str, optional
+        URL for registering the client and receiving connector configurations.
+
+    Attributes
+    ----------
+    connector_list : dict[str, AsyncBaseConnector]
+        The connectors reports are sent through, keyed by connector name.
+    default_connector : Optional[str]
+        The name of the connector used when none is specified.
+
+    Methods
+    -------
+    start()
+        Register the client if needed and open the connectors.
+    request() -> AsyncIterator[T]
+        Start a new report and timer for the request served in the block.
+    observe_metric(metric_name: MetricNameEnum, value: Any, category: int = 0, description: str = "")
+        Observe a metric in the report of the current request.
+    observe_inference(inference_value: Any)
+        Observe inference data in the report of the current request.
+    observe_inference_metric(metric_name: MetricNameEnum, value: Any)
+        Observe an inference metric in the report of the current request.
+    report(report: Optional[dict] = None, connectors: Optional[list] = None, submit: bool = False, reset: bool = True, corr_id: Optional[str] = None) -> dict
+        Generate the report of the current request and optionally send it.
+    close()
+        Close all connectors.
+
+    Notes
+    -----
+    - Each request works on its own report and timer, kept in a context variable, so concurrent requests
+      served by the same client never share them. The state is created on first use in the current context.
+    - An asyncio task copies the context of the task creating it, so a task created after its parent used the
+      report records into the parent report. Wrap each request in `request()` to give it its own state whatever
+      the caller did before.
+    - The configuration, identity and observation methods are those of `BaseQoaClient`.
+    - Connectors that only have a blocking implementation run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        report_cls: type[T] = MLReport,
+        config_dict: Optional[dict] = None,
+        config_path: Optional[str] = None,
+        registration_url: Optional[str] = None,
+    ):
+        super().__init__(report_cls, config_dict, config_path, registration_url)
+        self.connector_list: dict[str, AsyncBaseConnector] = {}
+        if self.configuration.connector:
+            for connector in self.configuration.connector:
+                self.connector_list[connector.name] = self.init_connector(connector)
+        self.default_connector = next(iter(self.connector_list), None)
+        self.request_context: ContextVar[Optional[RequestState[T]]] = ContextVar(
+            f"qoa_request_{self.client_config.id}", default=None
+        )
+        self.started = False
+
+    async def __aenter__(self) -> "AsyncQoaClient[T]":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def init_connector(self, configuration: ConnectorConfig) -> AsyncBaseConnector:
+        """
+        Initialize an asynchronous connector based on the configuration provided.
+
+        Parameters
+        ----------
+        configuration : ConnectorConfig
+            Configuration settings for initializing the connector.
+
+        Returns
+        -------
+        AsyncBaseConnector
+            An asynchronous AMQP connector, or the blocking connector of the configuration run in a worker thread.
+
+        Raises
+        ------
+        RuntimeError
+            If the connector configuration type is not supported.
+        """
+        if configuration.connector_class == ServiceAPIEnum.amqp and isinstance(
+            configuration.config, AMQPConnectorConfig
+        ):
+            return AsyncAmqpConnector(configuration.config)
+        return AsyncConnectorAdapter(super().init_connector(configuration))
+
+    async def registration(self, url: str) -> requests.Response:
+        """
+        Register the client with the monitoring service from a worker thread.
+
+        Parameters
+        ----------
+        url : str
+            The registration URL to fetch the connector configuration from.
+
+        Returns
+        -------
+        requests.Response
+            The response from the registration service, containing connector configurations.
+        """
+        return await asyncio.to_thread(
+            requests.request,
+            "POST",
+            url,
+            headers=headers,
+            data=self.client_config.model_dump_json(),
+        )
+
+    async def start(self) -> None:
+        """
+        Register the client if no connector is configured, then open the connectors.
+        """
+        if self.started:
+            return
+        if not self.connector_list and self.registration_url:
+            try:
+                response = (await self.registration(self.registration_url)).json()[
+                    "response"
+                ]
+                connector_configs = response["connector"]
+                if isinstance(connector_configs, dict):
+                    connector_configs = [connector_configs]
+                for config in connector_configs:
+                    connector_config = ConnectorConfig(**config)
+                    self.connector_list[connector_config.name] = self.init_connector(
+                        connector_config
+                    )
+            except Exception as e:
+                qoa_logger.exception(f"Error {type(e)} when registering QoA client")
+            self.default_connector = next(iter(self.connector_list), None)
+        if not self.connector_list:
+            qoa_logger.warning("No connector initiated")
+
+        await asyncio.gather(
+            *(connector.connect() for connector in self.connector_list.values())
+        )
+        self.started = True
+
+    @property
+    def request_state(self) -> RequestState[T]:
+        """
+        The report and timer of the current request, created on first use.
+        """
+        state = self.request_context.get()
+        if state is None:
+            state = RequestState(self.report_cls(self.client_config))
+            self.request_context.set(state)
+        return state
+
+    @property
+    def qoa_report(self) -> T:
+        """
+        The report of the current request, created on first use.
+        """
+        return self.request_state.report
+
+    @property
+    def timer_start(self) -> Optional[float]:
+        """
+        The start time of the timer of the current request, None when no timer runs.
+        """
+        return self.request_state.timer_start
+
+    @timer_start.setter
+    def timer_start(self, value: Optional[float]) -> None:
+        self.request_state.timer_start = value
+
+    @asynccontextmanager
+    async def request(self) -> AsyncIterator[T]:
+        """
+        Start a new report and timer for the request served in the block.
+
+        Yields
+        ------
+        T
+            The report of the request.
+
+        Notes
+        -----
+        The state of the caller is restored on exit, so nested requests don't record into each other.
+        """
+        state = RequestState(self.report_cls(self.client_config))
+        token = self.request_context.set(state)
+        try:
+            yield state.report
+        finally:
+            self.request_context.reset(token)
+
+    async def report(
+        self,
+        report: Optional[dict] = None,
+        connectors: Optional[list] = None,
+        submit: bool = False,
+        reset: bool = True,
+        corr_id: Optional[str] = None,
+    ) -> dict:
+        """
+        Generate the report of the current request and optionally send it.
+
+        Parameters
+        ----------
+        report : dict, optional
+            The report data to be submitted. If None, the report of the current request is generated.
+        connectors : list, optional
+            A list of connector names through which to send the report, default is the default connector.
+        submit : bool, optional
+            Whether to submit the report, default is False.
+        reset : bool, optional
+            Whether to reset the report of the current request after generating it, default is True.
+        corr_id : str, optional
+            The correlation ID for the report, default is None.
+
+        Returns
+        -------
+        dict
+            The JSON-compatible report.
+        """
+        return_report = self.build_report(report, reset, corr_id)
+
+        if submit:
+            if connectors is None:
+                connectors = [self.default_connector] if self.default_connector else []
+            if not connectors:
+                qoa_logger.warning("No connector available")
+            body_message = return_report.model_dump_json()
+            sends = []
+            for name in connectors:
+                if name not in self.connector_list:
+                    qoa_logger.error(f"Unknown connector {name}, dropping report")
+                    continue
+                sends.append(self.connector_list[name].send_report(body_message))
+            await asyncio.gather(*sends)
+        return return_report.model_dump(mode="json")
+
+    async def close(self) -> None:
+        """
+        Close all connectors.
+        """
+        await asyncio.gather(
+            *(connector.close() for connector in self.connector_list.values()),
+            return_exceptions=True,
+        )
+        self.started = False
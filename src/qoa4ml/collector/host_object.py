@@ -5,3 +5,9 @@ class HostObject(ABC):
     @abstractmethod
     def message_processing(self, ch, method, props, body):
         pass
+
+
+class BatchHostObject(ABC):
+    @abstractmethod
+    def batch_processing(self, messages: list):
+        pass
@@ -1,29 +1,96 @@
 import json
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union
 
-from confluent_kafka import Consumer
+from confluent_kafka import Consumer, Message, TopicPartition
 
 from ..config.configs import KafkaCollectorConfig
 from ..utils.logger import qoa_logger
 from .base_collector import BaseCollector
-from .host_object import HostObject
+from .host_object import BatchHostObject, HostObject
 
 
 class KafkaCollector(BaseCollector):
+    """
+    KafkaCollector consumes messages from a Kafka topic in batches and dispatches them to a host object.
+
+    Parameters
+    ----------
+    config : KafkaCollectorConfig
+        Configuration settings for the Kafka collector.
+    host_object : Optional[Union[HostObject, BatchHostObject]], optional
+        The object processing the messages, default is None, which logs them.
+    consumer : Optional[Consumer], optional
+        The consumer to use, default is a new consumer built from `config`.
+
+    Attributes
+    ----------
+    consumer : Consumer
+        The underlying confluent-kafka consumer.
+    consumed : int
+        Number of messages processed successfully.
+    failed : int
+        Number of messages that were errors, and of attempts to process a message that raised.
+    dropped : int
+        Number of messages skipped after `max_retries` failed attempts.
+    batches : int
+        Number of batches processed.
+
+    Methods
+    -------
+    on_request(ch, method, props, body)
+        Process one message.
+    start_collecting()
+        Consume, dispatch and commit batches of messages until `stop` is called.
+    stop()
+        Stop collecting after the current batch.
+    get_metrics() -> dict
+        Get the throughput and lag of the collector.
+
+    Notes
+    -----
+    - Up to `batch_size` messages are consumed at once. The messages of each partition are processed in order by one
+      worker of a pool of `num_workers` threads, so partitions are processed concurrently.
+    - A `HostObject` receives `message_processing(consumer, message, headers, value)` per message. A
+      `BatchHostObject` receives the list of messages of a partition.
+    - Once a batch is processed, the offsets of each partition are committed up to the first message whose
+      processing raised, and the consumer seeks back to that message so it is delivered again. A crash redelivers
+      at most one batch.
+    - A message still failing after `max_retries` retries is logged, counted as dropped and skipped. With a
+      `BatchHostObject`, the messages of the partition in the batch are retried and dropped together.
+    """
+
     def __init__(
         self,
         config: KafkaCollectorConfig,
-        host_object: HostObject | None = None,
+        host_object: Optional[Union[HostObject, BatchHostObject]] = None,
+        consumer: Optional[Consumer] = None,
     ):
         self.config = config
         self.host_object = host_object
         self.running = False
-        self.consumer = Consumer(
-            {
-                "bootstrap.servers": self.config.broker_url,
-                "group.id": self.config.group_id,
-                "auto.offset.reset": self.config.auto_offset_reset,
-            }
-        )
+        if consumer is None:
+            consumer = Consumer(
+                {
+                    "bootstrap.servers": self.config.broker_url,
+                    "group.id": self.config.group_id,
+                    "auto.offset.reset": self.config.auto_offset_reset,
+                    "enable.auto.commit": False,
+                    **self.config.consumer_config,
+                }
+            )
+        self.consumer = consumer
+        self.consumed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.batches = 0
+        self.positions: dict[tuple[str, int], int] = {}
+        self.attempts: dict[tuple[str, int, int], int] = {}
+        self.start_time = None
+        self.stats_lock = threading.Lock()
 
     def on_request(self, ch, method, props, body):
         if self.host_object is not None:
@@ -32,16 +99,140 @@ class KafkaCollector(BaseCollector):
             mess = json.loads(str(body.decode("utf-8")))
             qoa_logger.info(mess)
 
+    def process_partition(self, messages: list[Message]) -> int:
+        # NOTE: returns the number of messages handled, processing stops at the first failure to keep the order
+        if isinstance(self.host_object, BatchHostObject):
+            try:
+                self.host_object.batch_processing(messages)
+            except Exception as e:
+                qoa_logger.exception(f"Error {type(e)} when processing a batch")
+                return 0
+            return len(messages)
+        for index, msg in enumerate(messages):
+            try:
+                self.on_request(self.consumer, msg, msg.headers(), msg.value())
+            except Exception as e:
+                qoa_logger.exception(f"Error {type(e)} when processing a message")
+                return index
+        return len(messages)
+
+    def process_batch(self, executor: ThreadPoolExecutor, batch: list[Message]) -> None:
+        partitions: dict[tuple[str, int], list[Message]] = defaultdict(list)
+        errors = 0
+        for msg in batch:
+            if msg.error():
+                qoa_logger.error(f"Consumer error: {msg.error()}")
+                errors += 1
+                continue
+            partitions[(msg.topic(), msg.partition())].append(msg)
+
+        futures = {
+            key: executor.submit(self.process_partition, messages)
+            for key, messages in partitions.items()
+        }
+        consumed = failed = dropped = 0
+        offsets = []
+        for (topic, partition), messages in partitions.items():
+            handled = futures[(topic, partition)].result()
+            consumed += handled
+            if handled < len(messages):
+                failed += 1
+                offset = messages[handled].offset()
+                attempts = self.attempts.pop((topic, partition, offset), 0) + 1
+                if attempts > self.config.max_retries:
+                    skipped = (
+                        len(messages) - handled
+                        if isinstance(self.host_object, BatchHostObject)
+                        else 1
+                    )
+                    qoa_logger.error(
+                        f"Dropping {skipped} messages from offset {offset} of {topic}[{partition}] after "
+                        f"{attempts} failed attempts"
+                    )
+                    dropped += skipped
+                    handled += skipped
+                else:
+                    self.attempts[(topic, partition, offset)] = attempts
+            if handled < len(messages):
+                # NOTE: the unhandled messages are delivered again by the next consume
+                self.consumer.seek(
+                    TopicPartition(topic, partition, messages[handled].offset())
+                )
+            if handled:
+                offsets.append(
+                    TopicPartition(topic, partition, messages[handled - 1].offset() + 1)
+                )
+        if offsets:
+            self.consumer.commit(offsets=offsets, asynchronous=True)
+        with self.stats_lock:
+            self.consumed += consumed
+            self.failed += errors + failed
+            self.dropped += dropped
+            self.batches += 1
+            for offset in offsets:
+                self.positions[(offset.topic, offset.partition)] = offset.offset
+
     def start_collecting(self):
+        """
+        Consume, dispatch and commit batches of messages until `stop` is called.
+        """
         self.running = True
-        while self.running:
-            msg = self.consumer.poll(self.config.poll_inteval)
+        self.start_time = time.monotonic()
+        self.consumer.subscribe([self.config.topic])
+        with ThreadPoolExecutor(
+            max_workers=self.config.num_workers, thread_name_prefix="qoa-kafka"
+        ) as executor:
+            try:
+                while self.running:
+                    batch = self.consumer.consume(
+                        self.config.batch_size, self.config.poll_inteval
+                    )
+                    if batch:
+                        self.process_batch(executor, batch)
+            finally:
+                self.consumer.close()
 
-            if msg is None:
-                continue
-            if msg.error():
-                print(f"Consumer error: {msg.error()}")
+    def get_metrics(self) -> dict:
+        """
+        Get the throughput and lag of the collector.
+
+        Returns
+        -------
+        dict
+            The number of consumed, failed and dropped messages and processed batches, the throughput in messages
+            per second since `start_collecting`, and the lag of each partition as `{"topic[partition]": messages}`.
+
+        Notes
+        -----
+        - Lag is computed from the high watermarks cached by the consumer, so it doesn't query the broker.
+        """
+        with self.stats_lock:
+            consumed, failed, dropped, batches = (
+                self.consumed,
+                self.failed,
+                self.dropped,
+                self.batches,
+            )
+            positions = dict(self.positions)
+        elapsed = time.monotonic() - self.start_time if self.start_time else 0.0
+        lag = {}
+        for (topic, partition), position in positions.items():
+            try:
+                _, high = self.consumer.get_watermark_offsets(
+                    TopicPartition(topic, partition), cached=True
+                )
+            except Exception:
                 continue
+            if high >= 0:
+                lag[f"{topic}[{partition}]"] = max(high - position, 0)
+        return {
+            "consumed": consumed,
+            "failed": failed,
+            "dropped": dropped,
+            "batches": batches,
+            "throughput": consumed / elapsed if elapsed > 0 else 0.0,
+            "lag": lag,
+        }
 
     def stop(self):
         self.running = False
@@ -1,14 +1,18 @@
-import pickle
+import selectors
 import socket
-from typing import Callable
+import threading
+from typing import Callable, Optional
 
 from ..config.configs import SocketCollectorConfig
+from ..utils.bounded_queue import STOP, BoundedQueue, CounterMixin
+from ..utils.framing import FrameReader
+from ..utils.logger import qoa_logger
 from .base_collector import BaseCollector
 
 
-class SocketCollector(BaseCollector):
+class SocketCollector(BaseCollector, CounterMixin):
     """
-    SocketCollector handles the collection of data over a TCP socket.
+    SocketCollector handles the collection of length-prefixed reports over a TCP socket.
 
     Parameters
     ----------
@@ -28,16 +32,44 @@ class SocketCollector(BaseCollector):
     backlog : int
         The maximum number of queued connections.
     bufsize : int
-        The maximum size of data to be received at once.
+        The initial size of the receive buffer of each connection.
     process_report : Callable
         A function to process the received report.
     execution_flag : bool
         Flag to control the execution loop.
+    server_socket : Optional[socket.socket]
+        The listening socket, created by `start_collecting`.
+    ready : threading.Event
+        Set once the server socket is listening.
+    queue : BoundedQueue
+        Bounded queue of decoded reports waiting to be processed.
+    received : int
+        Number of reports decoded.
+    dropped : int
+        Number of reports dropped because the queue was full.
+    processed : int
+        Number of reports processed successfully.
+    failed : int
+        Number of reports whose processing raised.
 
     Methods
     -------
     start_collecting()
         Start the socket server to collect and process incoming data.
+    stop()
+        Stop accepting connections and process the queued reports.
+    get_stats() -> dict
+        Get the queue depth and the report counters.
+
+    Notes
+    -----
+    - Reports are framed as in `utils.framing`: a 4-byte big-endian length followed by the UTF-8 encoded report.
+      Reports are decoded as text, never unpickled.
+    - All connections are served by one thread with non-blocking sockets and a selector. It only decodes reports and
+      puts them in the queue, so a slow `process_report` never stalls the probes.
+    - `process_report` runs on `num_workers` threads; it must be thread-safe when there is more than one.
+    - With the block overflow policy, a full queue stops the collector from reading, which pushes back on the probes
+      through TCP flow control.
     """
 
     def __init__(self, config: SocketCollectorConfig, process_report: Callable) -> None:
@@ -58,6 +90,15 @@ class SocketCollector(BaseCollector):
         self.bufsize = config.bufsize
         self.process_report = process_report
         self.execution_flag = True
+        self.server_socket: Optional[socket.socket] = None
+        self.ready = threading.Event()
+        self.queue = BoundedQueue(config.queue_size, config.overflow_policy)
+        self.received = 0
+        self.dropped = 0
+        self.processed = 0
+        self.failed = 0
+        self.connections = 0
+        self.stats_lock = threading.Lock()
 
     def start_collecting(self) -> None:
         """
@@ -66,22 +107,120 @@ class SocketCollector(BaseCollector):
         Notes
         -----
         - This method starts a TCP socket server that listens for incoming connections.
-        - Data received from clients is deserialized using pickle and then processed using the `process_report` function.
-        - The server runs indefinitely until the `execution_flag` is set to False.
+        - The server runs until `stop` is called, then the queued reports are processed before it returns.
         """
         server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         server_socket.bind((self.host, self.port))
         server_socket.listen(self.backlog)
+        server_socket.setblocking(False)
+        self.server_socket = server_socket
+
+        workers = [
+            threading.Thread(
+                target=self._run, daemon=True, name=f"qoa-socket-collector-{i}"
+            )
+            for i in range(self.config.num_workers)
+        ]
+        for worker in workers:
+            worker.start()
+
+        selector = selectors.DefaultSelector()
+        selector.register(server_socket, selectors.EVENT_READ)
+        self.ready.set()
+        try:
+            while self.execution_flag:
+                for key, _ in selector.select(timeout=0.5):
+                    if key.data is None:
+                        self._accept(selector, server_socket)
+                    else:
+                        self._read(selector, key.fileobj, key.data)
+        finally:
+            for key in list(selector.get_map().values()):
+                key.fileobj.close()
+            selector.close()
+            for _ in workers:
+                self.queue.stop()
+            for worker in workers:
+                worker.join()
 
-        while self.execution_flag:
-            client_socket, _ = server_socket.accept()
-            data = b""
-            while True:
-                packet = client_socket.recv(self.bufsize)
-                if not packet:
-                    break
-                data += packet
-
-            report = pickle.loads(data)
-            self.process_report(report)
+    def _accept(
+        self, selector: selectors.BaseSelector, server_socket: socket.socket
+    ) -> None:
+        while True:
+            try:
+                client_socket, _ = server_socket.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            client_socket.setblocking(False)
+            selector.register(
+                client_socket,
+                selectors.EVENT_READ,
+                FrameReader(self.bufsize, self.config.max_frame_size),
+            )
+            self._count("connections")
+
+    def _read(
+        self,
+        selector: selectors.BaseSelector,
+        client_socket: socket.socket,
+        reader: FrameReader,
+    ) -> None:
+        try:
+            reports = reader.read(client_socket)
+        except (BlockingIOError, InterruptedError):
+            return
+        except (OSError, ValueError) as e:
+            qoa_logger.error(f"Dropping report connection: {e}")
+            reports = None
+        if reports is None:
+            selector.unregister(client_socket)
             client_socket.close()
+            self._count("connections", -1)
+            return
+        for report in reports:
+            self._count("received")
+            _, dropped = self.queue.offer(report)
+            if dropped:
+                self._count("dropped", dropped)
+
+    def _run(self) -> None:
+        while True:
+            report = self.queue.get()
+            try:
+                if report is STOP:
+                    return
+                self.process_report(report)
+                self._count("processed")
+            except Exception as e:
+                self._count("failed")
+                qoa_logger.exception(f"Error {type(e)} when processing report")
+            finally:
+                self.queue.task_done()
+
+    def get_stats(self) -> dict:
+        """
+        Get the queue depth and the report counters.
+
+        Returns
+        -------
+        dict
+            The number of open connections, the queue depth and capacity, and the number of received, dropped,
+            processed and failed reports.
+        """
+        with self.stats_lock:
+            return {
+                "connections": self.connections,
+                "queue_depth": self.queue.qsize(),
+                "queue_size": self.config.queue_size,
+                "received": self.received,
+                "dropped": self.dropped,
+                "processed": self.processed,
+                "failed": self.failed,
+            }
+
+    def stop(self) -> None:
+        """
+        Stop accepting connections and process the queued reports.
+        """
+        self.execution_flag = False
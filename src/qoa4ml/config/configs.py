@@ -5,9 +5,12 @@ from typing import Union
 from pydantic import BaseModel, Field, model_validator
 
 from ..lang.datamodel_enum import (
+    DatabaseBackendEnum,
     EnvironmentEnum,
     MetricClassEnum,
     MetricNameEnum,
+    OverflowPolicyEnum,
+    ReaderBackendEnum,
     ServiceAPIEnum,
 )
 
@@ -72,6 +75,29 @@ class AMQPConnectorConfig(BaseModel):
     exchange_type: str
     out_routing_key: str
     health_check_disable: bool = False
+    persistent_connection: bool = Field(
+        default=True,
+        description="Keep one connection and channel open across reports, reconnecting only when it is closed",
+    )
+    publisher_confirms: bool = Field(
+        default=False,
+        description="Wait for the broker to confirm published reports",
+    )
+    max_unconfirmed: int = Field(
+        default=1000,
+        ge=1,
+        description="Unconfirmed reports kept for republishing while the broker is unreachable, the oldest are dropped",
+    )
+    reconnect_backoff: float = Field(
+        default=1.0,
+        ge=0,
+        description="Seconds before retrying a failed reconnect, doubled after each failure",
+    )
+    max_reconnect_backoff: float = Field(
+        default=30.0,
+        ge=0,
+        description="Maximum seconds between two reconnect attempts",
+    )
 
 
 class MQTTConnectorConfig(BaseModel):
@@ -86,6 +112,8 @@ class MQTTConnectorConfig(BaseModel):
 class SocketConnectorConfig(BaseModel):
     host: str
     port: int
+    persistent_connection: bool = True
+    timeout: float | None = 5.0
 
 
 class SocketCollectorConfig(BaseModel):
@@ -93,6 +121,19 @@ class SocketCollectorConfig(BaseModel):
     port: int
     backlog: int
     bufsize: int
+    max_frame_size: int = Field(16 * 1024 * 1024, ge=1)
+    queue_size: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum number of reports waiting to be processed",
+    )
+    overflow_policy: OverflowPolicyEnum = Field(
+        default=OverflowPolicyEnum.drop_oldest,
+        description="What to do with a new report when the queue is full",
+    )
+    num_workers: int = Field(
+        default=1, ge=1, description="Number of threads processing reports"
+    )
 
 
 class PrometheusConnectorConfig(BaseModel):
@@ -102,6 +143,13 @@ class PrometheusConnectorConfig(BaseModel):
 class KafkaConnectorConfig(BaseModel):
     topic: str
     broker_url: str
+    synchronous: bool = False
+    linger_ms: int = Field(5, ge=0)
+    batch_size: int | None = Field(None, ge=1)
+    compression_type: str | None = None
+    producer_config: dict = Field(default_factory=dict)
+    poll_interval: float = Field(0.1, gt=0)
+    close_timeout: float = Field(10.0, ge=0)
 
 
 class KafkaCollectorConfig(BaseModel):
@@ -110,6 +158,10 @@ class KafkaCollectorConfig(BaseModel):
     group_id: str
     auto_offset_reset: str = "earliest"
     poll_inteval: float = 1.0
+    batch_size: int = Field(500, ge=1)
+    num_workers: int = Field(4, ge=1)
+    max_retries: int = Field(3, ge=0)
+    consumer_config: dict = Field(default_factory=dict)
 
 
 class DebugConnectorConfig(BaseModel):
@@ -141,12 +193,51 @@ class ConnectorConfig(BaseModel):
     config: ConnectorConfigClass | None = None
 
 
+class ReportSenderConfig(BaseModel):
+    queue_size: int = Field(
+        default=1000, ge=1, description="Maximum number of reports waiting to be sent"
+    )
+    overflow_policy: OverflowPolicyEnum = Field(
+        default=OverflowPolicyEnum.drop_oldest,
+        description="What to do with a new report when the queue is full",
+    )
+    block_timeout: float | None = Field(
+        default=None,
+        description="Maximum seconds to wait for space with the block policy, None waits forever",
+    )
+    num_workers: int = Field(
+        default=1, ge=1, description="Number of background sender threads"
+    )
+    batch_size: int = Field(
+        default=100,
+        ge=1,
+        description="Maximum number of queued reports coalesced into one send per connector",
+    )
+    shutdown_timeout: float = Field(
+        default=5.0, description="Seconds to wait for queued reports on shutdown"
+    )
+
+
+class ProbeSchedulerConfig(BaseModel):
+    num_workers: int = Field(
+        default=2, ge=1, description="Number of threads running the due probes"
+    )
+    jitter: float = Field(
+        default=0.0,
+        ge=0.0,
+        lt=1.0,
+        description="Maximum random delay of a tick, as a fraction of the probe interval",
+    )
+
+
 class ClientConfig(BaseModel):
     client: ClientInfo
     registration_url: str | None = None
     collector: list[CollectorConfig] | None = None
     connector: list[ConnectorConfig] | None = None
     probes: list[ProbeConfig] | None = None
+    sender: ReportSenderConfig = Field(default_factory=ReportSenderConfig)
+    scheduler: ProbeSchedulerConfig = Field(default_factory=ProbeSchedulerConfig)
 
     @model_validator(mode="before")
     @classmethod
@@ -155,6 +246,7 @@ class ClientConfig(BaseModel):
             "process": ProcessProbeConfig,
             "docker": DockerProbeConfig,
             "system": SystemProbeConfig,
+            "pressure": CgroupPressureProbeConfig,
         }
         probes = values.get("probes", [])
         if probes:
@@ -189,11 +281,31 @@ class ProbeConfig(BaseModel):
     environment: EnvironmentEnum = Field(
         default=EnvironmentEnum.edge, description="The environment where the probe run"
     )
+    priority: int = Field(
+        default=0,
+        description="Probes with a higher priority run first when several are due at once",
+    )
+    reader_backend: ReaderBackendEnum = Field(
+        default=ReaderBackendEnum.psutil,
+        description="Read statistics through psutil, or from procfs and cgroupfs directly for high frequencies",
+    )
+    procfs_root: str = Field(
+        default="/proc", description="The procfs mount point of the procfs backend"
+    )
+    cgroupfs_root: str = Field(
+        default="/sys/fs/cgroup",
+        description="The cgroupfs mount point of the procfs backend",
+    )
 
 
 class ProcessProbeConfig(ProbeConfig):
     probe_type: str = Field("process")
     pid: int | None = None
+    child_refresh_interval: float = Field(
+        default=10.0,
+        ge=0.0,
+        description="Seconds between two walks of the process tree looking for new child processes",
+    )
 
 
 class SystemProbeConfig(ProbeConfig):
@@ -201,6 +313,14 @@ class SystemProbeConfig(ProbeConfig):
     node_name: str | None = None
 
 
+class CgroupPressureProbeConfig(ProbeConfig):
+    probe_type: str = Field("pressure")
+    cgroup_path: str | None = Field(
+        default=None,
+        description="The cgroup v2 to monitor, relative to cgroupfs_root, default is the cgroup of the process",
+    )
+
+
 class DockerProbeConfig(ProbeConfig):
     probe_type: str = Field("docker")
     container_list: list[str] = []
@@ -216,12 +336,136 @@ class JetsonProcessesProbeConfig(ProbeConfig):
     node_name: str | None
 
 
+class RetentionPolicyConfig(BaseModel):
+    resolution: float | None = Field(
+        default=None,
+        gt=0,
+        description="Seconds per rollup bucket, None for the raw points",
+    )
+    duration: float | None = Field(
+        default=None,
+        gt=0,
+        description="Seconds the points are kept, None keeps them forever",
+    )
+
+
 class NodeAggregatorConfig(BaseModel):
     socket_collector_config: SocketCollectorConfig
     environment: EnvironmentEnum
     query_method: str
     data_separator: str
     unit_conversion: dict
+    latest_ttl: float | None = Field(
+        default=60.0,
+        description="Seconds after which a series without new points is left out of the latest metrics, None keeps every series",
+    )
+    database_backend: DatabaseBackendEnum = Field(
+        default=DatabaseBackendEnum.tinyflux,
+        description="Storage of the collected metrics",
+    )
+    segment_size: int = Field(
+        default=3600,
+        ge=1,
+        description="Points of a series buffered before a columnar segment is written",
+    )
+    max_open_segments: int = Field(
+        default=256,
+        ge=1,
+        description="Columnar segments whose memory maps are kept open between queries",
+    )
+    write_batch_size: int = Field(
+        default=500,
+        ge=1,
+        description="Points written to the database together",
+    )
+    write_flush_interval: float = Field(
+        default=1.0,
+        gt=0,
+        description="Seconds after which a partial batch of points is written",
+    )
+    write_max_pending_batches: int = Field(
+        default=16,
+        ge=1,
+        description="Full batches waiting to be written before the collector workers block",
+    )
+    retention_policies: list[RetentionPolicyConfig] = Field(
+        default_factory=list,
+        description="Raw points policy first, if any, then rollup tiers by increasing resolution; empty keeps raw points forever",
+    )
+    compaction_interval: float = Field(
+        default=60.0,
+        gt=0,
+        description="Seconds between two runs of the compactor",
+    )
+    compaction_lag: float = Field(
+        default=10.0,
+        ge=0,
+        description="Seconds a rollup bucket stays open after its end, for late points",
+    )
+
+    cluster_aggregator_url: str | None = Field(
+        default=None,
+        description="Base URL of the cluster aggregator the node pushes summaries to, None disables pushing",
+    )
+    summary_interval: float = Field(
+        default=10.0,
+        gt=0,
+        description="Seconds covered by each summary pushed to the cluster aggregator",
+    )
+    stream_buffer_size: int = Field(
+        default=1000,
+        ge=1,
+        description="Series with an unsent point per stream subscriber before the oldest point is dropped",
+    )
+    stream_heartbeat: float = Field(
+        default=15.0,
+        gt=0,
+        description="Seconds without points after which a stream sends a keep-alive comment",
+    )
+    export_chunk_seconds: float = Field(
+        default=3600.0,
+        gt=0,
+        description="Seconds of points read from the database at once by exports",
+    )
+    sketch_relative_accuracy: float = Field(
+        default=0.01,
+        gt=0,
+        lt=1,
+        description="Relative accuracy of the quantile sketches of the summaries",
+    )
+
+    @model_validator(mode="after")
+    def validate_retention_policies(self):
+        resolutions = [policy.resolution for policy in self.retention_policies]
+        if None in resolutions[1:]:
+            raise ValueError("The raw points retention policy must come first")
+        rollup_resolutions = [
+            resolution for resolution in resolutions if resolution is not None
+        ]
+        if any(
+            previous >= current
+            for previous, current in zip(rollup_resolutions, rollup_resolutions[1:])
+        ):
+            raise ValueError("Rollup resolutions must be increasing")
+        return self
+
+
+class ClusterAggregatorConfig(BaseModel):
+    host: str
+    port: int
+    query_method: str = "GET"
+    data_separator: str = "dot"
+    retention: float = Field(
+        default=3600.0,
+        gt=0,
+        description="Seconds the summaries pushed by the nodes are kept",
+    )
+    sketch_relative_accuracy: float = Field(
+        default=0.01,
+        gt=0,
+        lt=1,
+        description="Relative accuracy the quantile sketches of the pushed summaries must have",
+    )
 
 
 class ExporterConfig(BaseModel):
@@ -1,9 +1,13 @@
+import threading
+import time
 import uuid
+from collections import deque
 from typing import Optional
 
 import pika
 
 from ..config.configs import AMQPConnectorConfig
+from ..utils.logger import qoa_logger
 from .base_connector import BaseConnector
 
 
@@ -40,13 +44,31 @@ class AmqpConnector(BaseConnector):
             The connection to the RabbitMQ server.
         out_channel : pika.channel.Channel
             The channel for communication with RabbitMQ.
+        persistent_connection : bool
+            Whether the connection and channel are kept open across reports.
+        unconfirmed : deque[tuple[str, pika.BasicProperties, str]]
+            Reports published but not yet confirmed by the broker, republished after a reconnect. At most
+            `max_unconfirmed` are kept, the oldest are dropped.
+        dropped : int
+            Number of unconfirmed reports dropped because `unconfirmed` was full.
 
         Methods
         -------
         send_report(body_message: str, corr_id: Optional[str] = None, routing_key: Optional[str] = None, expiration: int = 1000)
             Send data to the desired destination.
+        close()
+            Close the connection.
         get() -> AMQPConnectorConfig
             Get the current configuration of the connector.
+
+        Notes
+        -----
+        - The connector is shared by the probes and the report sender threads. The connection isn't thread-safe,
+          so `send_report` and `close` are serialized with a lock.
+        - When reconnecting fails, the report stays in `unconfirmed` and the next reconnect is attempted after a
+          backoff doubling from `reconnect_backoff` up to `max_reconnect_backoff`. Reports sent meanwhile are
+          only queued.
+
             Initialize an instance of AmqpConnector.
 
             Parameters
@@ -62,6 +84,15 @@ class AmqpConnector(BaseConnector):
         self.out_routing_key = config.out_routing_key
         self.log_flag = log
         self.health_check_disable = self.config.health_check_disable
+        self.persistent_connection = self.config.persistent_connection
+        self.publisher_confirms = self.config.publisher_confirms
+        self.unconfirmed: deque[tuple[str, pika.BasicProperties, str]] = deque(
+            maxlen=self.config.max_unconfirmed
+        )
+        self.dropped = 0
+        self.backoff = 0.0
+        self.retry_at = 0.0
+        self.lock = threading.Lock()
 
         # Connect to RabbitMQ host
         self.create_connection()
@@ -86,6 +117,9 @@ class AmqpConnector(BaseConnector):
         self.out_connection = pika.BlockingConnection(parameters)
 
         self.out_channel = self.out_connection.channel()
+        if self.publisher_confirms:
+            # NOTE: in confirm mode, BlockingChannel.basic_publish returns once the broker confirmed the report
+            self.out_channel.confirm_delivery()
 
     def send_report(
         self,
@@ -112,22 +146,101 @@ class AmqpConnector(BaseConnector):
         -----
         - If `corr_id` is not provided, a new UUID will be generated.
         - If `routing_key` is not provided, the default `out_routing_key` will be used.
+        - With a persistent connection, the connector only reconnects when `check_connection` fails.
         """
-
-        self.create_connection()
         if corr_id is None:
             corr_id = str(uuid.uuid4())
         if routing_key is None:
             routing_key = self.out_routing_key
-        self.sub_properties = pika.BasicProperties(
+        properties = pika.BasicProperties(
             correlation_id=corr_id, expiration=str(expiration)
         )
-        self.out_channel.basic_publish(
-            exchange=self.exchange_name,
-            routing_key=routing_key,
-            properties=self.sub_properties,
-            body=body_message,
-        )
+        with self.lock:
+            if not self.persistent_connection:
+                self.create_connection()
+                try:
+                    self.publish(routing_key, properties, body_message)
+                except pika.exceptions.AMQPError:
+                    # NOTE: without a persistent connection, a failed report is raised and not retried
+                    self.unconfirmed.clear()
+                    raise
+                finally:
+                    self.close_connection()
+                return
+
+            # NOTE: the report is queued first, so it is kept if reconnecting fails
+            self.queue_report(routing_key, properties, body_message)
+            if not self.check_connection():
+                self.try_reconnect()
+                return
+            try:
+                self.publish_unconfirmed()
+            except pika.exceptions.AMQPError:
+                if self.check_connection():
+                    # NOTE: the broker rejected the report, it isn't retried
+                    self.unconfirmed.popleft()
+                    raise
+                qoa_logger.warning(
+                    "AMQP connection lost, reconnecting to resend reports"
+                )
+                self.try_reconnect()
+
+    def publish(
+        self, routing_key: str, properties: pika.BasicProperties, body_message: str
+    ) -> None:
+        """
+        Publish a message once the unconfirmed reports queued before it are published.
+
+        Parameters
+        ----------
+        routing_key : str
+            The routing key for the message.
+        properties : pika.BasicProperties
+            The properties of the message.
+        body_message : str
+            The message body to be sent.
+
+        Notes
+        -----
+        A message stays in `unconfirmed` until `basic_publish` returns, which waits for the broker to confirm it
+        when `publisher_confirms` is set. If the connection is lost before, `reconnect` publishes it again.
+        """
+        self.queue_report(routing_key, properties, body_message)
+        self.publish_unconfirmed()
+
+    def queue_report(
+        self, routing_key: str, properties: pika.BasicProperties, body_message: str
+    ) -> None:
+        if len(self.unconfirmed) == self.unconfirmed.maxlen:
+            # NOTE: appending to the full deque drops the oldest report
+            self.dropped += 1
+            qoa_logger.warning(
+                f"{self.unconfirmed.maxlen} reports wait for the AMQP broker, dropping the oldest "
+                f"({self.dropped} dropped so far)"
+            )
+        self.unconfirmed.append((routing_key, properties, body_message))
+
+    def publish_unconfirmed(self) -> None:
+        while self.unconfirmed:
+            routing_key, properties, body_message = self.unconfirmed[0]
+            self.out_channel.basic_publish(
+                exchange=self.exchange_name,
+                routing_key=routing_key,
+                properties=properties,
+                body=body_message,
+            )
+            self.unconfirmed.popleft()
+
+    def close(self) -> None:
+        """
+        Close the connection.
+        """
+        with self.lock:
+            self.close_connection()
+
+    def close_connection(self) -> None:
+        if self.out_connection.is_open:
+            self.out_connection.close()
 
     def get(self) -> AMQPConnectorConfig:
         """
@@ -141,7 +254,38 @@ class AmqpConnector(BaseConnector):
         return self.config
 
     def check_connection(self) -> bool:
-        return self.out_channel.is_open
+        return self.out_connection.is_open and self.out_channel.is_open
+
+    def try_reconnect(self) -> None:
+        now = time.monotonic()
+        if now < self.retry_at:
+            return
+        try:
+            self.reconnect()
+        except pika.exceptions.AMQPError as e:
+            self.backoff = min(
+                max(self.backoff * 2, self.config.reconnect_backoff),
+                self.config.max_reconnect_backoff,
+            )
+            self.retry_at = now + self.backoff
+            qoa_logger.warning(
+                f"Unable to reconnect to the AMQP broker, keeping {len(self.unconfirmed)} reports and retrying "
+                f"in {self.backoff:.1f} s: {e}"
+            )
+            return
+        self.backoff = 0.0
+        self.retry_at = 0.0
 
     def reconnect(self):
+        if self.out_connection.is_open:
+            try:
+                self.out_connection.close()
+            except pika.exceptions.AMQPError:
+                pass
         self.create_connection()
+        if self.unconfirmed:
+            # NOTE: a report confirmed just before the connection was lost may be published twice, never lost
+            qoa_logger.warning(
+                f"Republishing {len(self.unconfirmed)} unconfirmed reports"
+            )
+            self.publish_unconfirmed()
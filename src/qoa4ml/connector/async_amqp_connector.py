@@ -0,0 +1,215 @@
+import asyncio
+import uuid
+from typing import Optional
+
+import pika
+from pika.adapters.asyncio_connection import AsyncioConnection
+
+from ..config.configs import AMQPConnectorConfig
+from .async_base_connector import AsyncBaseConnector
+
+
+class AsyncAmqpConnector(AsyncBaseConnector):
+    """
+    AsyncAmqpConnector publishes reports to an AMQP server from the asyncio event loop.
+
+    Parameters
+    ----------
+    config : AMQPConnectorConfig
+        Configuration settings for the AMQP connector.
+
+    Attributes
+    ----------
+    config : AMQPConnectorConfig
+        The AMQP connector configuration.
+    connection : Optional[AsyncioConnection]
+        The non-blocking connection to the RabbitMQ server, created by `connect`.
+    channel : Optional[pika.channel.Channel]
+        The channel used for publishing.
+
+    Methods
+    -------
+    connect()
+        Open the connection and the channel, and declare the exchange.
+    send_report(body_message: str, corr_id: Optional[str] = None, routing_key: Optional[str] = None, expiration: int = 1000)
+        Publish a report, reconnecting first if the connection was closed.
+    close()
+        Close the connection.
+
+    Notes
+    -----
+    - The connection is driven by the running event loop, so publishing never blocks it.
+    - With `publisher_confirms`, `send_report` waits for the broker confirm of its own report. Concurrent
+      reports share the round trip, as the broker acknowledges them together.
+    """
+
+    def __init__(self, config: AMQPConnectorConfig) -> None:
+        self.config = config
+        self.exchange_name = config.exchange_name
+        self.exchange_type = config.exchange_type
+        self.out_routing_key = config.out_routing_key
+        self.publisher_confirms = config.publisher_confirms
+        self.connection: Optional[AsyncioConnection] = None
+        self.channel = None
+        self.delivery_tag = 0
+        self.pending_confirms: dict[int, asyncio.Future] = {}
+        self.connect_lock: Optional[asyncio.Lock] = None
+
+    def get_parameters(self) -> pika.connection.Parameters:
+        if "amqps://" in self.config.end_point:
+            parameters = pika.URLParameters(self.config.end_point)
+            if self.config.health_check_disable:
+                parameters.heartbeat = 0
+        elif self.config.health_check_disable:
+            parameters = pika.ConnectionParameters(
+                host=self.config.end_point, heartbeat=0
+            )
+        else:
+            parameters = pika.ConnectionParameters(host=self.config.end_point)
+        return parameters
+
+    async def connect(self) -> None:
+        """
+        Open the connection and the channel, and declare the exchange.
+
+        Raises
+        ------
+        pika.exceptions.AMQPConnectionError
+            If the connection or the channel can't be opened.
+        """
+        if self.connect_lock is None:
+            self.connect_lock = asyncio.Lock()
+        async with self.connect_lock:
+            if self.check_connection():
+                return
+            loop = asyncio.get_running_loop()
+            ready: asyncio.Future = loop.create_future()
+
+            def fail(error: BaseException) -> None:
+                if not ready.done():
+                    ready.set_exception(pika.exceptions.AMQPConnectionError(error))
+
+            def on_channel_open(channel) -> None:
+                def on_exchange_declared(_frame) -> None:
+                    # NOTE: only publish once the exchange exists
+                    self.channel = channel
+                    if not ready.done():
+                        ready.set_result(None)
+
+                channel.add_on_close_callback(self.on_channel_closed)
+                if self.publisher_confirms:
+                    channel.confirm_delivery(self.on_delivery_confirmation)
+                channel.exchange_declare(
+                    exchange=self.exchange_name,
+                    exchange_type=self.exchange_type,
+                    callback=on_exchange_declared,
+                )
+
+            def on_connection_open(connection) -> None:
+                connection.channel(on_open_callback=on_channel_open)
+
+            def on_connection_closed(_connection, reason: BaseException) -> None:
+                self.channel = None
+                self.fail_pending_confirms(reason)
+                fail(reason)
+
+            self.delivery_tag = 0
+            self.connection = AsyncioConnection(
+                parameters=self.get_parameters(),
+                on_open_callback=on_connection_open,
+                on_open_error_callback=lambda _connection, error: fail(error),
+                on_close_callback=on_connection_closed,
+                custom_ioloop=loop,
+            )
+            await ready
+
+    def on_channel_closed(self, _channel, reason: BaseException) -> None:
+        self.channel = None
+        self.fail_pending_confirms(reason)
+        if self.connection is not None and self.connection.is_open:
+            self.connection.close()
+
+    def on_delivery_confirmation(self, method_frame) -> None:
+        method = method_frame.method
+        acked = isinstance(method, pika.spec.Basic.Ack)
+        if method.multiple:
+            tags = [tag for tag in self.pending_confirms if tag <= method.delivery_tag]
+        else:
+            tags = [method.delivery_tag]
+        for tag in tags:
+            future = self.pending_confirms.pop(tag, None)
+            if future is None or future.done():
+                continue
+            if acked:
+                future.set_result(None)
+            else:
+                future.set_exception(
+                    pika.exceptions.NackError([f"delivery tag {tag} was nacked"])
+                )
+
+    def fail_pending_confirms(self, reason: BaseException) -> None:
+        for future in self.pending_confirms.values():
+            if not future.done():
+                future.set_exception(pika.exceptions.AMQPConnectionError(reason))
+        self.pending_confirms.clear()
+
+    async def send_report(
+        self,
+        body_message: str,
+        corr_id: Optional[str] = None,
+        routing_key: Optional[str] = None,
+        expiration: int = 1000,
+    ) -> None:
+        """
+        Publish a report, reconnecting first if the connection was closed.
+
+        Parameters
+        ----------
+        body_message : str
+            The message body to be sent.
+        corr_id : str, optional
+            The correlation ID for the message, default is a new UUID.
+        routing_key : str, optional
+            The routing key for the message, default is `out_routing_key`.
+        expiration : int, optional
+            Message expiration time in milliseconds, default is 1000.
+        """
+        if not self.check_connection():
+            await self.connect()
+        if corr_id is None:
+            corr_id = str(uuid.uuid4())
+        if routing_key is None:
+            routing_key = self.out_routing_key
+
+        self.channel.basic_publish(
+            exchange=self.exchange_name,
+            routing_key=routing_key,
+            properties=pika.BasicProperties(
+                correlation_id=corr_id, expiration=str(expiration)
+            ),
+            body=body_message,
+        )
+        if self.publisher_confirms:
+            self.delivery_tag += 1
+            confirmed = asyncio.get_running_loop().create_future()
+            self.pending_confirms[self.delivery_tag] = confirmed
+            await confirmed
+
+    def check_connection(self) -> bool:
+        return (
+            self.connection is not None
+            and self.connection.is_open
+            and self.channel is not None
+            and self.channel.is_open
+        )
+
+    async def close(self) -> None:
+        """
+        Close the connection, waiting for outstanding confirms first.
+        """
+        if self.pending_confirms:
+            await asyncio.gather(
+                *self.pending_confirms.values(), return_exceptions=True
+            )
+        if self.connection is not None and self.connection.is_open:
+            self.connection.close()
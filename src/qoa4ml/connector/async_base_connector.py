@@ -0,0 +1,58 @@
+import asyncio
+from abc import ABC, abstractmethod
+
+from .base_connector import BaseConnector
+
+
+class AsyncBaseConnector(ABC):
+    async def connect(self) -> None:
+        # NOTE: connectors without a connection to open override nothing
+        return None
+
+    @abstractmethod
+    async def send_report(self, body_message: str) -> None:
+        pass
+
+    async def send_report_batch(self, body_messages: list[str]) -> None:
+        for body_message in body_messages:
+            await self.send_report(body_message)
+
+    def check_connection(self) -> bool:
+        return True
+
+    async def close(self) -> None:
+        return None
+
+
+class AsyncConnectorAdapter(AsyncBaseConnector):
+    """
+    AsyncConnectorAdapter runs a blocking connector in a worker thread so it can be awaited.
+
+    Parameters
+    ----------
+    connector : BaseConnector
+        The blocking connector to wrap.
+
+    Notes
+    -----
+    Calls to the wrapped connector are serialized with a lock, since blocking connectors are not thread-safe.
+    """
+
+    def __init__(self, connector: BaseConnector) -> None:
+        self.connector = connector
+        self.lock = asyncio.Lock()
+
+    async def send_report(self, body_message: str) -> None:
+        async with self.lock:
+            await asyncio.to_thread(self.connector.send_report, body_message)
+
+    async def send_report_batch(self, body_messages: list[str]) -> None:
+        async with self.lock:
+            await asyncio.to_thread(self.connector.send_report_batch, body_messages)
+
+    def check_connection(self) -> bool:
+        return self.connector.check_connection()
+
+    async def close(self) -> None:
+        async with self.lock:
+            await asyncio.to_thread(self.connector.close)
@@ -6,5 +6,13 @@ class BaseConnector(ABC):
     def send_report(self, body_message: str):
         pass
 
+    def send_report_batch(self, body_messages: list[str]) -> None:
+        for body_message in body_messages:
+            self.send_report(body_message)
+
     def check_connection(self) -> bool:
         return True
+
+    def close(self) -> None:
+        # NOTE: connectors holding a connection or buffered messages override this
+        return None
@@ -1,4 +1,8 @@
-from confluent_kafka import Producer
+import atexit
+import threading
+from typing import Optional
+
+from confluent_kafka import KafkaError, Message, Producer
 
 from ..config.configs import KafkaConnectorConfig
 from ..utils.logger import qoa_logger
@@ -11,29 +15,205 @@ def kafka_delivery_error(err, msg):
 
 
 class KafkaConnector(BaseConnector):
-    def __init__(self, config: KafkaConnectorConfig, log: bool = False):
+    """
+    KafkaConnector produces reports to a Kafka topic.
+
+    Parameters
+    ----------
+    config : KafkaConnectorConfig
+        Configuration settings for the Kafka connector.
+    log : bool, optional
+        A flag to enable logging of messages, default is False.
+    producer : Producer, optional
+        The producer to use, default is a new producer built from `config`.
+
+    Attributes
+    ----------
+    conf : KafkaConnectorConfig
+        The Kafka connector configuration.
+    topic : str
+        The topic reports are produced to.
+    producer : Producer
+        The underlying confluent-kafka producer.
+    delivered : int
+        Number of reports acknowledged by the broker.
+    failed : int
+        Number of reports that could not be queued or delivered.
+    total_latency : float
+        Sum of the delivery latencies of the delivered reports, in seconds.
+    max_latency : float
+        Largest delivery latency observed, in seconds.
+
+    Methods
+    -------
+    send_report(body_message: str)
+        Queue a report for delivery.
+    get_delivery_stats() -> dict
+        Get the delivery counters and latencies.
+    flush(timeout: Optional[float] = None) -> int
+        Wait for the queued reports to be delivered.
+    close(timeout: Optional[float] = None)
+        Deliver the queued reports and stop the poll thread.
+    get() -> KafkaConnectorConfig
+        Get the current configuration of the connector.
+
+    Notes
+    -----
+    - By default `send_report` only queues the report, so the producer batches reports according to `linger_ms`,
+      `batch_size` and `compression_type`. Delivery callbacks are served by a background thread.
+    - With `synchronous`, every report is flushed before `send_report` returns, as in earlier versions.
+    - Queued reports are flushed on `close`, which also runs at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        config: KafkaConnectorConfig,
+        log: bool = False,
+        producer: Optional[Producer] = None,
+    ):
         self.conf = config
         self.topic = config.topic
         self.log_flag = log
-        self.producer: Producer = Producer(
-            bootstrap_servers=config.broker_url,
-        )
+        if producer is None:
+            producer = Producer(self.producer_config(config))
+        self.producer: Producer = producer
+        self.delivered = 0
+        self.failed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.stats_lock = threading.Lock()
+        self.closed = False
+        self.stop_event = threading.Event()
+        self.poll_thread = None
+        if not config.synchronous:
+            self.poll_thread = threading.Thread(
+                target=self.poll_deliveries, name="qoa-kafka-poll", daemon=True
+            )
+            self.poll_thread.start()
+        atexit.register(self.close)
+
+    @staticmethod
+    def producer_config(config: KafkaConnectorConfig) -> dict:
+        producer_config = {
+            "bootstrap.servers": config.broker_url,
+            "linger.ms": config.linger_ms,
+        }
+        if config.batch_size is not None:
+            producer_config["batch.size"] = config.batch_size
+        if config.compression_type is not None:
+            producer_config["compression.type"] = config.compression_type
+        producer_config.update(config.producer_config)
+        return producer_config
+
+    def poll_deliveries(self) -> None:
+        while not self.stop_event.is_set():
+            self.producer.poll(self.conf.poll_interval)
+
+    def on_delivery(self, err: Optional[KafkaError], msg: Message) -> None:
+        with self.stats_lock:
+            if err is not None:
+                self.failed += 1
+            else:
+                self.delivered += 1
+                latency = msg.latency()
+                if latency is not None:
+                    self.total_latency += latency
+                    self.max_latency = max(self.max_latency, latency)
+        kafka_delivery_error(err, msg)
 
     def send_report(
         self,
         body_message: str,
     ):
-        self.producer.poll(0)
+        """
+        Queue a report for delivery.
+
+        Parameters
+        ----------
+        body_message : str
+            The report to be sent.
 
-        self.producer.produce(
-            self.topic,
-            body_message.encode("utf-8"),
-            callback=kafka_delivery_error,
-        )
-        self.producer.flush()
+        Notes
+        -----
+        - When the local producer queue is full, the producer is polled once to make room before retrying.
+          If it is still full, the report is counted as failed and dropped.
+        """
+        payload = body_message.encode("utf-8")
+        try:
+            self.producer.produce(self.topic, payload, on_delivery=self.on_delivery)
+        except BufferError:
+            self.producer.poll(self.conf.poll_interval)
+            try:
+                self.producer.produce(self.topic, payload, on_delivery=self.on_delivery)
+            except BufferError:
+                with self.stats_lock:
+                    self.failed += 1
+                qoa_logger.error("Kafka producer queue is full, dropping report")
+                return
+        if self.conf.synchronous:
+            self.producer.flush()
 
         if self.log_flag:
             qoa_logger.info(f"Sent message to topic {self.topic}: {body_message}")
 
+    def get_delivery_stats(self) -> dict:
+        """
+        Get the delivery counters and latencies.
+
+        Returns
+        -------
+        dict
+            The number of delivered and failed reports, the reports still queued, and the mean and maximum
+            delivery latency in seconds.
+        """
+        with self.stats_lock:
+            return {
+                "delivered": self.delivered,
+                "failed": self.failed,
+                "queued": len(self.producer),
+                "mean_latency": (
+                    self.total_latency / self.delivered if self.delivered else 0.0
+                ),
+                "max_latency": self.max_latency,
+            }
+
+    def flush(self, timeout: Optional[float] = None) -> int:
+        """
+        Wait for the queued reports to be delivered.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time to wait in seconds, default is `close_timeout`.
+
+        Returns
+        -------
+        int
+            The number of reports still queued.
+        """
+        if timeout is None:
+            timeout = self.conf.close_timeout
+        return self.producer.flush(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Deliver the queued reports and stop the poll thread.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum time to wait for delivery in seconds, default is `close_timeout`.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        atexit.unregister(self.close)
+        self.stop_event.set()
+        if self.poll_thread is not None:
+            self.poll_thread.join()
+        remaining = self.flush(timeout)
+        if remaining:
+            qoa_logger.warning(f"{remaining} Kafka reports were not delivered")
+
     def get(self):
         return self.conf
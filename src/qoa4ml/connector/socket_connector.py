@@ -1,16 +1,43 @@
-import logging
-import pickle
 import socket
+import threading
 import time
 from typing import Optional
 
 from ..config.configs import SocketConnectorConfig
+from ..utils.framing import encode_frame
+from ..utils.logger import qoa_logger
 from .base_connector import BaseConnector
 
 
+def peer_closed(client_socket: socket.socket) -> bool:
+    """
+    Check without blocking whether the peer closed a socket.
+
+    Parameters
+    ----------
+    client_socket : socket.socket
+        The connected socket.
+
+    Returns
+    -------
+    bool
+        True if the peer closed the connection or the socket is broken.
+    """
+    timeout = client_socket.gettimeout()
+    client_socket.setblocking(False)
+    try:
+        return client_socket.recv(1, socket.MSG_PEEK) == b""
+    except (BlockingIOError, InterruptedError):
+        return False
+    except OSError:
+        return True
+    finally:
+        client_socket.settimeout(timeout)
+
+
 class SocketConnector(BaseConnector):
     """
-    SocketConnector handles the connection to a TCP socket for sending serialized messages.
+    SocketConnector handles the connection to a TCP socket for sending length-prefixed reports.
 
     Parameters
     ----------
@@ -25,11 +52,26 @@ class SocketConnector(BaseConnector):
         The hostname or IP address to connect to.
     port : int
         The port number to connect to on the host.
+    persistent_connection : bool
+        Whether the socket is kept open across reports.
+    client_socket : Optional[socket.socket]
+        The open socket, None until the first report.
 
     Methods
     -------
     send_report(body_message: str, log_path: Optional[str] = None) -> None
-        Send a serialized message over the socket and optionally log the round-trip time.
+        Send a report over the socket and optionally log the round-trip time.
+    send_report_batch(body_messages: list[str]) -> None
+        Send several reports with a single write.
+    close() -> None
+        Close the socket.
+
+    Notes
+    -----
+    - Each report is sent as a 4-byte big-endian length followed by the UTF-8 encoded report, see `utils.framing`.
+    - Reports are pipelined on the persistent socket; it is reopened if the aggregator closed it, and the write is
+      retried once if it broke.
+    - The connector can be shared by several probes, writes are serialized with a lock.
     """
 
     def __init__(self, config: SocketConnectorConfig):
@@ -44,39 +86,84 @@ class SocketConnector(BaseConnector):
         self.config = config
         self.host = config.host
         self.port = config.port
+        self.persistent_connection = config.persistent_connection
+        self.client_socket: Optional[socket.socket] = None
+        self.lock = threading.Lock()
+
+    def connect(self) -> socket.socket:
+        client_socket = socket.create_connection(
+            (self.host, self.port), timeout=self.config.timeout
+        )
+        client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return client_socket
+
+    def send_frames(self, data: bytes) -> None:
+        with self.lock:
+            try:
+                # NOTE: writing to a socket closed by the peer succeeds once, losing the data, so check before
+                if self.client_socket is not None and peer_closed(self.client_socket):
+                    self.close_socket()
+                if self.client_socket is None:
+                    self.client_socket = self.connect()
+                try:
+                    self.client_socket.sendall(data)
+                except OSError:
+                    self.close_socket()
+                    self.client_socket = self.connect()
+                    self.client_socket.sendall(data)
+            except ConnectionRefusedError:
+                self.close_socket()
+                qoa_logger.error("Connection to aggregator refused")
+            except OSError as e:
+                self.close_socket()
+                qoa_logger.error(f"Error {type(e)} when sending report to aggregator")
+            if not self.persistent_connection:
+                self.close_socket()
 
     def send_report(self, body_message: str, log_path: Optional[str] = None) -> None:
         """
-        Send a serialized message over the socket and optionally log the round-trip time.
+        Send a report over the socket and optionally log the round-trip time.
 
         Parameters
         ----------
         body_message : str
-            The message body to be serialized and sent.
+            The report to be sent.
         log_path : str, optional
             The path to the log file where round-trip time will be recorded, default is None.
 
         Notes
         -----
-        - This method serializes the `body_message` using the `pickle` module.
-        - It then sends the serialized message to the configured host and port.
         - If `log_path` is provided, the round-trip time in milliseconds will be recorded in the specified log file.
+        - Connection errors are logged and the report is dropped.
+        """
+        start = time.time()
+        self.send_frames(encode_frame(body_message))
+        if log_path:
+            with open(log_path, "a", encoding="utf-8") as file:
+                file.write(f"{(time.time() - start) * 1000:.2f} ms\n")
+
+    def send_report_batch(self, body_messages: list[str]) -> None:
+        """
+        Send several reports with a single write.
+
+        Parameters
+        ----------
+        body_messages : list[str]
+            The reports to be sent, in order.
+        """
+        self.send_frames(b"".join(encode_frame(message) for message in body_messages))
 
-        Raises
-        ------
-        ConnectionRefusedError
-            If the connection to the host is refused.
+    def close_socket(self) -> None:
+        if self.client_socket is not None:
+            try:
+                self.client_socket.close()
+            except OSError:
+                pass
+            self.client_socket = None
+
+    def close(self) -> None:
+        """
+        Close the socket.
         """
-        try:
-            start = time.time()
-            client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            client_socket.connect((self.host, self.port))
-            serialized_message = pickle.dumps(body_message)
-            client_socket.sendall(serialized_message)
-            client_socket.close()
-
-            if log_path:
-                with open(log_path, "a", encoding="utf-8") as file:
-                    file.write(f"{(time.time() - start) * 1000:.2f} ms\n")
-        except ConnectionRefusedError:
-            logging.error("Connection to aggregator refused")
+        with self.lock:
+            self.close_socket()
@@ -139,6 +139,7 @@ class AggregateFunctionEnum(str, Enum):
     OR = "OR"
     AND = "AND"
     PRODUCT = "PRODUCT"
+    PERCENTILE = "PERCENTILE"
 
 
 class CostUnitEnum(str, Enum):
@@ -174,7 +175,28 @@ class ReportTypeEnum(str, Enum):
     security = "security_report"
 
 
+class OverflowPolicyEnum(str, Enum):
+    drop_oldest = "drop_oldest"
+    drop_newest = "drop_newest"
+    block = "block"
+
+
 class EnvironmentEnum(str, Enum):
     hpc = "HPC"
     edge = "Edge"
     cloud = "Cloud"
+
+
+class DatabaseBackendEnum(str, Enum):
+    tinyflux = "tinyflux"
+    columnar = "columnar"
+
+
+class ExportFormatEnum(str, Enum):
+    arrow = "arrow"
+    parquet = "parquet"
+
+
+class ReaderBackendEnum(str, Enum):
+    psutil = "psutil"
+    procfs = "procfs"
@@ -0,0 +1,66 @@
+import math
+from typing import Optional
+
+import numpy as np
+
+from qoa4ml.lang.datamodel_enum import AggregateFunctionEnum
+
+
+def aggregate(
+    values: np.ndarray,
+    function: AggregateFunctionEnum,
+    percentile: Optional[float] = None,
+) -> Optional[float]:
+    """
+    Aggregate the values of a field, ignoring missing values.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The float values of the field, NaN where the field is missing.
+    function : AggregateFunctionEnum
+        The aggregation function.
+    percentile : Optional[float], optional
+        The percentile in [0, 100], required by `AggregateFunctionEnum.PERCENTILE`.
+
+    Returns
+    -------
+    Optional[float]
+        The aggregated value, None if there is no value to aggregate.
+
+    Raises
+    ------
+    ValueError
+        If the percentile is missing or out of range for `AggregateFunctionEnum.PERCENTILE`.
+    """
+    present = values[~np.isnan(values)]
+    if function == AggregateFunctionEnum.COUNT:
+        return float(len(present))
+    if function == AggregateFunctionEnum.PERCENTILE and (
+        percentile is None or not 0 <= percentile <= 100
+    ):
+        raise ValueError("PERCENTILE needs a percentile between 0 and 100")
+    if len(present) == 0:
+        return None
+    if function == AggregateFunctionEnum.MIN:
+        result = np.min(present)
+    elif function == AggregateFunctionEnum.MAX:
+        result = np.max(present)
+    elif function == AggregateFunctionEnum.AVG:
+        result = np.mean(present)
+    elif function == AggregateFunctionEnum.SUM:
+        result = np.sum(present)
+    elif function == AggregateFunctionEnum.PRODUCT:
+        result = np.prod(present)
+    elif function == AggregateFunctionEnum.OR:
+        result = np.any(present)
+    elif function == AggregateFunctionEnum.AND:
+        result = np.all(present)
+    else:
+        result = np.percentile(present, percentile)
+    return float(result)
+
+
+def to_json_list(values: np.ndarray) -> list:
+    # NOTE: NaN isn't valid JSON, missing values are returned as null
+    return [None if math.isnan(value) else value for value in values.tolist()]
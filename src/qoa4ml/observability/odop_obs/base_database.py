@@ -0,0 +1,136 @@
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+from tinyflux import Point
+
+
+class SeriesData:
+    """
+    SeriesData holds the points of one series as columns.
+
+    Parameters
+    ----------
+    tags : dict
+        The tags identifying the series.
+    timestamps : np.ndarray
+        The time of each point as int64 nanoseconds since the epoch, in ascending order.
+    fields : dict[str, np.ndarray]
+        One array per field, aligned with `timestamps`. Missing numeric values are NaN.
+    """
+
+    __slots__ = ("fields", "tags", "timestamps")
+
+    def __init__(
+        self, tags: dict, timestamps: np.ndarray, fields: dict[str, np.ndarray]
+    ) -> None:
+        self.tags = tags
+        self.timestamps = timestamps
+        self.fields = fields
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+class BaseDatabase(ABC):
+    @abstractmethod
+    def insert(self, timestamp: float, tags: dict, fields: dict):
+        pass
+
+    def insert_multiple(
+        self, points: list[tuple[float, dict, dict]], update_latest: bool = True
+    ):
+        # NOTE: databases with a bulk write override this, and skip the latest points already recorded by
+        # update_latest when update_latest is False
+        for timestamp, tags, fields in points:
+            self.insert(timestamp, tags, fields)
+
+    @abstractmethod
+    def update_latest(self, timestamp: float, tags: dict, fields: dict) -> None:
+        pass
+
+    @abstractmethod
+    def get_lastest_timestamp(self) -> list[Point]:
+        pass
+
+    @abstractmethod
+    def get_latest_version(self) -> int:
+        pass
+
+    @abstractmethod
+    def query_range(
+        self, start: float, end: float, tags: Optional[dict] = None
+    ) -> list[SeriesData]:
+        pass
+
+    def iter_chunks(
+        self,
+        start: float,
+        end: float,
+        chunk_seconds: float,
+        tags: Optional[dict] = None,
+    ) -> Iterator[tuple[int, int, list[SeriesData]]]:
+        # NOTE: databases that can read a range in one pass override this
+        for chunk_start, chunk_end, start_ns, end_ns in chunk_bounds(
+            start, end, chunk_seconds
+        ):
+            yield start_ns, end_ns, self.query_range(chunk_start, chunk_end, tags)
+
+    @abstractmethod
+    def get_time_range(self) -> Optional[tuple[float, float]]:
+        pass
+
+    @abstractmethod
+    def remove_before(self, timestamp: float) -> None:
+        pass
+
+    def close(self) -> None:
+        # NOTE: databases buffering points in memory override this
+        return None
+
+
+def chunk_bounds(
+    start: float, end: float, chunk_seconds: float
+) -> Iterator[tuple[float, float, int, int]]:
+    chunk_start = start
+    while chunk_start <= end:
+        chunk_end = min(chunk_start + chunk_seconds, end)
+        last_chunk = chunk_end >= end
+        # NOTE: the end of a chunk is the start of the next one, only the last chunk includes it
+        end_ns = to_ns(chunk_end) + 1 if last_chunk else to_ns(chunk_end)
+        yield chunk_start, chunk_end, to_ns(chunk_start), end_ns
+        if last_chunk:
+            return
+        chunk_start = chunk_end
+
+
+def match_tags(series_tags: dict, tags: Optional[dict]) -> bool:
+    if not tags:
+        return True
+    # NOTE: tags from a query string are always strings
+    return all(
+        key in series_tags and str(series_tags[key]) == str(value)
+        for key, value in tags.items()
+    )
+
+
+def series_key(tags: dict) -> tuple:
+    return tuple(sorted(tags.items()))
+
+
+def to_datetime(timestamp: float) -> datetime:
+    # NOTE: TinyFlux reads naive times as UTC, points and queries use aware UTC times whatever the local time zone
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+def to_ns(timestamp: float) -> int:
+    return round(timestamp * 1e9)
+
+
+def to_column(values: list) -> np.ndarray:
+    return np.array(
+        [math.nan if value is None else value for value in values], dtype=np.float64
+    )
@@ -0,0 +1,274 @@
+import logging
+import time
+from collections import deque
+from threading import Lock
+from typing import Annotated, Optional
+
+import uvicorn
+from fastapi import APIRouter, Body, FastAPI, HTTPException, Query
+from flatten_dict import unflatten
+
+from qoa4ml.config.configs import ClusterAggregatorConfig
+from qoa4ml.lang.datamodel_enum import AggregateFunctionEnum
+from qoa4ml.observability.odop_obs.base_database import match_tags
+from qoa4ml.observability.odop_obs.summary import SUMMARIES_URL_PATH, FieldSummary
+
+logging.basicConfig(
+    format="%(asctime)s:%(levelname)s -- %(message)s", level=logging.INFO
+)
+
+CLUSTER_AGGREGATE_URL_PATH = "/cluster/aggregate"
+CLUSTER_NODES_URL_PATH = "/cluster/nodes"
+NODE_LABEL = "node"
+
+
+class NodeSummary:
+    """
+    NodeSummary is a summary pushed by a node, covering its points between two timestamps.
+    """
+
+    __slots__ = ("end", "node", "series", "start")
+
+    def __init__(self, node: str, start: float, end: float, series: list) -> None:
+        self.node = node
+        self.start = start
+        self.end = end
+        self.series = series
+
+
+class ClusterAggregator:
+    """
+    ClusterAggregator merges the summaries pushed by the node aggregators of a cluster and answers cluster queries.
+
+    Parameters
+    ----------
+    config : ClusterAggregatorConfig
+        Configuration settings for the cluster aggregator.
+
+    Attributes
+    ----------
+    summaries : deque[NodeSummary]
+        The summaries received within the retention, oldest first.
+    summary_keys : set[tuple[str, float, float]]
+        The node, start and end of the stored summaries.
+    router : APIRouter
+        The routes receiving summaries and answering queries.
+    app : FastAPI
+        The application serving the router.
+
+    Methods
+    -------
+    receive_summary(summary: dict) -> dict
+        Store a summary pushed by a node.
+    get_nodes() -> dict
+        Get the nodes pushing summaries and the end of their latest summary.
+    get_aggregate(function, percentile, window, start, end, tags, fields, group_by) -> list[dict]
+        Aggregate the fields of the matching series of every node.
+    start()
+        Serve the application.
+
+    Notes
+    -----
+    - Queries cover whole summaries: a summary is used if it overlaps the queried window, so the time resolution
+      is the push interval of the nodes.
+    - Count, sum, min, max and mean are exact. Percentiles come from the merged quantile sketches, within their
+      relative accuracy.
+    - The node name is available as the `node` tag, in filters and in `group_by`.
+    - A summary pushed again for the same node, start and end replaces the stored one, so a retried push is not
+      counted twice.
+    - Summaries whose sketches don't have the configured relative accuracy are rejected, they can't be merged.
+    """
+
+    def __init__(self, config: ClusterAggregatorConfig) -> None:
+        self.config = config
+        self.summaries: deque[NodeSummary] = deque()
+        self.summary_keys: set[tuple[str, float, float]] = set()
+        self.lock = Lock()
+        self.router = APIRouter()
+        self.router.add_api_route(
+            SUMMARIES_URL_PATH, self.receive_summary, methods=["POST"]
+        )
+        self.router.add_api_route(
+            CLUSTER_NODES_URL_PATH, self.get_nodes, methods=[self.config.query_method]
+        )
+        self.router.add_api_route(
+            CLUSTER_AGGREGATE_URL_PATH,
+            self.get_aggregate,
+            methods=[self.config.query_method],
+        )
+        self.app = FastAPI()
+        self.app.include_router(self.router)
+
+    def receive_summary(self, summary: Annotated[dict, Body()]):
+        try:
+            node_summary = NodeSummary(
+                summary["node"],
+                float(summary["start"]),
+                float(summary["end"]),
+                [
+                    {
+                        "tags": {**series["tags"], NODE_LABEL: summary["node"]},
+                        "fields": {
+                            name: FieldSummary.from_dict(field)
+                            for name, field in series["fields"].items()
+                        },
+                        "units": series.get("units", {}),
+                    }
+                    for series in summary["series"]
+                ],
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid summary: {e}") from e
+        expected_accuracy = self.config.sketch_relative_accuracy
+        for series in node_summary.series:
+            for name, field in series["fields"].items():
+                if field.sketch.relative_accuracy != expected_accuracy:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Sketch of {name} has a relative accuracy of {field.sketch.relative_accuracy}, "
+                        f"expected {expected_accuracy}",
+                    )
+        key = (node_summary.node, node_summary.start, node_summary.end)
+        oldest = time.time() - self.config.retention
+        with self.lock:
+            if key in self.summary_keys:
+                # NOTE: a resent summary is among the latest ones
+                for index in range(len(self.summaries) - 1, -1, -1):
+                    summary = self.summaries[index]
+                    if (summary.node, summary.start, summary.end) == key:
+                        self.summaries[index] = node_summary
+                        break
+            else:
+                self.summaries.append(node_summary)
+                self.summary_keys.add(key)
+            while self.summaries and self.summaries[0].end < oldest:
+                summary = self.summaries.popleft()
+                self.summary_keys.discard((summary.node, summary.start, summary.end))
+        return {"series": len(node_summary.series)}
+
+    def get_nodes(self):
+        nodes: dict[str, dict] = {}
+        with self.lock:
+            for summary in self.summaries:
+                node = nodes.setdefault(summary.node, {"summaries": 0, "end": None})
+                node["summaries"] += 1
+                node["end"] = max(node["end"] or summary.end, summary.end)
+        return nodes
+
+    def get_aggregate(
+        self,
+        function: AggregateFunctionEnum,
+        percentile: Optional[float] = None,
+        window: Optional[float] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        tags: Annotated[Optional[list[str]], Query()] = None,
+        fields: Annotated[Optional[list[str]], Query()] = None,
+        group_by: Annotated[Optional[list[str]], Query()] = None,
+    ):
+        """
+        Aggregate the fields of the matching series of every node over a time window.
+
+        Parameters
+        ----------
+        function : AggregateFunctionEnum
+            The aggregation function, one of MIN, MAX, SUM, AVG, COUNT and PERCENTILE.
+        percentile : Optional[float], optional
+            The percentile in [0, 100] for `PERCENTILE`.
+        window : Optional[float], optional
+            Length of the window in seconds, ending at `end`.
+        start : Optional[float], optional
+            Start of the window as a Unix timestamp, used when `window` isn't given.
+        end : Optional[float], optional
+            End of the window as a Unix timestamp, default is now.
+        tags : Optional[list[str]], optional
+            Tags the series must have, as `key=value`.
+        fields : Optional[list[str]], optional
+            Fields to aggregate, default is all fields.
+        group_by : Optional[list[str]], optional
+            Tags to group the series by, default aggregates the whole cluster.
+
+        Returns
+        -------
+        list[dict]
+            For each group, its tags, its number of values per field, and the aggregated value of each field.
+            Unit fields are returned with their latest value.
+        """
+        if end is None:
+            end = time.time()
+        if window is not None:
+            start = end - window
+        if start is None or start > end:
+            raise HTTPException(
+                status_code=400, detail="Give a window or a start before the end"
+            )
+        tag_filter = {}
+        for tag in tags or []:
+            key, separator, value = tag.partition("=")
+            if not separator:
+                raise HTTPException(
+                    status_code=400, detail=f"Tag {tag} is not of the form key=value"
+                )
+            tag_filter[key] = value
+        group_keys = group_by or []
+
+        groups: dict[tuple, dict] = {}
+        with self.lock:
+            summaries = [
+                summary
+                for summary in self.summaries
+                if summary.end >= start and summary.start <= end
+            ]
+        for summary in summaries:
+            for series in summary.series:
+                if not match_tags(series["tags"], tag_filter):
+                    continue
+                group_tags = {key: series["tags"].get(key) for key in group_keys}
+                group = groups.setdefault(
+                    tuple(group_tags.values()),
+                    {"tags": group_tags, "fields": {}, "units": {}},
+                )
+                for name, field in series["fields"].items():
+                    if fields and name not in fields:
+                        continue
+                    merged = group["fields"].get(name)
+                    if merged is None:
+                        merged = FieldSummary(field.sketch.relative_accuracy)
+                        group["fields"][name] = merged
+                    merged.merge(field)
+                group["units"].update(
+                    {
+                        name: unit
+                        for name, unit in series["units"].items()
+                        if not fields or name in fields
+                    }
+                )
+
+        result = []
+        for group in groups.values():
+            try:
+                aggregated = {
+                    name: merged.value(function, percentile)
+                    for name, merged in group["fields"].items()
+                }
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+            result.append(
+                {
+                    "tags": unflatten(group["tags"], self.config.data_separator),
+                    "count": unflatten(
+                        {
+                            name: merged.count
+                            for name, merged in group["fields"].items()
+                        },
+                        self.config.data_separator,
+                    ),
+                    "fields": unflatten(
+                        {**aggregated, **group["units"]}, self.config.data_separator
+                    ),
+                }
+            )
+        return result
+
+    def start(self):
+        uvicorn.run(self.app, host=self.config.host, port=self.config.port)
@@ -0,0 +1,515 @@
+import atexit
+import bisect
+import json
+import math
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from tinyflux import Point
+
+from qoa4ml.observability.odop_obs.base_database import (
+    BaseDatabase,
+    SeriesData,
+    match_tags,
+    series_key,
+    to_column,
+    to_datetime,
+    to_ns,
+)
+from qoa4ml.observability.odop_obs.latest_index import LatestPointIndex
+from qoa4ml.utils.logger import qoa_logger
+
+CATALOG_FILE = "series.json"
+META_FILE = "meta.json"
+TIME_FILE = "time.npy"
+
+
+class Segment:
+    """
+    Segment is an immutable, time-sorted block of points of one series, stored as one `.npy` file per column.
+    """
+
+    __slots__ = ("columns", "end", "path", "start")
+
+    def __init__(self, path: Path, start: int, end: int) -> None:
+        self.path = path
+        self.start = start
+        self.end = end
+        self.columns: Optional[dict[str, np.ndarray]] = None
+
+    def load(self) -> dict[str, np.ndarray]:
+        if self.columns is None:
+            with open(self.path / META_FILE, encoding="utf-8") as file:
+                meta = json.load(file)
+            columns = {TIME_FILE: np.load(self.path / TIME_FILE, mmap_mode="r")}
+            for field in meta["fields"]:
+                columns[field["name"]] = np.load(
+                    self.path / field["file"], mmap_mode="r"
+                )
+            self.columns = columns
+        return self.columns
+
+
+class Series:
+    """
+    Series holds the segment index and the write buffer of one series.
+    """
+
+    __slots__ = ("buffer", "path", "segments", "starts", "tags")
+
+    def __init__(self, tags: dict, path: Path) -> None:
+        self.tags = tags
+        self.path = path
+        self.segments: list[Segment] = []
+        self.starts: list[int] = []
+        self.buffer: list[tuple[int, dict]] = []
+
+    def add_segment(self, segment: Segment) -> None:
+        position = bisect.bisect_right(self.starts, segment.start)
+        self.starts.insert(position, segment.start)
+        self.segments.insert(position, segment)
+
+
+class ColumnarDatabase(BaseDatabase):
+    """
+    ColumnarDatabase stores each series as append-only columnar segments of NumPy arrays.
+
+    Parameters
+    ----------
+    db_path : Path
+        The directory holding the database.
+    latest_ttl : Optional[float], optional
+        Seconds after which a series without new points is left out of the latest points, default is None.
+    segment_size : int, optional
+        Points of a series buffered in memory before a segment is written, default is 3600.
+    max_open_segments : int, optional
+        Segments whose memory maps are kept open between queries, default is 256.
+
+    Attributes
+    ----------
+    series : dict[tuple, Series]
+        The series, keyed by their sorted tags.
+    latest_index : LatestPointIndex
+        The latest point of every series.
+    open_segments : OrderedDict[Segment, None]
+        The segments with open memory maps, least recently used first.
+
+    Methods
+    -------
+    insert(timestamp: float, tags: dict, fields: dict)
+        Insert a point.
+    insert_multiple(points: list[tuple[float, dict, dict]], update_latest: bool = True)
+        Insert `(timestamp, tags, fields)` points under a single lock acquisition, all of them or none.
+    update_latest(timestamp: float, tags: dict, fields: dict)
+        Record a point as the latest of its series without inserting it.
+    get_lastest_timestamp() -> list[Point]
+        Get the latest point of every live series.
+    get_latest_version() -> int
+        Get the version of the latest points, changed by every new latest point.
+    query_range(start: float, end: float, tags: Optional[dict] = None) -> list[SeriesData]
+        Get the points of the matching series between two timestamps.
+    get_time_range() -> Optional[tuple[float, float]]
+        Get the first and last timestamps of the stored points.
+    remove_before(timestamp: float)
+        Remove the points older than a timestamp and compact the segments.
+    flush()
+        Write the buffered points as segments.
+    close()
+        Flush the buffered points.
+
+    Notes
+    -----
+    - Each series has its own directory. A segment is a sub-directory named after its first and last timestamps,
+      with the timestamps as int64 nanoseconds in `time.npy` and one float64 file per field.
+    - Segments are read with `np.memmap`, so a range query within one segment returns views of the files without
+      copying them. Segments are found by bisecting the per-series index sorted by start time. The memory maps of
+      the least recently used segments are dropped beyond `max_open_segments`, and opened again when needed.
+    - Buffered points are included in queries and written on `flush`, `close` and at interpreter exit.
+    - `remove_before` deletes expired segments and rewrites the segments straddling the cutoff. It also merges
+      small segments, left by flushes on shutdown, so the number of segments a query opens stays bounded.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        latest_ttl: Optional[float] = None,
+        segment_size: int = 3600,
+        max_open_segments: int = 256,
+    ) -> None:
+        self.path = Path(db_path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.max_open_segments = max_open_segments
+        self.open_segments: OrderedDict[Segment, None] = OrderedDict()
+        self.segments_lock = threading.Lock()
+        self.lock = threading.Lock()
+        self.series: dict[tuple, Series] = {}
+        self.latest_index = LatestPointIndex(latest_ttl)
+        self.segment_sequence = 0
+        self.load(latest_ttl)
+        atexit.register(self.close)
+
+    def load(self, latest_ttl: Optional[float]) -> None:
+        catalog_path = self.path / CATALOG_FILE
+        if not catalog_path.exists():
+            return
+        with open(catalog_path, encoding="utf-8") as file:
+            catalog = json.load(file)
+        oldest = None if latest_ttl is None else to_ns(time.time() - latest_ttl)
+        for name, tags in catalog.items():
+            series = Series(tags, self.path / name)
+            for segment_dir in series.path.iterdir():
+                if segment_dir.name.startswith("."):
+                    # NOTE: a segment interrupted while being written
+                    continue
+                start, end, sequence = (
+                    int(part) for part in segment_dir.name.split("-")
+                )
+                self.segment_sequence = max(self.segment_sequence, sequence + 1)
+                series.add_segment(Segment(segment_dir, start, end))
+            self.series[series_key(tags)] = series
+            if series.segments:
+                last = max(series.segments, key=lambda segment: segment.end)
+                if oldest is None or last.end >= oldest:
+                    self.latest_index.update(
+                        last_point(series.tags, self.load_segment(last))
+                    )
+
+    def save_catalog(self) -> None:
+        catalog = {series.path.name: series.tags for series in self.series.values()}
+        temporary_path = self.path / f"{CATALOG_FILE}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(catalog, file)
+        os.replace(temporary_path, self.path / CATALOG_FILE)
+
+    def insert(self, timestamp: float, tags: dict, fields: dict):
+        self.insert_multiple([(timestamp, tags, fields)])
+
+    def insert_multiple(
+        self, points: list[tuple[float, dict, dict]], update_latest: bool = True
+    ):
+        points = [
+            (timestamp, tags, numeric_fields(fields))
+            for timestamp, tags, fields in points
+        ]
+        # NOTE: building the points validates the tags and fields as TinyFlux does, before anything is written
+        datapoints = [
+            Point(time=to_datetime(timestamp), tags=tags, fields=fields)
+            for timestamp, tags, fields in points
+        ]
+        with self.lock:
+            keys = [series_key(tags) for _, tags, _ in points]
+            created = False
+            for key, (_, tags, _) in zip(keys, points):
+                if key not in self.series:
+                    series = Series(
+                        dict(tags), self.path / f"series_{len(self.series)}"
+                    )
+                    series.path.mkdir(exist_ok=True)
+                    self.series[key] = series
+                    created = True
+            if created:
+                self.save_catalog()
+            # NOTE: once the series exist, the batch is only appended to memory, so it is kept whole or not at all
+            full: dict[tuple, Series] = {}
+            for key, (timestamp, _, fields), datapoint in zip(keys, points, datapoints):
+                series = self.series[key]
+                series.buffer.append((to_ns(timestamp), fields))
+                if update_latest:
+                    self.latest_index.update(datapoint)
+                if len(series.buffer) >= self.segment_size:
+                    full[key] = series
+            for series in full.values():
+                self.try_write_segment(series)
+
+    def update_latest(self, timestamp: float, tags: dict, fields: dict) -> None:
+        datapoint = Point(
+            time=to_datetime(timestamp), tags=tags, fields=numeric_fields(fields)
+        )
+        with self.lock:
+            self.latest_index.update(datapoint)
+
+    def try_write_segment(self, series: Series) -> None:
+        try:
+            self.write_segment(series)
+        except OSError:
+            qoa_logger.exception(
+                f"Unable to write a segment of {series.path.name}, its points stay buffered"
+            )
+        except (TypeError, ValueError, OverflowError):
+            # NOTE: these points would fail again, they are dropped instead of staying buffered
+            qoa_logger.exception(
+                f"Unable to convert the points of {series.path.name}, dropping {len(series.buffer)} points"
+            )
+            series.buffer = []
+
+    def write_segment(self, series: Series) -> None:
+        timestamps, columns = buffer_columns(series.buffer)
+        segment = write_columns(series.path, timestamps, columns, self.next_sequence())
+        # NOTE: the buffer is only cleared once its segment is written
+        series.buffer = []
+        series.add_segment(segment)
+
+    def next_sequence(self) -> int:
+        sequence = self.segment_sequence
+        self.segment_sequence += 1
+        return sequence
+
+    def get_time_range(self) -> Optional[tuple[float, float]]:
+        bounds = []
+        with self.lock:
+            for series in self.series.values():
+                bounds.extend(
+                    (segment.start, segment.end) for segment in series.segments
+                )
+                bounds.extend((timestamp, timestamp) for timestamp, _ in series.buffer)
+        if not bounds:
+            return None
+        return min(low for low, _ in bounds) / 1e9, max(
+            high for _, high in bounds
+        ) / 1e9
+
+    def remove_before(self, timestamp: float) -> None:
+        cutoff = to_ns(timestamp)
+        with self.lock:
+            self.latest_index.prune(timestamp)
+            series_list = list(self.series.values())
+            for series in series_list:
+                series.buffer = [point for point in series.buffer if point[0] >= cutoff]
+        for series in series_list:
+            self.compact_series(series, cutoff)
+
+    def compact_series(self, series: Series, cutoff: int) -> None:
+        with self.lock:
+            segments = list(series.segments)
+        expired = [segment for segment in segments if segment.end < cutoff]
+        straddling = [
+            segment for segment in segments if segment.start < cutoff <= segment.end
+        ]
+        small = [
+            segment
+            for segment in segments
+            if segment.start >= cutoff
+            and len(self.load_segment(segment)[TIME_FILE]) < self.segment_size
+        ]
+        rewritten = straddling + small if len(small) > 1 else straddling
+        if not expired and not rewritten:
+            return
+
+        parts = [
+            slice_columns(self.load_segment(segment), cutoff, np.iinfo(np.int64).max)
+            for segment in rewritten
+        ]
+        parts = [part for part in parts if len(part[TIME_FILE])]
+        new_segments = []
+        if parts:
+            merged = merge_parts(series.tags, parts)
+            for low in range(0, len(merged), self.segment_size):
+                high = low + self.segment_size
+                with self.lock:
+                    sequence = self.next_sequence()
+                new_segments.append(
+                    write_columns(
+                        series.path,
+                        merged.timestamps[low:high],
+                        {
+                            name: values[low:high]
+                            for name, values in merged.fields.items()
+                        },
+                        sequence,
+                    )
+                )
+
+        removed = {id(segment) for segment in expired + rewritten}
+        with self.lock:
+            kept = [
+                segment for segment in series.segments if id(segment) not in removed
+            ]
+            series.segments = []
+            series.starts = []
+            for segment in kept + new_segments:
+                series.add_segment(segment)
+        # NOTE: queries holding memory maps of the removed files keep reading them until they are done
+        for segment in expired + rewritten:
+            self.unload_segment(segment)
+            shutil.rmtree(segment.path, ignore_errors=True)
+
+    def load_segment(self, segment: Segment) -> dict[str, np.ndarray]:
+        # NOTE: callers holding the columns of an evicted segment keep reading them until they are done
+        with self.segments_lock:
+            self.open_segments[segment] = None
+            self.open_segments.move_to_end(segment)
+            while len(self.open_segments) > self.max_open_segments:
+                evicted, _ = self.open_segments.popitem(last=False)
+                evicted.columns = None
+            return segment.load()
+
+    def unload_segment(self, segment: Segment) -> None:
+        with self.segments_lock:
+            self.open_segments.pop(segment, None)
+            segment.columns = None
+
+    def flush(self) -> None:
+        with self.lock:
+            for series in self.series.values():
+                if series.buffer:
+                    self.try_write_segment(series)
+
+    def close(self) -> None:
+        atexit.unregister(self.close)
+        self.flush()
+
+    def get_lastest_timestamp(self) -> list[Point]:
+        with self.lock:
+            return self.latest_index.get_latest()
+
+    def get_latest_version(self) -> int:
+        with self.lock:
+            return self.latest_index.version
+
+    def query_range(
+        self, start: float, end: float, tags: Optional[dict] = None
+    ) -> list[SeriesData]:
+        start_ns, end_ns = to_ns(start), to_ns(end)
+        with self.lock:
+            matching = [
+                (series, list(series.buffer))
+                for series in self.series.values()
+                if match_tags(series.tags, tags)
+            ]
+            candidates = [
+                [
+                    segment
+                    for segment in series.segments[
+                        : bisect.bisect_right(series.starts, end_ns)
+                    ]
+                    if segment.end >= start_ns
+                ]
+                for series, _ in matching
+            ]
+
+        results = []
+        for (series, buffer), segments in zip(matching, candidates):
+            parts = [
+                slice_columns(self.load_segment(segment), start_ns, end_ns)
+                for segment in segments
+            ]
+            if buffer:
+                timestamps, columns = buffer_columns(buffer)
+                parts.append(
+                    slice_columns({TIME_FILE: timestamps, **columns}, start_ns, end_ns)
+                )
+            parts = [part for part in parts if len(part[TIME_FILE])]
+            if parts:
+                results.append(merge_parts(series.tags, parts))
+        return results
+
+
+def buffer_columns(buffer: list[tuple[int, dict]]) -> tuple[np.ndarray, dict]:
+    timestamps = np.fromiter(
+        (row[0] for row in buffer), dtype=np.int64, count=len(buffer)
+    )
+    order = np.argsort(timestamps, kind="stable")
+    names: dict[str, None] = {}
+    for _, fields in buffer:
+        names.update(dict.fromkeys(fields))
+    columns = {}
+    for name in names:
+        values = [buffer[i][1].get(name) for i in order]
+        columns[name] = to_column(values)
+    return timestamps[order], columns
+
+
+def write_columns(
+    series_path: Path, timestamps: np.ndarray, columns: dict, sequence: int
+) -> Segment:
+    start, end = int(timestamps[0]), int(timestamps[-1])
+    name = f"{start}-{end}-{sequence}"
+    temporary_dir = series_path / f".{name}"
+    temporary_dir.mkdir()
+    np.save(temporary_dir / TIME_FILE, timestamps)
+    meta = {"fields": []}
+    for index, (field_name, values) in enumerate(columns.items()):
+        file_name = f"field_{index}.npy"
+        np.save(temporary_dir / file_name, values)
+        meta["fields"].append({"name": field_name, "file": file_name})
+    with open(temporary_dir / META_FILE, "w", encoding="utf-8") as file:
+        json.dump(meta, file)
+    segment_dir = series_path / name
+    os.replace(temporary_dir, segment_dir)
+    return Segment(segment_dir, start, end)
+
+
+def slice_columns(columns: dict, start_ns: int, end_ns: int) -> dict:
+    timestamps = columns[TIME_FILE]
+    low = np.searchsorted(timestamps, start_ns, side="left")
+    high = np.searchsorted(timestamps, end_ns, side="right")
+    return {name: values[low:high] for name, values in columns.items()}
+
+
+def merge_parts(tags: dict, parts: list[dict]) -> SeriesData:
+    if len(parts) == 1:
+        part = parts[0]
+        timestamps = part.pop(TIME_FILE)
+        return SeriesData(tags, timestamps, part)
+    names: dict[str, None] = {}
+    for part in parts:
+        names.update(dict.fromkeys(part))
+    del names[TIME_FILE]
+    timestamps = np.concatenate([part[TIME_FILE] for part in parts])
+    fields = {
+        name: np.concatenate(
+            [
+                part[name] if name in part else np.full(len(part[TIME_FILE]), math.nan)
+                for part in parts
+            ]
+        )
+        for name in names
+    }
+    if np.any(timestamps[1:] < timestamps[:-1]):
+        order = np.argsort(timestamps, kind="stable")
+        timestamps = timestamps[order]
+        fields = {name: values[order] for name, values in fields.items()}
+    return SeriesData(tags, timestamps, fields)
+
+
+def numeric_fields(fields: dict) -> dict:
+    # NOTE: fields are stored as float64 columns, values that can't be cast are dropped and the point kept
+    kept = {}
+    dropped = []
+    for name, value in fields.items():
+        if value is not None:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                dropped.append(name)
+                continue
+            try:
+                float(value)
+            except OverflowError:
+                dropped.append(name)
+                continue
+        kept[name] = value
+    if dropped:
+        qoa_logger.warning(f"Dropping the non-numeric fields {dropped}")
+    return kept
+
+
+def last_point(tags: dict, columns: dict[str, np.ndarray]) -> Point:
+    fields = {}
+    for name, values in columns.items():
+        if name == TIME_FILE:
+            continue
+        value = values[-1].item()
+        if isinstance(value, float) and math.isnan(value):
+            continue
+        fields[name] = value
+    return Point(
+        time=to_datetime(int(columns[TIME_FILE][-1]) / 1e9),
+        tags=tags,
+        fields=fields,
+    )
@@ -0,0 +1,246 @@
+import math
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+from flatten_dict.flatten_dict import REDUCER_DICT
+
+from qoa4ml.config.configs import RetentionPolicyConfig
+from qoa4ml.observability.odop_obs.base_database import (
+    BaseDatabase,
+    SeriesData,
+    to_ns,
+)
+from qoa4ml.utils.logger import qoa_logger
+
+ROLLUP_STATISTICS = ("min", "max", "mean", "count")
+
+
+class Tier:
+    """
+    Tier is a database with its retention policy and the end of the last rolled up bucket.
+    """
+
+    __slots__ = ("database", "policy", "watermark")
+
+    def __init__(self, policy: RetentionPolicyConfig, database: BaseDatabase) -> None:
+        self.policy = policy
+        self.database = database
+        self.watermark: Optional[int] = None
+
+
+class Compactor:
+    """
+    Compactor rolls points up into coarser tiers and removes the points older than the retention of each tier.
+
+    Parameters
+    ----------
+    raw_policy : RetentionPolicyConfig
+        The retention policy of the raw points.
+    raw_database : BaseDatabase
+        The database of the raw points.
+    rollups : list[tuple[RetentionPolicyConfig, BaseDatabase]]
+        The rollup tiers by increasing resolution, with their database.
+    data_separator : str
+        The separator of flattened names, used to name the rollup fields, e.g. `cpu.usage.value.mean`.
+    interval : float, optional
+        Seconds between two runs, default is 60.0.
+    lag : float, optional
+        Seconds a bucket stays open after its end, for late points, default is 10.0.
+
+    Methods
+    -------
+    run_once(now: Optional[float] = None)
+        Roll up the complete buckets and apply the retention policies.
+    start()
+        Run the compactor every `interval` in a background thread.
+    stop()
+        Stop the background thread.
+
+    Notes
+    -----
+    - Each tier is rolled up from the previous one, so a tier can keep buckets longer than the raw points. Minima,
+      maxima and counts are combined as such and means are weighted by their count.
+    - A rollup point is timestamped with the start of its bucket. Unit fields keep their last value.
+    - The end of the last rolled up bucket is read back from the tier database on the first run, so a restart
+      doesn't roll a bucket up twice.
+    """
+
+    def __init__(
+        self,
+        raw_policy: RetentionPolicyConfig,
+        raw_database: BaseDatabase,
+        rollups: list[tuple[RetentionPolicyConfig, BaseDatabase]],
+        data_separator: str,
+        interval: float = 60.0,
+        lag: float = 10.0,
+    ) -> None:
+        self.tiers = [Tier(raw_policy, raw_database)] + [
+            Tier(policy, database) for policy, database in rollups
+        ]
+        self.reducer = REDUCER_DICT[data_separator]
+        self.interval = interval
+        self.lag = lag
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def run_once(self, now: Optional[float] = None) -> None:
+        if now is None:
+            now = time.time()
+        # NOTE: the raw points are complete up to the lag
+        complete_until = to_ns(now - self.lag)
+        for source, tier in zip(self.tiers, self.tiers[1:]):
+            resolution = to_ns(tier.policy.resolution)
+            end = complete_until // resolution * resolution
+            self.roll_up(source, tier, end)
+            complete_until = end
+        for tier in self.tiers:
+            if tier.policy.duration is not None:
+                tier.database.remove_before(now - tier.policy.duration)
+
+    def roll_up(self, source: Tier, tier: Tier, end: int) -> None:
+        if tier.watermark is None:
+            tier.watermark = self.read_watermark(tier)
+        start = tier.watermark if tier.watermark is not None else 0
+        if end <= start:
+            return
+        points = []
+        for series in source.database.query_range(start / 1e9, end / 1e9):
+            points.extend(self.roll_up_series(series, source, tier, start, end))
+        if points:
+            tier.database.insert_multiple(points)
+        tier.watermark = end
+
+    def read_watermark(self, tier: Tier) -> Optional[int]:
+        latest = tier.database.get_lastest_timestamp()
+        if not latest:
+            return None
+        resolution = to_ns(tier.policy.resolution)
+        return max(to_ns(point.time.timestamp()) for point in latest) + resolution
+
+    def roll_up_series(
+        self, series: SeriesData, source: Tier, tier: Tier, start: int, end: int
+    ) -> list[tuple[float, dict, dict]]:
+        in_range = (series.timestamps >= start) & (series.timestamps < end)
+        timestamps = series.timestamps[in_range]
+        if len(timestamps) == 0:
+            return []
+        resolution = to_ns(tier.policy.resolution)
+        buckets = timestamps // resolution
+        # NOTE: timestamps are sorted, so the points of a bucket are contiguous
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        columns = {
+            name: np.asarray(values)[in_range] for name, values in series.fields.items()
+        }
+        if source.policy.resolution is None:
+            rolled = self.roll_up_raw(columns, starts)
+        else:
+            rolled = self.roll_up_rollups(columns, starts)
+        bucket_times = buckets[starts] * resolution
+        return [
+            (
+                int(bucket_time) / 1e9,
+                series.tags,
+                {
+                    name: value
+                    for name, values in rolled.items()
+                    if not math.isnan(value := values[index].item())
+                },
+            )
+            for index, bucket_time in enumerate(bucket_times)
+        ]
+
+    def roll_up_raw(self, columns: dict, starts: np.ndarray) -> dict:
+        rolled = {}
+        for name, values in columns.items():
+            if "unit" in name:
+                rolled[name] = last_present(values, starts)
+                continue
+            present = ~np.isnan(values)
+            count = np.add.reduceat(present, starts).astype(np.float64)
+            total = np.add.reduceat(np.where(present, values, 0.0), starts)
+            rolled.update(
+                self.statistics(
+                    name,
+                    np.fmin.reduceat(values, starts),
+                    np.fmax.reduceat(values, starts),
+                    total,
+                    count,
+                )
+            )
+        return rolled
+
+    def roll_up_rollups(self, columns: dict, starts: np.ndarray) -> dict:
+        rolled = {}
+        bases = {}
+        for name in columns:
+            if "unit" in name:
+                rolled[name] = last_present(columns[name], starts)
+                continue
+            for statistic in ROLLUP_STATISTICS:
+                suffix = self.reducer("x", statistic)[1:]
+                if name.endswith(suffix):
+                    bases.setdefault(name[: -len(suffix)], {})[statistic] = columns[
+                        name
+                    ]
+                    break
+        for base, statistics in bases.items():
+            if len(statistics) != len(ROLLUP_STATISTICS):
+                continue
+            count = np.nan_to_num(statistics["count"])
+            weighted = np.where(count > 0, statistics["mean"] * count, 0.0)
+            rolled.update(
+                self.statistics(
+                    base,
+                    np.fmin.reduceat(statistics["min"], starts),
+                    np.fmax.reduceat(statistics["max"], starts),
+                    np.add.reduceat(weighted, starts),
+                    np.add.reduceat(count, starts),
+                )
+            )
+        return rolled
+
+    def statistics(
+        self,
+        name: str,
+        minimum: np.ndarray,
+        maximum: np.ndarray,
+        total: np.ndarray,
+        count: np.ndarray,
+    ) -> dict:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, total / count, math.nan)
+        return {
+            self.reducer(name, "min"): minimum,
+            self.reducer(name, "max"): maximum,
+            self.reducer(name, "mean"): mean,
+            self.reducer(name, "count"): np.where(count > 0, count, math.nan),
+        }
+
+    def run(self) -> None:
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                qoa_logger.exception(f"Error {type(e)} when compacting the databases")
+
+    def start(self) -> None:
+        if self.thread is not None:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+
+
+def last_present(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    indices = np.where(np.isnan(values), -1, np.arange(len(values)))
+    last = np.maximum.reduceat(indices, starts)
+    return np.where(last >= starts, values[np.maximum(last, 0)], math.nan)
@@ -1,22 +1,347 @@
-import math
+import csv
+import itertools
+import locale
+import os
+import shutil
+import threading
 import time
-from datetime import datetime
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 
+import numpy as np
 from tinyflux import Point, TimeQuery, TinyFlux
 from tinyflux.storages import CSVStorage
 
+from qoa4ml.observability.odop_obs.base_database import (
+    BaseDatabase,
+    SeriesData,
+    chunk_bounds,
+    match_tags,
+    series_key,
+    to_column,
+    to_datetime,
+    to_ns,
+)
+from qoa4ml.observability.odop_obs.latest_index import LatestPointIndex
+from qoa4ml.utils.logger import qoa_logger
 
-class EmbeddedDatabase:
-    def __init__(self, db_path: Path) -> None:
-        self.db = TinyFlux(db_path, flush_on_insert=False, storage=CSVStorage)
+
+class TinyFluxInternals:
+    """
+    TinyFluxInternals gives access to the private parts of TinyFlux the embedded database reads faster with.
+
+    Parameters
+    ----------
+    db : TinyFlux
+        The database whose index and CSV storage are accessed.
+
+    Attributes
+    ----------
+    available : bool
+        Whether this TinyFlux version has the private attributes, checked once.
+
+    Methods
+    -------
+    flush() -> bool
+        Write the rows buffered by the storage to its file.
+    sorted_index() -> Optional[tuple[list[float], list[int]]]
+        The timestamps in order with the storage row of each.
+    deserialize(row: list[str]) -> Point
+        Read a point from a row of the CSV file.
+
+    Notes
+    -----
+    - These are the only accesses to TinyFlux internals. When they are missing, the methods return None or
+      False and the database falls back to the public API, which reads the whole file more often.
+    """
+
+    def __init__(self, db: TinyFlux) -> None:
+        self.db = db
+        index = getattr(db, "_index", None)
+        storage = getattr(db, "_storage", None)
+        self.available = (
+            hasattr(index, "valid")
+            and hasattr(index, "_timestamps")
+            and hasattr(index, "_storage_pos_sorted_by_ts")
+            and hasattr(storage, "_handle")
+            and hasattr(storage, "_deserialize_storage_item")
+        )
+
+    def flush(self) -> bool:
+        if not self.available:
+            return False
+        self.db._storage._handle.flush()
+        return True
+
+    def sorted_index(self) -> Optional[tuple[list[float], list[int]]]:
+        if not self.available:
+            return None
+        # NOTE: points inserted out of order invalidate the index, it is rebuilt like TinyFlux read operations do
+        if not self.db._index.valid:
+            self.db.reindex()
+        index = self.db._index
+        return index._timestamps, index._storage_pos_sorted_by_ts
+
+    def deserialize(self, row: list[str]) -> Point:
+        return self.db._storage._deserialize_storage_item(row)
+
+
+class EmbeddedDatabase(BaseDatabase):
+    def __init__(self, db_path: Path, latest_ttl: Optional[float] = None) -> None:
+        self.db_path = db_path
+        migrate_local_times(db_path)
+        self.open()
+        if not self.internals.available:
+            qoa_logger.warning(
+                "TinyFlux internals not found, reading the embedded database with the slower public API"
+            )
+        # NOTE: reports are inserted from the collector worker threads
+        self.lock = threading.Lock()
+        self.latest_index = LatestPointIndex(latest_ttl)
+        self.latest_index.warm(self.recent_points(latest_ttl))
+
+    def recent_points(self, ttl: Optional[float]) -> list[Point]:
+        if ttl is None:
+            return self.db.all()
+        return self.db.search(TimeQuery() >= to_datetime(time.time() - ttl))
 
     def insert(self, timestamp: float, tags: dict, fields: dict):
-        timestamp_datetime = datetime.fromtimestamp(timestamp)
-        datapoint = Point(time=timestamp_datetime, tags=tags, fields=fields)
-        self.db.insert(datapoint, compact_key_prefixes=True)
+        datapoint = Point(time=to_datetime(timestamp), tags=tags, fields=fields)
+        with self.lock:
+            self.db.insert(datapoint, compact_key_prefixes=True)
+            self.latest_index.update(datapoint)
+
+    def insert_multiple(
+        self, points: list[tuple[float, dict, dict]], update_latest: bool = True
+    ):
+        datapoints = [
+            Point(time=to_datetime(timestamp), tags=tags, fields=fields)
+            for timestamp, tags, fields in points
+        ]
+        with self.lock:
+            self.db.insert_multiple(
+                datapoints,
+                compact_key_prefixes=True,
+                batch_size=max(len(datapoints), 1),
+            )
+            if update_latest:
+                for datapoint in datapoints:
+                    self.latest_index.update(datapoint)
+
+    def update_latest(self, timestamp: float, tags: dict, fields: dict) -> None:
+        datapoint = Point(time=to_datetime(timestamp), tags=tags, fields=fields)
+        with self.lock:
+            self.latest_index.update(datapoint)
+
+    def open(self) -> None:
+        self.db = TinyFlux(self.db_path, flush_on_insert=False, storage=CSVStorage)
+        self.internals = TinyFluxInternals(self.db)
+
+    def get_time_range(self) -> Optional[tuple[float, float]]:
+        with self.lock:
+            index = self.internals.sorted_index()
+            if index is not None:
+                timestamps = index[0]
+            else:
+                timestamps = sorted(
+                    timestamp.timestamp() for timestamp in self.db.get_timestamps()
+                )
+            if not timestamps:
+                return None
+            return timestamps[0], timestamps[-1]
+
+    def remove_before(self, timestamp: float) -> None:
+        # NOTE: TinyFlux.remove loses points when the storage isn't flushed on insert, the kept points are
+        # written to a new file instead, which replaces the old one only once complete. The file is filtered
+        # without the lock, which is then only held to copy the rows inserted meanwhile and swap the files.
+        temporary_path = f"{self.db_path}.tmp"
+        # NOTE: TinyFlux stores naive UTC times
+        cutoff = to_datetime(timestamp).replace(tzinfo=None)
+        with self.lock:
+            self.latest_index.prune(timestamp)
+            if not self.internals.flush():
+                # NOTE: without flushing the storage, the file is only complete once closed
+                self.rewrite(self.db.search(TimeQuery() >= to_datetime(timestamp)))
+                return
+            scanned = os.path.getsize(self.db_path)
+
+        # NOTE: a file left by an interrupted rewrite is discarded
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        removed = 0
+        with open(temporary_path, "w", newline="") as target:
+            writer = csv.writer(target)
+            for row in csv.reader(read_lines(self.db_path, scanned)):
+                if datetime.fromisoformat(row[0]) < cutoff:
+                    removed += 1
+                else:
+                    writer.writerow(row)
+        if not removed:
+            os.remove(temporary_path)
+            return
+
+        with self.lock:
+            self.internals.flush()
+            with (
+                open(self.db_path, "rb") as source,
+                open(temporary_path, "ab") as target,
+            ):
+                source.seek(scanned)
+                shutil.copyfileobj(source, target)
+            self.db.close()
+            os.replace(temporary_path, self.db_path)
+            self.open()
+
+    def rewrite(self, kept: list[Point]) -> None:
+        # NOTE: called with the lock held, the points are written to a new file that replaces the database
+        if len(kept) == len(self.db):
+            return
+        temporary_path = f"{self.db_path}.tmp"
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        rewritten = TinyFlux(temporary_path, auto_index=False, storage=CSVStorage)
+        try:
+            rewritten.insert_multiple(
+                kept, compact_key_prefixes=True, batch_size=max(len(kept), 1)
+            )
+        finally:
+            rewritten.close()
+        self.db.close()
+        os.replace(temporary_path, self.db_path)
+        self.open()
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
 
     def get_lastest_timestamp(self):
+        # NOTE: answered from memory, the storage is only read when warming the index
+        with self.lock:
+            return self.latest_index.get_latest()
+
+    def get_latest_version(self) -> int:
+        with self.lock:
+            return self.latest_index.version
+
+    def query_range(
+        self, start: float, end: float, tags: Optional[dict] = None
+    ) -> list[SeriesData]:
         time_query = TimeQuery()
-        timestamp = datetime.fromtimestamp(math.floor(time.time()))
-        return self.db.search(time_query >= timestamp)
+        with self.lock:
+            points = self.db.search(
+                (time_query >= to_datetime(start)) & (time_query <= to_datetime(end))
+            )
+        return group_series(point for point in points if match_tags(point.tags, tags))
+
+    def iter_chunks(
+        self,
+        start: float,
+        end: float,
+        chunk_seconds: float,
+        tags: Optional[dict] = None,
+    ) -> Iterator[tuple[int, int, list[SeriesData]]]:
+        # NOTE: a TinyFlux search reads the file from its first row, so the file is read once for all chunks.
+        # The index gives the last row of each chunk, a chunk is returned once that row is read.
+        chunks = []
+        with self.lock:
+            index = self.internals.sorted_index()
+            if index is not None:
+                timestamps, positions = index
+                for chunk_start, chunk_end, start_ns, end_ns in chunk_bounds(
+                    start, end, chunk_seconds
+                ):
+                    # NOTE: the bounds are widened by a microsecond, rows are assigned to chunks by their nanoseconds
+                    first = bisect_left(timestamps, chunk_start - 1e-6)
+                    last = bisect_right(timestamps, chunk_end + 1e-6)
+                    if first < last:
+                        chunks.append((start_ns, end_ns, max(positions[first:last])))
+                rows = len(timestamps)
+                self.internals.flush()
+                # NOTE: a rewrite by remove_before replaces the file, this handle keeps reading the old one
+                handle = open(self.db_path, newline="")
+        if index is None:
+            yield from super().iter_chunks(start, end, chunk_seconds, tags)
+            return
+        if not chunks:
+            handle.close()
+            return
+
+        starts = [start_ns for start_ns, _, _ in chunks]
+        buffered: dict[int, list[Point]] = {}
+        next_chunk = 0
+        with handle:
+            for position, row in enumerate(itertools.islice(csv.reader(handle), rows)):
+                point = self.internals.deserialize(row)
+                timestamp_ns = to_ns(point.time.timestamp())
+                chunk = bisect_right(starts, timestamp_ns) - 1
+                if (
+                    chunk >= 0
+                    and timestamp_ns < chunks[chunk][1]
+                    and match_tags(point.tags, tags)
+                ):
+                    buffered.setdefault(chunk, []).append(point)
+                while next_chunk < len(chunks) and chunks[next_chunk][2] <= position:
+                    start_ns, end_ns, _ = chunks[next_chunk]
+                    yield start_ns, end_ns, group_series(buffered.pop(next_chunk, []))
+                    next_chunk += 1
+
+
+def group_series(points: Iterable[Point]) -> list[SeriesData]:
+    grouped: dict[tuple, list[Point]] = {}
+    for point in points:
+        grouped.setdefault(series_key(point.tags), []).append(point)
+
+    results = []
+    for series_points in grouped.values():
+        series_points.sort(key=lambda point: point.time)
+        names: dict[str, None] = {}
+        for point in series_points:
+            names.update(dict.fromkeys(point.fields))
+        timestamps = np.array(
+            [to_ns(point.time.timestamp()) for point in series_points],
+            dtype=np.int64,
+        )
+        fields = {
+            name: to_column([point.fields.get(name) for point in series_points])
+            for name in names
+        }
+        results.append(SeriesData(series_points[0].tags, timestamps, fields))
+    return results
+
+
+def migrate_local_times(db_path: Path) -> None:
+    # NOTE: files written before points used aware UTC times hold naive local times, which TinyFlux reads as UTC.
+    # They are converted once, a marker file next to the database records that its times are UTC.
+    marker = f"{db_path}.utc"
+    if os.path.exists(marker):
+        return
+    if os.path.exists(db_path) and os.path.getsize(db_path):
+        qoa_logger.warning(f"Converting the local times of {db_path} to UTC")
+        temporary_path = f"{db_path}.tmp"
+        with (
+            open(db_path, newline="") as source,
+            open(temporary_path, "w", newline="") as target,
+        ):
+            writer = csv.writer(target)
+            for row in csv.reader(source):
+                # NOTE: astimezone reads a naive time as local time
+                utc_time = datetime.fromisoformat(row[0]).astimezone(timezone.utc)
+                row[0] = utc_time.replace(tzinfo=None).isoformat()
+                writer.writerow(row)
+        os.replace(temporary_path, db_path)
+    with open(marker, "w"):
+        pass
+
+
+def read_lines(path: Path, size: int) -> Iterator[str]:
+    # NOTE: only the first `size` bytes are read, rows appended after them are left to the caller
+    encoding = locale.getpreferredencoding(False)
+    with open(path, "rb") as handle:
+        while handle.tell() < size:
+            line = handle.readline(size - handle.tell())
+            if not line:
+                return
+            yield line.decode(encoding)
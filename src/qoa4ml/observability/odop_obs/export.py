@@ -0,0 +1,272 @@
+import argparse
+import math
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+import lazy_import
+import numpy as np
+
+from qoa4ml.lang.datamodel_enum import DatabaseBackendEnum, ExportFormatEnum
+from qoa4ml.observability.odop_obs.base_database import BaseDatabase, SeriesData
+from qoa4ml.observability.odop_obs.columnar_database import ColumnarDatabase
+from qoa4ml.observability.odop_obs.embedded_database import EmbeddedDatabase
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+else:
+    pa = lazy_import.lazy_module("pyarrow")
+    pq = lazy_import.lazy_module("pyarrow.parquet")
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormatEnum.arrow: "application/vnd.apache.arrow.stream",
+    ExportFormatEnum.parquet: "application/vnd.apache.parquet",
+}
+
+
+def export_schema() -> "pa.Schema":
+    """
+    Get the schema of exported points, one row per point and field.
+
+    Returns
+    -------
+    pa.Schema
+        `timestamp` in UTC nanoseconds, the series `tags` as a map, the dictionary-encoded `field` name and its
+        float64 `value`.
+
+    Raises
+    ------
+    ImportError
+        If pyarrow isn't installed, it comes with the `arrow` extra.
+    """
+    return pa.schema(
+        [
+            pa.field("timestamp", pa.timestamp("ns", tz="UTC"), nullable=False),
+            pa.field("tags", pa.map_(pa.string(), pa.string()), nullable=False),
+            pa.field("field", pa.dictionary(pa.int32(), pa.string()), nullable=False),
+            pa.field("value", pa.float64(), nullable=False),
+        ]
+    )
+
+
+def series_batch(
+    series: SeriesData,
+    schema: "pa.Schema",
+    start_ns: int,
+    end_ns: int,
+    fields: Optional[list[str]] = None,
+) -> Optional["pa.RecordBatch"]:
+    in_range = (series.timestamps >= start_ns) & (series.timestamps < end_ns)
+    timestamps = series.timestamps[in_range]
+    names = [name for name in series.fields if not fields or name in fields]
+    if len(timestamps) == 0 or not names:
+        return None
+    # NOTE: rows are ordered by time, then by field
+    values = np.stack(
+        [np.asarray(series.fields[name])[in_range] for name in names], axis=1
+    ).ravel()
+    name_indices = np.tile(np.arange(len(names), dtype=np.int32), len(timestamps))
+    row_timestamps = np.repeat(timestamps, len(names))
+    present = ~np.isnan(values)
+    rows = int(np.count_nonzero(present))
+    if rows == 0:
+        return None
+    tag_items = [(key, str(value)) for key, value in series.tags.items()]
+    return pa.record_batch(
+        [
+            pa.array(row_timestamps[present], type=schema.field("timestamp").type),
+            pa.array([tag_items] * rows, type=schema.field("tags").type),
+            pa.DictionaryArray.from_arrays(
+                pa.array(name_indices[present]), pa.array(names, type=pa.string())
+            ),
+            pa.array(values[present], type=pa.float64()),
+        ],
+        schema=schema,
+    )
+
+
+def iter_record_batches(
+    database: BaseDatabase,
+    start: float,
+    end: float,
+    tags: Optional[dict] = None,
+    fields: Optional[list[str]] = None,
+    chunk_seconds: float = 3600.0,
+) -> Iterator["pa.RecordBatch"]:
+    """
+    Read the points of the matching series between two timestamps, one time chunk at a time.
+
+    Parameters
+    ----------
+    database : BaseDatabase
+        The database to export.
+    start : float
+        The first timestamp, included.
+    end : float
+        The last timestamp, included.
+    tags : Optional[dict], optional
+        Tags the series must have, default is every series.
+    fields : Optional[list[str]], optional
+        Fields to export, default is every field.
+    chunk_seconds : float, optional
+        Seconds of points read from the database at once, default is 3600.0.
+
+    Yields
+    ------
+    pa.RecordBatch
+        The points of one series within one chunk, in the `export_schema` schema.
+
+    Notes
+    -----
+    Memory is bounded by the points of one chunk, whatever the length of the exported range.
+    """
+    schema = export_schema()
+    for start_ns, end_ns, chunk in database.iter_chunks(
+        start, end, chunk_seconds, tags
+    ):
+        for series in chunk:
+            batch = series_batch(series, schema, start_ns, end_ns, fields)
+            if batch is not None:
+                yield batch
+
+
+class ChunkSink:
+    """
+    ChunkSink collects the bytes written by pyarrow writers so they can be streamed out as they are produced.
+    """
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.closed = False
+        self.position = 0
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self.chunks.append(chunk)
+        self.position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        return None
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def new_writer(
+    sink, export_format: ExportFormatEnum, schema: "pa.Schema"
+) -> "pa.ipc.RecordBatchStreamWriter | pq.ParquetWriter":
+    if export_format == ExportFormatEnum.parquet:
+        return pq.ParquetWriter(sink, schema, compression="zstd")
+    return pa.ipc.new_stream(sink, schema)
+
+
+def iter_export(
+    batches: Iterator["pa.RecordBatch"], export_format: ExportFormatEnum
+) -> Iterator[bytes]:
+    """
+    Encode record batches as an Arrow IPC stream or a Parquet file, yielding the bytes as they are encoded.
+
+    Parameters
+    ----------
+    batches : Iterator[pa.RecordBatch]
+        Record batches in the `export_schema` schema.
+    export_format : ExportFormatEnum
+        The encoding, each batch becomes an IPC message or a Parquet row group.
+
+    Yields
+    ------
+    bytes
+        The encoded bytes written since the previous batch.
+    """
+    sink = ChunkSink()
+    writer = new_writer(sink, export_format, export_schema())
+    for batch in batches:
+        writer.write_batch(batch)
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+def export_to_file(
+    batches: Iterator["pa.RecordBatch"], export_format: ExportFormatEnum, path: Path
+) -> int:
+    rows = 0
+    schema = export_schema()
+    with open(path, "wb") as file:
+        writer = new_writer(file, export_format, schema)
+        for batch in batches:
+            writer.write_batch(batch)
+            rows += len(batch)
+        writer.close()
+    return rows
+
+
+def open_database(path: Path, backend: DatabaseBackendEnum) -> BaseDatabase:
+    # NOTE: a zero TTL skips reading the latest points, the export doesn't need them
+    if backend == DatabaseBackendEnum.columnar:
+        return ColumnarDatabase(path, latest_ttl=0.0)
+    return EmbeddedDatabase(path, latest_ttl=0.0)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Export the points stored by an ODOP node aggregator as Arrow IPC or Parquet."
+    )
+    parser.add_argument(
+        "database", type=Path, help="The CSV file or columnar directory"
+    )
+    parser.add_argument("output", type=Path, help="The file to write")
+    parser.add_argument(
+        "--backend",
+        type=DatabaseBackendEnum,
+        default=DatabaseBackendEnum.tinyflux,
+        choices=list(DatabaseBackendEnum),
+    )
+    parser.add_argument(
+        "--format",
+        dest="export_format",
+        type=ExportFormatEnum,
+        default=ExportFormatEnum.parquet,
+        choices=list(ExportFormatEnum),
+    )
+    parser.add_argument("--start", type=float, default=0.0, help="Unix timestamp")
+    parser.add_argument("--end", type=float, default=math.inf, help="Unix timestamp")
+    parser.add_argument(
+        "--tag", action="append", default=[], help="key=value, may be repeated"
+    )
+    parser.add_argument(
+        "--field", action="append", default=None, help="may be repeated"
+    )
+    parser.add_argument("--chunk-seconds", type=float, default=3600.0)
+    args = parser.parse_args(argv)
+
+    tags = dict(tag.split("=", 1) for tag in args.tag)
+    database = open_database(args.database, args.backend)
+    time_range = database.get_time_range()
+    if time_range is None:
+        print(f"No point in {args.database}")
+        return
+    # NOTE: the range is clipped to the stored points, so no empty chunk is read from the epoch
+    start = max(args.start, time_range[0])
+    end = min(args.end, time_range[1])
+    rows = export_to_file(
+        iter_record_batches(database, start, end, tags, args.field, args.chunk_seconds),
+        args.export_format,
+        args.output,
+    )
+    database.close()
+    print(f"Exported {rows} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
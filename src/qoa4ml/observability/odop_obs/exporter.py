@@ -1,4 +1,6 @@
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import uvicorn
@@ -14,11 +16,19 @@ logging.basicConfig(
 
 class Exporter:
     def __init__(self, config: ExporterConfig, odop_path: Path) -> None:
-        self.app = FastAPI()
+        self.app = FastAPI(lifespan=self.lifespan)
         self.config = config
         self.node_aggregator = NodeAggregator(self.config.node_aggregator, odop_path)
         self.app.include_router(self.node_aggregator.router)
 
-    def start(self):
+    @asynccontextmanager
+    async def lifespan(self, app: FastAPI) -> AsyncIterator[None]:
+        # NOTE: stopping the node aggregator writes the points still buffered
         self.node_aggregator.start()
+        try:
+            yield
+        finally:
+            self.node_aggregator.stop()
+
+    def start(self):
         uvicorn.run(self.app, host=self.config.host, port=self.config.port)
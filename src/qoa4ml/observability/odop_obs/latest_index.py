@@ -0,0 +1,82 @@
+import time
+from collections.abc import Iterable
+from typing import Optional
+
+from tinyflux import Point
+
+
+class LatestPointIndex:
+    """
+    LatestPointIndex keeps the latest point of every series in memory.
+
+    Parameters
+    ----------
+    ttl : Optional[float], optional
+        Seconds after which a series without new points is no longer returned, default is None, which keeps every
+        series.
+
+    Attributes
+    ----------
+    latest : dict[tuple, Point]
+        The latest point of each series, keyed by the sorted tags of the series.
+    version : int
+        Incremented whenever the latest points change, so renderings of them can be cached.
+
+    Methods
+    -------
+    update(point: Point) -> None
+        Record a point if it is the latest of its series.
+    warm(points: Iterable[Point]) -> None
+        Record points read back from storage.
+    prune(before: float) -> None
+        Forget the series whose latest point is older than a timestamp.
+    get_latest() -> list[Point]
+        Get the latest point of every live series.
+
+    Notes
+    -----
+    - A series is identified by its tags, i.e. the report type and the flattened report metadata.
+    - The index isn't thread-safe; `EmbeddedDatabase` updates and reads it under its lock.
+    """
+
+    def __init__(self, ttl: Optional[float] = None) -> None:
+        self.ttl = ttl
+        self.latest: dict[tuple, Point] = {}
+        self.version = 0
+
+    @staticmethod
+    def series_key(point: Point) -> tuple:
+        return tuple(sorted(point.tags.items()))
+
+    def update(self, point: Point) -> None:
+        key = self.series_key(point)
+        current = self.latest.get(key)
+        if current is None or current.time.timestamp() <= point.time.timestamp():
+            self.latest[key] = point
+            self.version += 1
+
+    def warm(self, points: Iterable[Point]) -> None:
+        for point in points:
+            self.update(point)
+
+    def prune(self, before: float) -> None:
+        expired = [
+            key for key, point in self.latest.items() if point.time.timestamp() < before
+        ]
+        for key in expired:
+            del self.latest[key]
+        if expired:
+            self.version += 1
+
+    def get_latest(self) -> list[Point]:
+        if self.ttl is None:
+            return list(self.latest.values())
+        oldest = time.time() - self.ttl
+        expired = [
+            key for key, point in self.latest.items() if point.time.timestamp() < oldest
+        ]
+        for key in expired:
+            del self.latest[key]
+        if expired:
+            self.version += 1
+        return list(self.latest.values())
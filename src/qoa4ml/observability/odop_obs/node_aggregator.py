@@ -1,20 +1,49 @@
+import asyncio
 import json
 import logging
+import math
 import os
 import socket
+import time
 from datetime import datetime
 from pathlib import Path
-from threading import Thread
-from typing import TYPE_CHECKING
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Annotated, Optional
 
 import lazy_import
-from fastapi import APIRouter
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from flatten_dict import flatten, unflatten
+from pydantic import ValidationError
 
 from qoa4ml.collector.socket_collector import SocketCollector
-from qoa4ml.config.configs import NodeAggregatorConfig
-from qoa4ml.lang.datamodel_enum import EnvironmentEnum
+from qoa4ml.config.configs import NodeAggregatorConfig, RetentionPolicyConfig
+from qoa4ml.lang.datamodel_enum import (
+    AggregateFunctionEnum,
+    DatabaseBackendEnum,
+    EnvironmentEnum,
+    ExportFormatEnum,
+)
+from qoa4ml.observability.odop_obs.aggregation import aggregate, to_json_list
+from qoa4ml.observability.odop_obs.base_database import BaseDatabase, SeriesData
+from qoa4ml.observability.odop_obs.columnar_database import ColumnarDatabase
+from qoa4ml.observability.odop_obs.compactor import Compactor
 from qoa4ml.observability.odop_obs.embedded_database import EmbeddedDatabase
+from qoa4ml.observability.odop_obs.export import (
+    EXPORT_MEDIA_TYPES,
+    export_schema,
+    iter_export,
+    iter_record_batches,
+)
+from qoa4ml.observability.odop_obs.prometheus import (
+    PROMETHEUS_CONTENT_TYPE,
+    render_prometheus,
+)
+from qoa4ml.observability.odop_obs.subscription import Subscriber, SubscriptionHub
+from qoa4ml.observability.odop_obs.summary import SummaryPusher
+from qoa4ml.observability.odop_obs.unit_converter import UnitConverter
+from qoa4ml.observability.odop_obs.write_buffer import WriteBehindBuffer
 from qoa4ml.utils.qoa_utils import make_folder
 
 logging.basicConfig(
@@ -22,15 +51,17 @@ logging.basicConfig(
 )
 
 METRICS_URL_PATH = "/metrics"
+METRICS_RANGE_URL_PATH = "/metrics/range"
+METRICS_AGGREGATE_URL_PATH = "/metrics/aggregate"
+PROMETHEUS_URL_PATH = "/metrics/prometheus"
+METRICS_STREAM_URL_PATH = "/metrics/stream"
+METRICS_EXPORT_URL_PATH = "/metrics/export"
 
 if TYPE_CHECKING:
-    from qoa4ml.reports.resources_report_model import ProcessReport, SystemReport
+    from qoa4ml.reports import resources_report_model
 else:
-    ProcessReport = lazy_import.lazy_class(
-        "qoa4ml.reports.resources_report_model", "ProcessReport"
-    )
-    SystemReport = lazy_import.lazy_class(
-        "qoa4ml.reports.resources_report_model", "SystemReport"
+    resources_report_model = lazy_import.lazy_module(
+        "qoa4ml.reports.resources_report_model"
     )
 
 
@@ -38,12 +69,51 @@ class NodeAggregator:
     def __init__(self, config: NodeAggregatorConfig, odop_path: Path):
         self.config = config
         self.unit_conversion = self.config.unit_conversion
+        self.unit_converter = UnitConverter(self.unit_conversion)
         self.node_name = socket.gethostname().split(".")[0]
         self.database_path = os.path.join(odop_path, "metric_database/")
         make_folder(self.database_path)
-        self.embedded_database = EmbeddedDatabase(
-            self.database_path + self.node_name + ".csv"
+        self.embedded_database = self.create_database(self.node_name, config.latest_ttl)
+        raw_policy = RetentionPolicyConfig()
+        self.rollup_databases: dict[float, BaseDatabase] = {}
+        rollups = []
+        for policy in config.retention_policies:
+            if policy.resolution is None:
+                raw_policy = policy
+                continue
+            # NOTE: every rollup series is kept in the latest index, it gives where the compactor stopped
+            database = self.create_database(
+                f"{self.node_name}_{policy.resolution:g}s", None
+            )
+            self.rollup_databases[policy.resolution] = database
+            rollups.append((policy, database))
+        self.compactor: Optional[Compactor] = None
+        if config.retention_policies:
+            self.compactor = Compactor(
+                raw_policy,
+                self.embedded_database,
+                rollups,
+                config.data_separator,
+                config.compaction_interval,
+                config.compaction_lag,
+            )
+        self.write_buffer = WriteBehindBuffer(
+            self.embedded_database,
+            config.write_batch_size,
+            config.write_flush_interval,
+            config.write_max_pending_batches,
         )
+        self.summary_pusher: Optional[SummaryPusher] = None
+        if config.cluster_aggregator_url is not None:
+            self.summary_pusher = SummaryPusher(
+                self.embedded_database,
+                self.node_name,
+                config.cluster_aggregator_url,
+                self.revert_unit,
+                config.summary_interval,
+                config.write_flush_interval,
+                config.sketch_relative_accuracy,
+            )
         self.environment = config.environment
         self.collector = SocketCollector(
             config.socket_collector_config, self.process_report
@@ -55,126 +125,104 @@ class NodeAggregator:
             self.get_lastest_timestamp,
             methods=[self.config.query_method],
         )
+        self.router.add_api_route(
+            METRICS_RANGE_URL_PATH,
+            self.get_range,
+            methods=[self.config.query_method],
+        )
+        self.router.add_api_route(
+            METRICS_AGGREGATE_URL_PATH,
+            self.get_aggregate,
+            methods=[self.config.query_method],
+        )
+        # NOTE: Prometheus always scrapes with GET
+        self.router.add_api_route(
+            PROMETHEUS_URL_PATH, self.get_prometheus_metrics, methods=["GET"]
+        )
+        self.router.add_api_route(
+            METRICS_STREAM_URL_PATH, self.get_stream, methods=["GET"]
+        )
+        self.router.add_api_route(
+            METRICS_EXPORT_URL_PATH, self.get_export, methods=["GET"]
+        )
+        self.subscriptions = SubscriptionHub()
+        self.prometheus_lock = Lock()
+        self.prometheus_payload = b""
+        self.prometheus_version: Optional[int] = None
+        self.prometheus_expires_at = math.inf
+
+    def create_database(self, name: str, latest_ttl: Optional[float]) -> BaseDatabase:
+        if self.config.database_backend == DatabaseBackendEnum.columnar:
+            return ColumnarDatabase(
+                self.database_path + name,
+                latest_ttl,
+                self.config.segment_size,
+                self.config.max_open_segments,
+            )
+        return EmbeddedDatabase(self.database_path + name + ".csv", latest_ttl)
 
     def process_report(self, report: str):
-        report_dict = json.loads(report)
+        point = self.normalize_report(json.loads(report))
+        if point is not None:
+            self.subscriptions.publish(*point)
+            self.write_buffer.add(*point)
+
+    def normalize_report(self, report_dict) -> Optional[tuple[float, dict, dict]]:
         if self.environment == EnvironmentEnum.hpc:
-            if report_dict["type"] == "system":
-                del report_dict["type"]
-                metadata = flatten(
-                    {"metadata": report_dict["metadata"]}, self.config.data_separator
-                )
-                timestamp = report_dict["timestamp"]
-                del report_dict["metadata"], report_dict["timestamp"]
-                fields = self.convert_unit(
-                    flatten(report_dict, self.config.data_separator)
-                )
-                self.embedded_database.insert(
-                    timestamp,
-                    {"type": "node", **metadata},
-                    fields,
-                )
-            elif report_dict["type"] == "process":
-                del report_dict["type"]
-                metadata = flatten(
-                    {"metadata": report_dict["metadata"]}, self.config.data_separator
-                )
-                timestamp = report_dict["timestamp"]
-                del report_dict["metadata"], report_dict["timestamp"]
-                fields = self.convert_unit(
-                    flatten(report_dict, self.config.data_separator)
-                )
-                self.embedded_database.insert(
-                    timestamp,
-                    {"type": "process", **metadata},
-                    fields,
-                )
+            report_type = report_dict.pop("type", None)
+            if report_type == "system":
+                tag_type = "node"
+            elif report_type == "process":
+                tag_type = "process"
+            elif report_type == "pressure":
+                tag_type = "cgroup"
             else:
                 logging.error("Value Error: Unknown report type")
-        elif isinstance(report_dict, SystemReport):
-            node_name = report_dict.metadata.node_name
-            timestamp = report_dict.timestamp
-            del report_dict.metadata, report_dict.timestamp
-            fields = self.convert_unit(
-                flatten(report_dict.dict(exclude_none=True), self.config.data_separator)
-            )
-            self.embedded_database.insert(
-                timestamp,
-                {
-                    "type": "node",
-                    "node_name": node_name,
-                },
-                fields,
-            )
-        elif isinstance(report_dict, ProcessReport):
+                return None
             metadata = flatten(
-                {"metadata": report_dict.metadata.dict()}, self.config.data_separator
+                {"metadata": report_dict.pop("metadata")}, self.config.data_separator
             )
-            timestamp = report_dict.timestamp
-            del report_dict.metadata, report_dict.timestamp
+            timestamp = report_dict.pop("timestamp")
+            fields = self.convert_unit(flatten(report_dict, self.config.data_separator))
+            return timestamp, {"type": tag_type, **metadata}, fields
+        # NOTE: other environments send the probe report models dumped without a type, the first model
+        # validating the report gives its type
+        for report_model, tag_type in (
+            (resources_report_model.CgroupPressureReport, "cgroup"),
+            (resources_report_model.SystemReport, "node"),
+            (resources_report_model.ProcessReport, "process"),
+        ):
+            try:
+                report = report_model.model_validate(report_dict)
+            except ValidationError:
+                continue
+            if tag_type == "node":
+                tags = {"node_name": report.metadata.node_name}
+            else:
+                tags = flatten(
+                    {"metadata": report.metadata.model_dump(exclude_none=True)},
+                    self.config.data_separator,
+                )
             fields = self.convert_unit(
-                flatten(report_dict.dict(exclude_none=True), self.config.data_separator)
-            )
-            self.embedded_database.insert(
-                timestamp, {"type": "process", **metadata}, fields
+                flatten(
+                    report.model_dump(
+                        exclude={"metadata", "timestamp"}, exclude_none=True
+                    ),
+                    self.config.data_separator,
+                )
             )
+            return report.timestamp, {"type": tag_type, **tags}, fields
+        logging.error("Value Error: Unknown report type")
+        return None
+
+    def flush(self):
+        self.write_buffer.flush()
 
     def convert_unit(self, report: dict):
-        converted_report = report
-        for key, value in report.items():
-            # TODO: for instead of hard coded
-            if isinstance(value, str):
-                if "frequency" in key:
-                    converted_report[key] = self.unit_conversion["frequency"][value]
-                elif "mem" in key:
-                    converted_report[key] = self.unit_conversion["mem"][value]
-                elif "cpu" in key:
-                    if "usage" in key:
-                        converted_report[key] = self.unit_conversion["cpu"]["usage"][
-                            value
-                        ]
-                elif "gpu" in key:
-                    if "usage" in key:
-                        converted_report[key] = self.unit_conversion["gpu"]["usage"][
-                            value
-                        ]
-        return converted_report
+        return self.unit_converter.convert(report)
 
     def revert_unit(self, converted_report: dict):
-        original_report = converted_report.copy()
-        for key, value in converted_report.items():
-            if "unit" in key:
-                if "frequency" in key:
-                    for original_unit, converted_unit in self.unit_conversion[
-                        "frequency"
-                    ].items():
-                        if converted_unit == value:
-                            original_report[key] = original_unit
-                            break
-                elif "mem" in key:
-                    for original_unit, converted_unit in self.unit_conversion[
-                        "mem"
-                    ].items():
-                        if converted_unit == value:
-                            original_report[key] = original_unit
-                            break
-                elif "cpu" in key:
-                    if "usage" in key:
-                        for original_unit, converted_unit in self.unit_conversion[
-                            "cpu"
-                        ]["usage"].items():
-                            if converted_unit == value:
-                                original_report[key] = original_unit
-                                break
-                elif "gpu" in key:
-                    if "usage" in key:
-                        for original_unit, converted_unit in self.unit_conversion[
-                            "gpu"
-                        ]["usage"].items():
-                            if converted_unit == value:
-                                original_report[key] = original_unit
-                                break
-        return original_report
+        return self.unit_converter.revert(converted_report)
 
     def get_lastest_timestamp(self):
         data = self.embedded_database.get_lastest_timestamp()
@@ -192,12 +240,359 @@ class NodeAggregator:
             for datapoint in data
         ]
 
+    def get_prometheus_metrics(self):
+        """
+        Get the latest metrics in the Prometheus text exposition format.
+
+        Returns
+        -------
+        Response
+            One gauge per field of the latest point of every series, labelled with the node name and the tags.
+
+        Notes
+        -----
+        The payload is rendered again only when a series gets a new latest point or, with `latest_ttl`, when its
+        oldest series expires. Other scrapes get the cached payload.
+        """
+        with self.prometheus_lock:
+            version = self.embedded_database.get_latest_version()
+            if (
+                version != self.prometheus_version
+                or time.time() >= self.prometheus_expires_at
+            ):
+                # NOTE: getting the latest points expires the series past the TTL, which changes the version
+                data = self.embedded_database.get_lastest_timestamp()
+                self.prometheus_version = self.embedded_database.get_latest_version()
+                self.prometheus_payload = render_prometheus(
+                    [
+                        (datapoint.tags, self.revert_unit(datapoint.fields))
+                        for datapoint in data
+                    ],
+                    {"node": self.node_name},
+                    self.config.data_separator,
+                ).encode()
+                self.prometheus_expires_at = (
+                    min(datapoint.time.timestamp() for datapoint in data)
+                    + self.config.latest_ttl
+                    if data and self.config.latest_ttl is not None
+                    else math.inf
+                )
+            payload = self.prometheus_payload
+        return Response(content=payload, media_type=PROMETHEUS_CONTENT_TYPE)
+
+    def render_point(self, timestamp: float, tags: dict, fields: dict) -> dict:
+        return unflatten(
+            self.revert_unit({"timestamp": timestamp, **tags, **fields}),
+            self.config.data_separator,
+        )
+
+    async def get_stream(
+        self,
+        request: Request,
+        tags: Annotated[Optional[list[str]], Query()] = None,
+        fields: Annotated[Optional[list[str]], Query()] = None,
+    ):
+        """
+        Stream the new points of the matching series as server-sent events.
+
+        Parameters
+        ----------
+        request : Request
+            The request of the subscriber.
+        tags : Optional[list[str]], optional
+            Tags the series must have, as `key=value`.
+        fields : Optional[list[str]], optional
+            Fields to send, default is all fields.
+
+        Returns
+        -------
+        StreamingResponse
+            A `text/event-stream` with a `metric` event per point, in the format of the latest metrics, and a
+            `dropped` event with the number of points replaced by a newer point of their series before being sent.
+        """
+        subscriber = Subscriber(
+            asyncio.get_running_loop(),
+            self.parse_tags(tags),
+            fields,
+            self.config.stream_buffer_size,
+        )
+        self.subscriptions.subscribe(subscriber)
+
+        async def stream():
+            try:
+                async for event in subscriber.events(
+                    self.render_point, self.config.stream_heartbeat
+                ):
+                    if await request.is_disconnected():
+                        break
+                    yield event
+            finally:
+                self.subscriptions.unsubscribe(subscriber)
+
+        return StreamingResponse(
+            stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    def get_export(
+        self,
+        export_format: Annotated[
+            ExportFormatEnum, Query(alias="format")
+        ] = ExportFormatEnum.arrow,
+        window: Optional[float] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        tags: Annotated[Optional[list[str]], Query()] = None,
+        fields: Annotated[Optional[list[str]], Query()] = None,
+    ):
+        """
+        Export the stored points of the matching series in a time window.
+
+        Parameters
+        ----------
+        export_format : ExportFormatEnum, optional
+            `arrow` for an Arrow IPC stream, `parquet` for a Parquet file, default is `arrow`.
+        window : Optional[float], optional
+            Length of the window in seconds, ending at `end`.
+        start : Optional[float], optional
+            Start of the window as a Unix timestamp, default is the first stored point.
+        end : Optional[float], optional
+            End of the window as a Unix timestamp, default is the last stored point.
+        tags : Optional[list[str]], optional
+            Tags the series must have, as `key=value`.
+        fields : Optional[list[str]], optional
+            Fields to export, default is all fields.
+
+        Returns
+        -------
+        StreamingResponse
+            One row per point and field, in the schema of `export_schema`, streamed one chunk of
+            `export_chunk_seconds` at a time. Units are exported as their codes.
+        """
+        try:
+            export_schema()
+        except ImportError as e:
+            raise HTTPException(
+                status_code=501, detail="Exports need pyarrow, from the arrow extra"
+            ) from e
+        time_range = self.embedded_database.get_time_range()
+        if time_range is None:
+            time_range = (time.time(), time.time())
+        if end is None:
+            end = time_range[1]
+        if window is not None:
+            start = end - window
+        start = max(start if start is not None else time_range[0], time_range[0])
+        end = min(end, time_range[1])
+        batches = iter_record_batches(
+            self.embedded_database,
+            start,
+            end,
+            self.parse_tags(tags),
+            fields,
+            self.config.export_chunk_seconds,
+        )
+        extension = "arrows" if export_format == ExportFormatEnum.arrow else "parquet"
+        return StreamingResponse(
+            iter_export(batches, export_format),
+            media_type=EXPORT_MEDIA_TYPES[export_format],
+            headers={
+                "Content-Disposition": f'attachment; filename="{self.node_name}.{extension}"'
+            },
+        )
+
+    def parse_tags(self, tags: Optional[list[str]]) -> dict:
+        tag_filter = {}
+        for tag in tags or []:
+            key, separator, value = tag.partition("=")
+            if not separator:
+                raise HTTPException(
+                    status_code=400, detail=f"Tag {tag} is not of the form key=value"
+                )
+            tag_filter[key] = value
+        return tag_filter
+
+    def query_series(
+        self,
+        window: Optional[float],
+        start: Optional[float],
+        end: Optional[float],
+        tags: Optional[list[str]],
+        resolution: Optional[float] = None,
+    ) -> list[SeriesData]:
+        database = self.embedded_database
+        if resolution is not None:
+            if resolution not in self.rollup_databases:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"No rollup with a resolution of {resolution}s",
+                )
+            database = self.rollup_databases[resolution]
+        now = time.time()
+        if end is None:
+            end = now
+        if window is not None:
+            start = end - window
+        if start is None or start > end:
+            raise HTTPException(
+                status_code=400, detail="Give a window or a start before the end"
+            )
+        return database.query_range(start, end, self.parse_tags(tags))
+
+    def split_fields(
+        self, series: SeriesData, fields: Optional[list[str]]
+    ) -> tuple[dict, dict]:
+        values = {}
+        units = {}
+        for name, column in series.fields.items():
+            if fields and name not in fields:
+                continue
+            if "unit" in name:
+                present = column[~np.isnan(column)]
+                if len(present):
+                    units[name] = present[-1].item()
+            else:
+                values[name] = column
+        return values, self.revert_unit(units)
+
+    def get_range(
+        self,
+        window: Optional[float] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        tags: Annotated[Optional[list[str]], Query()] = None,
+        fields: Annotated[Optional[list[str]], Query()] = None,
+        resolution: Optional[float] = None,
+    ):
+        """
+        Get the points of the matching series in a time window.
+
+        Parameters
+        ----------
+        window : Optional[float], optional
+            Length of the window in seconds, ending at `end`.
+        start : Optional[float], optional
+            Start of the window as a Unix timestamp, used when `window` isn't given.
+        end : Optional[float], optional
+            End of the window as a Unix timestamp, default is now.
+        tags : Optional[list[str]], optional
+            Tags the series must have, as `key=value`.
+        fields : Optional[list[str]], optional
+            Fields to return, default is all fields.
+        resolution : Optional[float], optional
+            Resolution in seconds of the rollup tier to read, default is the raw points. Rollup fields are suffixed
+            with `min`, `max`, `mean` and `count`.
+
+        Returns
+        -------
+        list[dict]
+            For each series, its tags, the timestamps of the points and the values of each field. Unit fields are
+            returned once, with their latest value.
+        """
+        result = []
+        for series in self.query_series(window, start, end, tags, resolution):
+            values, units = self.split_fields(series, fields)
+            result.append(
+                {
+                    "tags": unflatten(series.tags, self.config.data_separator),
+                    "timestamps": (series.timestamps / 1e9).tolist(),
+                    "fields": unflatten(
+                        {
+                            **{
+                                name: to_json_list(column)
+                                for name, column in values.items()
+                            },
+                            **units,
+                        },
+                        self.config.data_separator,
+                    ),
+                }
+            )
+        return result
+
+    def get_aggregate(
+        self,
+        function: AggregateFunctionEnum,
+        percentile: Optional[float] = None,
+        window: Optional[float] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        tags: Annotated[Optional[list[str]], Query()] = None,
+        fields: Annotated[Optional[list[str]], Query()] = None,
+        resolution: Optional[float] = None,
+    ):
+        """
+        Aggregate the fields of the matching series over a time window.
+
+        Parameters
+        ----------
+        function : AggregateFunctionEnum
+            The aggregation function.
+        percentile : Optional[float], optional
+            The percentile in [0, 100] for `PERCENTILE`.
+        window : Optional[float], optional
+            Length of the window in seconds, ending at `end`.
+        start : Optional[float], optional
+            Start of the window as a Unix timestamp, used when `window` isn't given.
+        end : Optional[float], optional
+            End of the window as a Unix timestamp, default is now.
+        tags : Optional[list[str]], optional
+            Tags the series must have, as `key=value`.
+        fields : Optional[list[str]], optional
+            Fields to aggregate, default is all fields.
+        resolution : Optional[float], optional
+            Resolution in seconds of the rollup tier to read, default is the raw points.
+
+        Returns
+        -------
+        list[dict]
+            For each series, its tags, its number of points and the aggregated value of each field. Unit fields are
+            returned with their latest value.
+        """
+        result = []
+        for series in self.query_series(window, start, end, tags, resolution):
+            values, units = self.split_fields(series, fields)
+            try:
+                aggregated = {
+                    name: aggregate(column, function, percentile)
+                    for name, column in values.items()
+                }
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+            result.append(
+                {
+                    "tags": unflatten(series.tags, self.config.data_separator),
+                    "count": len(series),
+                    "fields": unflatten(
+                        {**aggregated, **units}, self.config.data_separator
+                    ),
+                }
+            )
+        return result
+
     def start(self):
         self.execution_flag = True
+        self.write_buffer.start()
+        if self.compactor is not None:
+            self.compactor.start()
+        if self.summary_pusher is not None:
+            self.summary_pusher.start()
         self.server_thread.start()
         logging.info("node aggregator started")
 
     def stop(self):
         self.execution_flag = False
+        self.collector.stop()
+        # NOTE: open streams would keep the server from shutting down
+        self.subscriptions.close()
         self.server_thread.join()
+        self.write_buffer.stop()
+        if self.compactor is not None:
+            self.compactor.stop()
+        if self.summary_pusher is not None:
+            self.summary_pusher.stop()
+        self.embedded_database.close()
+        for database in self.rollup_databases.values():
+            database.close()
         logging.info("node aggregator stopped")
@@ -0,0 +1,85 @@
+import math
+import re
+
+from flatten_dict.flatten_dict import REDUCER_DICT
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRIC_PREFIX = "odop"
+
+INVALID_NAME_CHARACTERS = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def sanitize_name(name: str) -> str:
+    name = INVALID_NAME_CHARACTERS.sub("_", name)
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+def escape_label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def render_prometheus(
+    series: list[tuple[dict, dict]], constant_labels: dict, data_separator: str
+) -> str:
+    """
+    Render the latest points in the Prometheus text exposition format.
+
+    Parameters
+    ----------
+    series : list[tuple[dict, dict]]
+        The tags and the fields of the latest point of each series, with unit codes reverted to their name.
+    constant_labels : dict
+        Labels added to every sample, e.g. the node name.
+    data_separator : str
+        The separator of the flattened tags and fields.
+
+    Returns
+    -------
+    str
+        One gauge family per field name, e.g. `odop_cpu_usage_value{node="n1",type="process",pid="12",
+        unit="percentage"} 12.5`.
+
+    Notes
+    -----
+    - Tags become labels; the `metadata` prefix of report metadata is dropped, so `metadata.pid` becomes `pid`.
+    - A unit field isn't exported as a gauge. Its value is the `unit` label of the sibling `value` field.
+    - Non-numeric fields are skipped.
+    """
+    metadata_prefix = REDUCER_DICT[data_separator]("metadata", "")
+    families: dict[str, list[str]] = {}
+    for tags, fields in series:
+        labels = dict(constant_labels)
+        for key, value in tags.items():
+            if key.startswith(metadata_prefix):
+                key = key[len(metadata_prefix) :]
+            labels[sanitize_name(key)] = value
+        for name, value in fields.items():
+            if "unit" in name or isinstance(value, str):
+                continue
+            sample_labels = labels
+            if name.endswith("value"):
+                unit = fields.get(name[: -len("value")] + "unit")
+                if isinstance(unit, str):
+                    sample_labels = {**labels, "unit": unit}
+            label_text = ",".join(
+                f'{key}="{escape_label_value(label)}"'
+                for key, label in sample_labels.items()
+            )
+            metric_name = sanitize_name(f"{METRIC_PREFIX}_{name}")
+            families.setdefault(metric_name, []).append(
+                f"{metric_name}{{{label_text}}} {format_value(value)}"
+            )
+
+    lines = []
+    for metric_name, samples in sorted(families.items()):
+        lines.append(f"# TYPE {metric_name} gauge")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n" if lines else ""
@@ -0,0 +1,145 @@
+import math
+from typing import Optional
+
+import numpy as np
+
+ZERO_THRESHOLD = 1e-9
+
+
+class QuantileSketch:
+    """
+    QuantileSketch is a mergeable quantile sketch with a relative accuracy guarantee, in the manner of DDSketch.
+
+    Parameters
+    ----------
+    relative_accuracy : float, optional
+        The relative error of the quantiles, default is 0.01.
+
+    Attributes
+    ----------
+    positive : dict[int, int]
+        The number of positive values per logarithmic bucket.
+    negative : dict[int, int]
+        The number of negative values per logarithmic bucket of their absolute value.
+    zero_count : int
+        The number of values too close to zero to be bucketed.
+    count : int
+        The number of values.
+
+    Methods
+    -------
+    add(values: np.ndarray)
+        Add values, ignoring NaN.
+    merge(other: QuantileSketch)
+        Add the values of another sketch with the same relative accuracy.
+    quantile(q: float) -> Optional[float]
+        Get the q-quantile, q in [0, 1].
+    to_dict() -> dict
+        Serialize the sketch for JSON.
+    from_dict(data: dict) -> QuantileSketch
+        Deserialize a sketch.
+
+    Notes
+    -----
+    A value v is counted in bucket `ceil(log(v) / log(gamma))` with `gamma = (1 + a) / (1 - a)`. Every value of a
+    bucket is within a relative error `a` of the bucket value, so merging sketches adds their bucket counts without
+    losing accuracy, and the size only grows with the logarithm of the value range.
+    """
+
+    __slots__ = (
+        "count",
+        "log_gamma",
+        "negative",
+        "positive",
+        "relative_accuracy",
+        "zero_count",
+    )
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("The relative accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(gamma)
+        self.positive: dict[int, int] = {}
+        self.negative: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, values: np.ndarray) -> None:
+        values = values[~np.isnan(values)]
+        positive = values[values > ZERO_THRESHOLD]
+        negative = -values[values < -ZERO_THRESHOLD]
+        self.add_buckets(self.positive, positive)
+        self.add_buckets(self.negative, negative)
+        self.zero_count += len(values) - len(positive) - len(negative)
+        self.count += len(values)
+
+    def add_buckets(self, buckets: dict[int, int], values: np.ndarray) -> None:
+        if len(values) == 0:
+            return
+        indices, counts = np.unique(
+            np.ceil(np.log(values) / self.log_gamma).astype(np.int64),
+            return_counts=True,
+        )
+        for index, count in zip(indices.tolist(), counts.tolist()):
+            buckets[index] = buckets.get(index, 0) + count
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only sketches with the same relative accuracy merge")
+        for buckets, other_buckets in (
+            (self.positive, other.positive),
+            (self.negative, other.negative),
+        ):
+            for index, count in other_buckets.items():
+                buckets[index] = buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def bucket_value(self, index: int) -> float:
+        gamma = math.exp(self.log_gamma)
+        return 2 * math.exp(index * self.log_gamma) / (gamma + 1)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return -self.bucket_value(index)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return self.bucket_value(index)
+        return self.bucket_value(max(self.positive))
+
+    def to_dict(self) -> dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "positive": {str(index): count for index, count in self.positive.items()},
+            "negative": {str(index): count for index, count in self.negative.items()},
+            "zero_count": self.zero_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(data["relative_accuracy"])
+        sketch.positive = {
+            int(index): count for index, count in data["positive"].items()
+        }
+        sketch.negative = {
+            int(index): count for index, count in data["negative"].items()
+        }
+        sketch.zero_count = data["zero_count"]
+        sketch.count = (
+            sum(sketch.positive.values())
+            + sum(sketch.negative.values())
+            + sketch.zero_count
+        )
+        return sketch
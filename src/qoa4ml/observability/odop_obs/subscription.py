@@ -0,0 +1,219 @@
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from typing import Callable, Optional
+
+from qoa4ml.observability.odop_obs.base_database import match_tags, series_key
+
+
+class Subscriber:
+    """
+    Subscriber buffers the new points of the series matching a filter until its client reads them.
+
+    Parameters
+    ----------
+    loop : asyncio.AbstractEventLoop
+        The event loop serving the client.
+    tags : Optional[dict], optional
+        Tags the series must have, default is every series.
+    fields : Optional[list[str]], optional
+        Fields sent to the client, with the unit fields next to them, default is every field.
+    buffer_size : int, optional
+        Series with a pending point before the oldest pending point is dropped, default is 1000.
+
+    Attributes
+    ----------
+    pending : OrderedDict[tuple, tuple[float, dict, dict]]
+        The latest unsent point of each series, oldest first.
+    dropped : int
+        The number of points dropped since the last read, replaced or evicted.
+    closed : bool
+        Set by `close`, the events end once the pending points are sent.
+
+    Methods
+    -------
+    offer(timestamp: float, tags: dict, fields: dict)
+        Buffer a point if it matches the filter. Called from the ingest threads.
+    take() -> tuple[list, int]
+        Get the pending points and the number of dropped points, and reset them.
+    close()
+        End the events after the pending points. Called from any thread.
+
+    Notes
+    -----
+    - A point replaces the pending point of its series, so a slow client receives the latest state of every
+      series instead of a growing backlog, and memory is bounded by `buffer_size` points.
+    - With a `fields` filter, a unit field such as `cpu.usage.unit` is sent with the selected fields sharing its
+      prefix, e.g. `cpu.usage.value`, so the values stay readable.
+    """
+
+    __slots__ = (
+        "buffer_size",
+        "closed",
+        "dropped",
+        "event",
+        "fields",
+        "lock",
+        "loop",
+        "pending",
+        "selected",
+        "tags",
+    )
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        tags: Optional[dict] = None,
+        fields: Optional[list[str]] = None,
+        buffer_size: int = 1000,
+    ) -> None:
+        self.loop = loop
+        self.tags = tags
+        self.fields = set(fields) if fields else None
+        self.buffer_size = buffer_size
+        self.pending: OrderedDict[tuple, tuple[float, dict, dict]] = OrderedDict()
+        self.dropped = 0
+        self.closed = False
+        self.selected: dict[str, Optional[bool]] = {}
+        self.lock = threading.Lock()
+        self.event = asyncio.Event()
+
+    def select(self, name: str) -> Optional[bool]:
+        # NOTE: True for a selected field, False for the unit of a selected field, None for a field left out
+        if name not in self.selected:
+            if name in self.fields:
+                kind = True
+            elif name.endswith("unit") and any(
+                field.startswith(name[: -len("unit")]) for field in self.fields
+            ):
+                kind = False
+            else:
+                kind = None
+            self.selected[name] = kind
+        return self.selected[name]
+
+    def offer(self, timestamp: float, tags: dict, fields: dict) -> None:
+        if not match_tags(tags, self.tags):
+            return
+        if self.fields is not None:
+            fields = {
+                name: value
+                for name, value in fields.items()
+                if self.select(name) is not None
+            }
+            # NOTE: a point with only unit fields selected has nothing to send
+            if not any(self.select(name) for name in fields):
+                return
+        key = series_key(tags)
+        with self.lock:
+            if key in self.pending:
+                del self.pending[key]
+                self.dropped += 1
+            elif len(self.pending) >= self.buffer_size:
+                self.pending.popitem(last=False)
+                self.dropped += 1
+            self.pending[key] = (timestamp, tags, fields)
+        # NOTE: the point is pending before the check, a reader clearing the event meanwhile takes it
+        self.wake()
+
+    def wake(self) -> None:
+        if not self.event.is_set():
+            try:
+                self.loop.call_soon_threadsafe(self.event.set)
+            except RuntimeError:
+                # NOTE: the loop closed before the subscriber was removed
+                pass
+
+    def close(self) -> None:
+        self.closed = True
+        self.wake()
+
+    def take(self) -> tuple[list[tuple[float, dict, dict]], int]:
+        with self.lock:
+            points = list(self.pending.values())
+            dropped = self.dropped
+            self.pending.clear()
+            self.dropped = 0
+        return points, dropped
+
+    async def events(
+        self,
+        render: Callable[[float, dict, dict], dict],
+        heartbeat: float,
+    ) -> AsyncIterator[str]:
+        """
+        Yield the pending points as server-sent events, as they arrive.
+
+        Parameters
+        ----------
+        render : Callable[[float, dict, dict], dict]
+            Turns a point into the JSON object sent to the client.
+        heartbeat : float
+            Seconds without points after which a comment is sent, so dead connections are detected.
+
+        Yields
+        ------
+        str
+            `metric` events with one point each, `dropped` events with the number of points the client missed,
+            and keep-alive comments, until the subscriber is closed.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(self.event.wait(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            self.event.clear()
+            points, dropped = self.take()
+            if dropped:
+                yield f"event: dropped\ndata: {dropped}\n\n"
+            for point in points:
+                yield f"event: metric\ndata: {json.dumps(render(*point))}\n\n"
+            if self.closed:
+                return
+
+
+class SubscriptionHub:
+    """
+    SubscriptionHub hands the ingested points to the subscribers.
+
+    Methods
+    -------
+    subscribe(subscriber: Subscriber)
+        Start handing points to a subscriber.
+    unsubscribe(subscriber: Subscriber)
+        Stop handing points to a subscriber.
+    publish(timestamp: float, tags: dict, fields: dict)
+        Hand a point to every subscriber.
+    close()
+        End the events of every subscriber, e.g. on shutdown.
+
+    Notes
+    -----
+    Publishing without subscribers only reads the subscriber tuple, so ingestion doesn't pay for the endpoint until
+    a client subscribes.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.subscribers: tuple[Subscriber, ...] = ()
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        with self.lock:
+            self.subscribers = (*self.subscribers, subscriber)
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self.lock:
+            self.subscribers = tuple(
+                current for current in self.subscribers if current is not subscriber
+            )
+
+    def publish(self, timestamp: float, tags: dict, fields: dict) -> None:
+        for subscriber in self.subscribers:
+            subscriber.offer(timestamp, tags, fields)
+
+    def close(self) -> None:
+        for subscriber in self.subscribers:
+            subscriber.close()
@@ -0,0 +1,243 @@
+import math
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+import requests
+
+from qoa4ml.lang.datamodel_enum import AggregateFunctionEnum
+from qoa4ml.observability.odop_obs.base_database import (
+    BaseDatabase,
+    SeriesData,
+    to_ns,
+)
+from qoa4ml.observability.odop_obs.sketch import QuantileSketch
+from qoa4ml.utils.logger import qoa_logger
+
+SUMMARIES_URL_PATH = "/summaries"
+# NOTE: after an outage, a node pushes at most this many intervals at once
+MAX_CATCH_UP_INTERVALS = 60
+
+
+class FieldSummary:
+    """
+    FieldSummary holds the count, sum, extrema and quantile sketch of the values of a field.
+    """
+
+    __slots__ = ("count", "maximum", "minimum", "sketch", "total")
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    @classmethod
+    def from_values(
+        cls, values: np.ndarray, relative_accuracy: float
+    ) -> Optional["FieldSummary"]:
+        present = values[~np.isnan(values)]
+        if len(present) == 0:
+            return None
+        summary = cls(relative_accuracy)
+        summary.count = len(present)
+        summary.total = float(np.sum(present))
+        summary.minimum = float(np.min(present))
+        summary.maximum = float(np.max(present))
+        summary.sketch.add(present)
+        return summary
+
+    def merge(self, other: "FieldSummary") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.sketch.merge(other.sketch)
+
+    def value(
+        self, function: AggregateFunctionEnum, percentile: Optional[float] = None
+    ) -> Optional[float]:
+        if function == AggregateFunctionEnum.COUNT:
+            return float(self.count)
+        if function == AggregateFunctionEnum.PERCENTILE and (
+            percentile is None or not 0 <= percentile <= 100
+        ):
+            raise ValueError("PERCENTILE needs a percentile between 0 and 100")
+        if self.count == 0:
+            return None
+        if function == AggregateFunctionEnum.MIN:
+            return self.minimum
+        if function == AggregateFunctionEnum.MAX:
+            return self.maximum
+        if function == AggregateFunctionEnum.SUM:
+            return self.total
+        if function == AggregateFunctionEnum.AVG:
+            return self.total / self.count
+        if function == AggregateFunctionEnum.PERCENTILE:
+            return self.sketch.quantile(percentile / 100)
+        raise ValueError(f"{function.value} can't be answered from summaries")
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.minimum,
+            "max": self.maximum,
+            "sketch": self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FieldSummary":
+        summary = cls()
+        summary.count = data["count"]
+        summary.total = data["sum"]
+        summary.minimum = data["min"]
+        summary.maximum = data["max"]
+        summary.sketch = QuantileSketch.from_dict(data["sketch"])
+        return summary
+
+
+def summarize_series(
+    series: SeriesData,
+    start_ns: int,
+    end_ns: int,
+    revert_unit: Callable[[dict], dict],
+    relative_accuracy: float,
+) -> dict:
+    in_range = (series.timestamps >= start_ns) & (series.timestamps < end_ns)
+    fields = {}
+    units = {}
+    for name, column in series.fields.items():
+        values = np.asarray(column)[in_range]
+        if "unit" in name:
+            present = values[~np.isnan(values)]
+            if len(present):
+                units[name] = present[-1].item()
+            continue
+        summary = FieldSummary.from_values(values, relative_accuracy)
+        if summary is not None:
+            fields[name] = summary.to_dict()
+    return {"tags": series.tags, "fields": fields, "units": revert_unit(units)}
+
+
+class SummaryPusher:
+    """
+    SummaryPusher periodically pushes summaries of the points of a node to the cluster aggregator.
+
+    Parameters
+    ----------
+    database : BaseDatabase
+        The database of the raw points of the node.
+    node_name : str
+        The name of the node.
+    url : str
+        The base URL of the cluster aggregator.
+    revert_unit : Callable[[dict], dict]
+        Replaces the unit codes of the node by their name.
+    interval : float, optional
+        Seconds covered by a summary, default is 10.0.
+    lag : float, optional
+        Seconds a point may take to reach the database, default is 1.0.
+    relative_accuracy : float, optional
+        The relative accuracy of the quantile sketches, default is 0.01.
+    timeout : float, optional
+        Seconds to wait for the cluster aggregator, default is 5.0.
+
+    Methods
+    -------
+    push_once(now: Optional[float] = None) -> bool
+        Summarize the points since the last push and push them.
+    start()
+        Push every `interval` in a background thread.
+    stop()
+        Stop the background thread.
+
+    Notes
+    -----
+    - A summary holds, for each series and numeric field, the count, sum, min, max and quantile sketch of the
+      values, and the latest unit of the unit fields.
+    - When a push fails, the next push covers the failed interval too, up to `MAX_CATCH_UP_INTERVALS`.
+    """
+
+    def __init__(
+        self,
+        database: BaseDatabase,
+        node_name: str,
+        url: str,
+        revert_unit: Callable[[dict], dict],
+        interval: float = 10.0,
+        lag: float = 1.0,
+        relative_accuracy: float = 0.01,
+        timeout: float = 5.0,
+    ) -> None:
+        self.database = database
+        self.node_name = node_name
+        self.url = url.rstrip("/") + SUMMARIES_URL_PATH
+        self.revert_unit = revert_unit
+        self.interval = interval
+        self.lag = lag
+        self.relative_accuracy = relative_accuracy
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.last_end: Optional[float] = None
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def summarize(self, start: float, end: float) -> dict:
+        # NOTE: query ranges include both ends, a point on the end is left to the next push
+        series = [
+            summarize_series(
+                series,
+                to_ns(start),
+                to_ns(end),
+                self.revert_unit,
+                self.relative_accuracy,
+            )
+            for series in self.database.query_range(start, end)
+        ]
+        return {
+            "node": self.node_name,
+            "start": start,
+            "end": end,
+            "series": [summary for summary in series if summary["fields"]],
+        }
+
+    def push_once(self, now: Optional[float] = None) -> bool:
+        end = (time.time() if now is None else now) - self.lag
+        start = end - self.interval if self.last_end is None else self.last_end
+        start = max(start, end - self.interval * MAX_CATCH_UP_INTERVALS)
+        if end <= start:
+            return True
+        payload = self.summarize(start, end)
+        try:
+            response = self.session.post(self.url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            qoa_logger.warning(f"Unable to push summaries to {self.url}: {e}")
+            return False
+        self.last_end = end
+        return True
+
+    def run(self) -> None:
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.push_once()
+            except Exception as e:
+                qoa_logger.exception(f"Error {type(e)} when summarizing the node")
+
+    def start(self) -> None:
+        if self.thread is not None:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        self.session.close()
@@ -0,0 +1,112 @@
+from typing import Optional
+
+MAX_CACHED_PLANS = 1024
+
+
+class UnitConverter:
+    """
+    UnitConverter converts unit names of flattened reports to codes and back, with plans cached per key set.
+
+    Parameters
+    ----------
+    unit_conversion : dict
+        The unit codes, e.g. `{"mem": {"Mb": 2}, "cpu": {"usage": {"percentage": 3}}}`.
+
+    Attributes
+    ----------
+    convert_plans : dict[tuple, list[tuple[str, dict]]]
+        For each key set, the keys to convert and their unit-to-code mapping.
+    revert_plans : dict[tuple, list[tuple[str, dict]]]
+        For each key set, the unit keys to revert and their code-to-unit mapping.
+
+    Methods
+    -------
+    convert(report: dict) -> dict
+        Replace unit names by their code, in place.
+    revert(converted_report: dict) -> dict
+        Get a copy of the report with unit codes replaced by their name.
+
+    Notes
+    -----
+    - The mapping of a key is chosen by name: keys containing "frequency" or "mem", and keys containing "cpu" or
+      "gpu" together with "usage". Only keys containing "unit" are reverted.
+    - Reports of a probe always have the same keys, so the name tests run once per kind of report and each
+      report only does dictionary lookups.
+    """
+
+    def __init__(self, unit_conversion: dict) -> None:
+        self.unit_conversion = unit_conversion
+        self.mappings = {
+            "frequency": unit_conversion.get("frequency", {}),
+            "mem": unit_conversion.get("mem", {}),
+            "cpu": unit_conversion.get("cpu", {}).get("usage", {}),
+            "gpu": unit_conversion.get("gpu", {}).get("usage", {}),
+        }
+        self.inverse_mappings = {
+            name: invert(mapping) for name, mapping in self.mappings.items()
+        }
+        self.convert_plans: dict[tuple, list[tuple[str, dict]]] = {}
+        self.revert_plans: dict[tuple, list[tuple[str, dict]]] = {}
+
+    @staticmethod
+    def mapping_name(key: str) -> Optional[str]:
+        if "frequency" in key:
+            return "frequency"
+        if "mem" in key:
+            return "mem"
+        if "cpu" in key:
+            return "cpu" if "usage" in key else None
+        if "gpu" in key:
+            return "gpu" if "usage" in key else None
+        return None
+
+    def compile(self, keys: tuple, mappings: dict, unit_only: bool) -> list:
+        plan = []
+        for key in keys:
+            if unit_only and "unit" not in key:
+                continue
+            name = self.mapping_name(key)
+            if name is not None:
+                plan.append((key, mappings[name]))
+        return plan
+
+    def get_plan(self, plans: dict, keys: tuple, mappings: dict, unit_only: bool):
+        plan = plans.get(keys)
+        if plan is None:
+            if len(plans) >= MAX_CACHED_PLANS:
+                plans.clear()
+            plan = self.compile(keys, mappings, unit_only)
+            plans[keys] = plan
+        return plan
+
+    def convert(self, report: dict) -> dict:
+        plan = self.get_plan(
+            self.convert_plans, tuple(report), self.mappings, unit_only=False
+        )
+        for key, mapping in plan:
+            value = report[key]
+            if isinstance(value, str):
+                report[key] = mapping[value]
+        return report
+
+    def revert(self, converted_report: dict) -> dict:
+        original_report = converted_report.copy()
+        plan = self.get_plan(
+            self.revert_plans,
+            tuple(converted_report),
+            self.inverse_mappings,
+            unit_only=True,
+        )
+        for key, inverse in plan:
+            original = inverse.get(converted_report[key])
+            if original is not None:
+                original_report[key] = original
+        return original_report
+
+
+def invert(mapping: dict) -> dict:
+    inverse: dict = {}
+    for original_unit, converted_unit in mapping.items():
+        # NOTE: the first unit with a code wins, as in a linear scan
+        inverse.setdefault(converted_unit, original_unit)
+    return inverse
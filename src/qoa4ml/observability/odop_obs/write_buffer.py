@@ -0,0 +1,175 @@
+import queue
+import threading
+import time
+from typing import Optional
+
+from qoa4ml.observability.odop_obs.base_database import BaseDatabase
+from qoa4ml.utils.logger import qoa_logger
+
+_STOP = object()
+
+
+class WriteBehindBuffer:
+    """
+    WriteBehindBuffer batches points and writes them to a database from a background thread.
+
+    Parameters
+    ----------
+    database : BaseDatabase
+        The database the points are written to.
+    batch_size : int, optional
+        Points written together with `insert_multiple`, default is 500.
+    flush_interval : float, optional
+        Seconds after which a partial batch is written, default is 1.0.
+    max_pending_batches : int, optional
+        Full batches waiting for the writer before `add` blocks, default is 16.
+
+    Attributes
+    ----------
+    batch : list[tuple[float, dict, dict]]
+        The batch being filled, as `(timestamp, tags, fields)` points.
+    batches : queue.Queue
+        The full batches waiting for the writer.
+
+    Methods
+    -------
+    add(timestamp: float, tags: dict, fields: dict)
+        Record a point as the latest of its series and add it to the current batch.
+    start()
+        Start writing batches in the background.
+    flush()
+        Write the waiting and partial batches from the calling thread.
+    stop()
+        Stop the writer and write every remaining point.
+    get_stats() -> dict
+        Get the point counters.
+
+    Notes
+    -----
+    - At most `batch_size * (max_pending_batches + 1)` points are held in memory. When the writer falls behind,
+      `add` blocks, which in turn fills the collector queue and applies its overflow policy.
+    - Before `start` and after `stop`, full batches are written by the thread calling `add`.
+    - `add` records the point as the latest of its series right away, so the latest values do not wait for the
+      batch to be written. A point the database rejects is dropped there, and only valid points are batched.
+    - A batch the database fails to write is counted as failed, it is not retried since part of it may already
+      be written.
+    """
+
+    def __init__(
+        self,
+        database: BaseDatabase,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_pending_batches: int = 16,
+    ) -> None:
+        self.database = database
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.batch: list[tuple[float, dict, dict]] = []
+        self.batches: queue.Queue = queue.Queue(maxsize=max_pending_batches)
+        self.lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+        self.written = 0
+        self.failed = 0
+        self.batches_written = 0
+
+    def add(self, timestamp: float, tags: dict, fields: dict) -> None:
+        try:
+            self.database.update_latest(timestamp, tags, fields)
+        except Exception:
+            qoa_logger.exception(f"Unable to add point with tags {tags}")
+            self._count(failed=1)
+            return
+        with self.lock:
+            self.batch.append((timestamp, tags, fields))
+            if len(self.batch) < self.batch_size:
+                return
+            full_batch = self.take()
+        if self.thread is not None:
+            self.batches.put(full_batch)
+        else:
+            self.write(full_batch)
+
+    def take(self) -> list[tuple[float, dict, dict]]:
+        batch = self.batch
+        self.batch = []
+        return batch
+
+    def write(self, batch: list[tuple[float, dict, dict]]) -> None:
+        if not batch:
+            return
+        try:
+            self.database.insert_multiple(batch, update_latest=False)
+        except Exception:
+            qoa_logger.exception(f"Unable to write a batch of {len(batch)} points")
+            self._count(failed=len(batch))
+            return
+        self._count(written=len(batch), batches_written=1)
+
+    def run(self) -> None:
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                batch = self.batches.get(timeout=max(deadline - time.monotonic(), 0.0))
+            except queue.Empty:
+                batch = None
+            if batch is _STOP:
+                return
+            if batch is not None:
+                self.write(batch)
+            if time.monotonic() >= deadline:
+                with self.lock:
+                    partial_batch = self.take()
+                self.write(partial_batch)
+                deadline = time.monotonic() + self.flush_interval
+
+    def start(self) -> None:
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def flush(self) -> None:
+        while True:
+            try:
+                batch = self.batches.get_nowait()
+            except queue.Empty:
+                break
+            if batch is not _STOP:
+                self.write(batch)
+        with self.lock:
+            partial_batch = self.take()
+        self.write(partial_batch)
+
+    def stop(self) -> None:
+        thread = self.thread
+        if thread is not None:
+            self.batches.put(_STOP)
+            thread.join()
+            self.thread = None
+        self.flush()
+
+    def _count(self, **counters: int) -> None:
+        with self.stats_lock:
+            for counter, value in counters.items():
+                setattr(self, counter, getattr(self, counter) + value)
+
+    def get_stats(self) -> dict:
+        """
+        Get the point counters.
+
+        Returns
+        -------
+        dict
+            The number of points written and failed, the number of batches written, the points in the partial
+            batch and the full batches waiting for the writer.
+        """
+        with self.stats_lock:
+            return {
+                "written": self.written,
+                "failed": self.failed,
+                "batches": self.batches_written,
+                "pending": len(self.batch),
+                "queued_batches": self.batches.qsize(),
+            }
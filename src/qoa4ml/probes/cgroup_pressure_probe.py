@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import TYPE_CHECKING
+
+import lazy_import
+
+from qoa4ml.config.configs import CgroupPressureProbeConfig, ClientInfo
+from qoa4ml.connector.base_connector import BaseConnector
+from qoa4ml.lang.datamodel_enum import CgroupVersionEnum, EnvironmentEnum
+from qoa4ml.probes.probe import Probe
+from qoa4ml.utils.logger import qoa_logger
+from qoa4ml.utils.procfs_reader import PreadFile
+from qoa4ml.utils.qoa_utils import get_cgroup_version
+
+if TYPE_CHECKING:
+    from ..reports import resources_report_model
+else:
+    resources_report_model = lazy_import.lazy_module(
+        "qoa4ml.reports.resources_report_model"
+    )
+
+PRESSURE_RESOURCES = ("cpu", "memory", "io")
+# NOTE: cgroup files and the report section of their counters
+COUNTER_FILES = {
+    "cpu.stat": ("cpu", "stat"),
+    "memory.events": ("memory", "events"),
+    "io.stat": ("io", "stat"),
+}
+
+
+def parse_pressure(data: bytes) -> dict[str, int]:
+    # NOTE: `some avg10=0.00 avg60=0.00 avg300=0.00 total=12345`, total is in microseconds
+    counters = {}
+    for line in data.split(b"\n"):
+        kind, _, rest = line.partition(b" ")
+        total = rest.rpartition(b"total=")[2]
+        if kind and total:
+            counters[kind.decode()] = int(total)
+    return counters
+
+
+def parse_flat_keyed(data: bytes) -> dict[str, int]:
+    counters = {}
+    for line in data.split(b"\n"):
+        key, _, value = line.partition(b" ")
+        if key and value:
+            counters[key.decode()] = int(value)
+    return counters
+
+
+def parse_io_stat(data: bytes) -> dict[str, int]:
+    # NOTE: one `major:minor rbytes=1 wbytes=2 ...` line per device, summed over the devices
+    counters: dict[str, int] = {}
+    for line in data.split(b"\n"):
+        for item in line.split()[1:]:
+            key, _, value = item.partition(b"=")
+            counters[key.decode()] = counters.get(key.decode(), 0) + int(value)
+    return counters
+
+
+def counter_rates(
+    current: dict[str, int], previous: dict[str, int], elapsed: float
+) -> dict[str, float]:
+    # NOTE: a counter lower than before was reset, its rate is zero rather than negative
+    return {
+        key: max(value - previous.get(key, value), 0) / elapsed
+        for key, value in current.items()
+    }
+
+
+class CgroupPressureProbe(Probe):
+    """
+    CgroupPressureProbe reports the pressure stall information and the throttling counters of a cgroup v2.
+
+    Parameters
+    ----------
+    config : CgroupPressureProbeConfig
+        Configuration settings for the cgroup pressure probe.
+    connector : BaseConnector
+        Connector to send the report data.
+    client_info : Optional[ClientInfo]
+        Information about the client, default is None.
+
+    Attributes
+    ----------
+    config : CgroupPressureProbeConfig
+        The cgroup pressure probe configuration.
+    cgroup : str
+        The path of the monitored cgroup, relative to the cgroupfs mount point.
+    cgroup_dir : str
+        The directory of the monitored cgroup.
+    files : dict[str, PreadFile]
+        The open cgroup files, keyed by name. Files the kernel doesn't provide are left out.
+    environment : EnvironmentEnum
+        The environment in which the process is running.
+
+    Methods
+    -------
+    read_counters() -> dict
+        Read the cumulative counters of every open file.
+    create_report() -> str
+        Create a JSON report of the counter rates since the previous report.
+
+    Notes
+    -----
+    - `pressure.<resource>.some` and `.full` are the percentages of time some or all tasks of the cgroup were
+      stalled on the resource since the previous report, from the `total` of `cpu.pressure`, `memory.pressure`
+      and `io.pressure`.
+    - `cpu.stat`, `memory.events` and `io.stat` counters are reported as rates per second since the previous
+      report, e.g. `cpu.stat.throttled_usec` is the microseconds of throttling per second. `cpu.stat` also gets
+      `throttled_ratio`, the fraction of CFS periods that were throttled. `io.stat` is summed over devices.
+    - The first report covers the time since the probe was created.
+    """
+
+    def __init__(
+        self,
+        config: CgroupPressureProbeConfig,
+        connector: BaseConnector,
+        client_info: ClientInfo | None = None,
+    ) -> None:
+        super().__init__(config, connector, client_info)
+        self.config = config
+        self.environment = config.environment
+        if get_cgroup_version(self.config.procfs_root) != CgroupVersionEnum.v2:
+            raise RuntimeError("The cgroup pressure probe needs cgroup v2")
+        self.cgroup = (
+            self.find_own_cgroup()
+            if self.config.cgroup_path is None
+            else self.config.cgroup_path
+        )
+        self.cgroup_dir = os.path.join(
+            self.config.cgroupfs_root, self.cgroup.lstrip("/")
+        )
+        self.files: dict[str, PreadFile] = {}
+        for name in [f"{resource}.pressure" for resource in PRESSURE_RESOURCES] + list(
+            COUNTER_FILES
+        ):
+            try:
+                self.files[name] = PreadFile(os.path.join(self.cgroup_dir, name))
+            except OSError:
+                qoa_logger.warning(f"No {name} in {self.cgroup_dir}, not reported")
+        self.metadata = {"cgroup": self.cgroup}
+        self.counters = self.read_counters()
+        self.last_sample = time.monotonic()
+
+    def find_own_cgroup(self) -> str:
+        with open(os.path.join(self.config.procfs_root, "self", "cgroup")) as file:
+            for line in file:
+                hierarchy, _, cgroup_path = line.strip().split(":", 2)
+                if hierarchy == "0":
+                    return cgroup_path
+        raise RuntimeError("The process isn't in a cgroup v2")
+
+    def read_counters(self) -> dict[str, dict[str, int]]:
+        counters = {}
+        for name, file in self.files.items():
+            data = file.read()
+            if name.endswith(".pressure"):
+                counters[name] = parse_pressure(data)
+            elif name == "io.stat":
+                counters[name] = parse_io_stat(data)
+            else:
+                counters[name] = parse_flat_keyed(data)
+        return counters
+
+    def get_rates(self) -> dict:
+        now = time.monotonic()
+        counters = self.read_counters()
+        elapsed = max(now - self.last_sample, 1e-9)
+        rates: dict = {"pressure": {}, "cpu": {}, "memory": {}, "io": {}}
+        for resource in PRESSURE_RESOURCES:
+            name = f"{resource}.pressure"
+            if name in counters:
+                # NOTE: stall microseconds per second, as a percentage of time
+                rates["pressure"][resource] = {
+                    kind: rate / 1e4
+                    for kind, rate in counter_rates(
+                        counters[name], self.counters[name], elapsed
+                    ).items()
+                }
+        for name, (section, key) in COUNTER_FILES.items():
+            if name in counters:
+                rates[section][key] = counter_rates(
+                    counters[name], self.counters[name], elapsed
+                )
+        cpu_stat = rates["cpu"].get("stat", {})
+        if cpu_stat.get("nr_periods"):
+            cpu_stat["throttled_ratio"] = (
+                cpu_stat.get("nr_throttled", 0.0) / cpu_stat["nr_periods"]
+            )
+        self.counters = counters
+        self.last_sample = now
+        return rates
+
+    def create_report(self) -> str:
+        """
+        Create a JSON report of the pressure and throttling rates since the previous report.
+
+        Returns
+        -------
+        str
+            JSON-encoded report containing the cgroup pressure statistics.
+        """
+        timestamp = time.time()
+        rates = self.get_rates()
+
+        if self.environment == EnvironmentEnum.hpc:
+            report = {
+                "type": "pressure",
+                "metadata": {**self.metadata},
+                "timestamp": round(timestamp),
+                **rates,
+            }
+        else:
+            report = resources_report_model.CgroupPressureReport(
+                metadata=resources_report_model.CgroupMetadata(
+                    cgroup=self.cgroup, client_info=self.client_info
+                ),
+                timestamp=round(timestamp),
+                **rates,
+            ).model_dump()
+
+        return json.dumps(report)
@@ -7,6 +7,8 @@ from typing import Any
 
 from qoa4ml.config.configs import ClientInfo, ProbeConfig
 from qoa4ml.connector.base_connector import BaseConnector
+from qoa4ml.lang.datamodel_enum import ReaderBackendEnum
+from qoa4ml.utils.procfs_reader import ProcfsReader, create_procfs_reader
 from qoa4ml.utils.qoa_utils import make_folder
 from qoa4ml.utils.repeated_timer import RepeatedTimer
 
@@ -30,6 +32,12 @@ class Probe(ABC):
             make_folder(self.latency_logging_path)
         self.max_latency = 0.0
         self.connector = connector
+        # NOTE: None reads through psutil, also when procfs can't be read
+        self.reader: ProcfsReader | None = None
+        if self.config.reader_backend == ReaderBackendEnum.procfs:
+            self.reader = create_procfs_reader(
+                self.config.procfs_root, self.config.cgroupfs_root
+            )
 
     @abstractmethod
     def create_report(self) -> Any:
@@ -0,0 +1,238 @@
+import heapq
+import itertools
+import math
+import queue
+import random
+import threading
+import time
+from typing import Optional
+
+from qoa4ml.config.configs import ProbeSchedulerConfig
+from qoa4ml.probes.probe import Probe
+from qoa4ml.utils.logger import qoa_logger
+
+_STOP = object()
+
+
+def next_second() -> float:
+    # NOTE: first ticks are aligned on whole seconds, so probes with the same frequency report together
+    now = time.time()
+    return time.monotonic() + math.ceil(now) - now
+
+
+class ScheduledProbe:
+    """
+    ScheduledProbe is a probe registered in a scheduler, with its timing and counters.
+    """
+
+    __slots__ = (
+        "anchor",
+        "interval",
+        "max_duration",
+        "name",
+        "overruns",
+        "priority",
+        "probe",
+        "running",
+        "runs",
+        "skipped_ticks",
+        "tick",
+    )
+
+    def __init__(self, probe: Probe, name: str, anchor: float) -> None:
+        self.probe = probe
+        self.name = name
+        self.interval = probe.monitoring_interval
+        self.priority = probe.config.priority
+        self.anchor = anchor
+        self.tick = 0
+        self.running = False
+        self.runs = 0
+        self.overruns = 0
+        self.skipped_ticks = 0
+        self.max_duration = 0.0
+
+    def get_stats(self) -> dict:
+        return {
+            "interval": self.interval,
+            "priority": self.priority,
+            "runs": self.runs,
+            "overruns": self.overruns,
+            "skipped_ticks": self.skipped_ticks,
+            "max_duration": self.max_duration,
+        }
+
+
+class ProbeScheduler:
+    """
+    ProbeScheduler runs the reporting of many probes from one timer thread and a small pool of worker threads.
+
+    Parameters
+    ----------
+    config : ProbeSchedulerConfig
+        Configuration settings for the workers and the jitter.
+
+    Attributes
+    ----------
+    entries : list[ScheduledProbe]
+        The scheduled probes, in the order they were added.
+    heap : list[tuple[float, int, int, ScheduledProbe]]
+        Min-heap of (due time, negated priority, sequence, probe) of the next tick of each probe.
+    work_queue : queue.PriorityQueue
+        The due probes waiting for a worker, highest priority first.
+
+    Methods
+    -------
+    add_probe(probe: Probe, name: Optional[str] = None)
+        Schedule a probe, its first tick is on the next whole second.
+    start()
+        Start the timer and worker threads.
+    stop()
+        Stop the threads, a probe being reported finishes its report.
+    get_stats() -> dict[str, dict]
+        Get the runs, overruns, skipped ticks and longest duration of each probe.
+
+    Notes
+    -----
+    - Tick `k` of a probe is due `k` intervals after its first tick, so late wake-ups and slow reports don't make
+      the schedule drift. A random delay of up to `jitter` intervals is added to each tick, not accumulated.
+    - A report lasting longer than its interval counts as an overrun. A tick due while the previous report of the
+      probe is still queued or running is skipped instead of piling up, and counted.
+    - Due probes are handed to the workers by priority, so a slow low-priority probe can't delay the others when
+      the workers are busy.
+    """
+
+    def __init__(self, config: Optional[ProbeSchedulerConfig] = None) -> None:
+        self.config = config or ProbeSchedulerConfig()
+        self.entries: list[ScheduledProbe] = []
+        self.heap: list[tuple[float, int, int, ScheduledProbe]] = []
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.work_queue: queue.PriorityQueue = queue.PriorityQueue()
+        self.running = False
+        self.timer_thread: Optional[threading.Thread] = None
+        self.workers: list[threading.Thread] = []
+
+    def add_probe(self, probe: Probe, name: Optional[str] = None) -> None:
+        entry = ScheduledProbe(
+            probe,
+            name or f"{probe.config.probe_type}-{len(self.entries)}",
+            next_second(),
+        )
+        with self.condition:
+            self.entries.append(entry)
+            self.push(entry)
+            self.condition.notify()
+
+    def push(self, entry: ScheduledProbe) -> None:
+        due = entry.anchor + entry.tick * entry.interval
+        if self.config.jitter:
+            due += random.uniform(0.0, self.config.jitter * entry.interval)
+        heapq.heappush(self.heap, (due, -entry.priority, next(self.sequence), entry))
+
+    def reschedule(self, entry: ScheduledProbe, now: float) -> None:
+        entry.tick += 1
+        # NOTE: ticks missed while the timer thread was late are skipped, not run in a burst
+        behind = math.floor((now - entry.anchor) / entry.interval) - entry.tick
+        if behind > 0:
+            entry.tick += behind
+            entry.skipped_ticks += behind
+        self.push(entry)
+
+    def dispatch(self, entry: ScheduledProbe) -> None:
+        if entry.running:
+            entry.skipped_ticks += 1
+            return
+        entry.running = True
+        self.work_queue.put((-entry.priority, next(self.sequence), entry))
+
+    def run_timer(self) -> None:
+        with self.condition:
+            while self.running:
+                if not self.heap:
+                    self.condition.wait()
+                    continue
+                now = time.monotonic()
+                due = self.heap[0][0]
+                if due > now:
+                    self.condition.wait(due - now)
+                    continue
+                while self.heap and self.heap[0][0] <= now:
+                    entry = heapq.heappop(self.heap)[3]
+                    self.dispatch(entry)
+                    self.reschedule(entry, now)
+
+    def run_worker(self) -> None:
+        while True:
+            entry = self.work_queue.get()[2]
+            if entry is _STOP:
+                return
+            start = time.monotonic()
+            try:
+                entry.probe.reporting()
+            except Exception as e:
+                qoa_logger.exception(
+                    f"Error {type(e)} when reporting probe {entry.name}"
+                )
+            duration = time.monotonic() - start
+            with self.condition:
+                entry.running = False
+                entry.runs += 1
+                entry.max_duration = max(entry.max_duration, duration)
+                if duration > entry.interval:
+                    entry.overruns += 1
+                    overrun = True
+                else:
+                    overrun = False
+            if overrun:
+                qoa_logger.warning(
+                    f"Probe {entry.name} took {duration:.3f}s, longer than its {entry.interval:.3f}s interval"
+                )
+
+    def start(self) -> None:
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+            # NOTE: a restarted schedule starts over instead of counting the stopped time as skipped ticks
+            anchor = next_second()
+            self.heap = []
+            for entry in self.entries:
+                entry.anchor = anchor
+                entry.tick = 0
+                self.push(entry)
+        self.workers = [
+            threading.Thread(
+                target=self.run_worker, daemon=True, name=f"qoa-probe-worker-{i}"
+            )
+            for i in range(self.config.num_workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+        self.timer_thread = threading.Thread(
+            target=self.run_timer, daemon=True, name="qoa-probe-timer"
+        )
+        self.timer_thread.start()
+
+    def stop(self) -> None:
+        with self.condition:
+            if not self.running:
+                return
+            self.running = False
+            self.condition.notify()
+        if self.timer_thread is not None:
+            self.timer_thread.join()
+            self.timer_thread = None
+        # NOTE: stop signals sort before the queued probes, pending reports are dropped
+        for _ in self.workers:
+            self.work_queue.put((-math.inf, next(self.sequence), _STOP))
+        for worker in self.workers:
+            worker.join()
+        self.workers = []
+        with self.condition:
+            while not self.work_queue.empty():
+                self.work_queue.get_nowait()[2].running = False
+
+    def get_stats(self) -> dict[str, dict]:
+        with self.condition:
+            return {entry.name: entry.get_stats() for entry in self.entries}
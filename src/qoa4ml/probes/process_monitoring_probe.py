@@ -13,11 +13,11 @@ from qoa4ml.config.configs import ClientInfo, ProcessProbeConfig
 from qoa4ml.connector.base_connector import BaseConnector
 from qoa4ml.lang.datamodel_enum import EnvironmentEnum
 from qoa4ml.probes.probe import Probe
+from qoa4ml.utils.process_tree import ProcessTreeTracker
 from qoa4ml.utils.qoa_utils import (
     convert_to_mbyte,
     get_process_allowed_cpus,
     get_process_allowed_memory,
-    report_proc_child_cpu,
     report_proc_mem,
 )
 
@@ -55,6 +55,8 @@ class ProcessMonitoringProbe(Probe):
         The environment in which the process is running.
     process : psutil.Process
         The psutil Process object for the monitored process.
+    tracker : ProcessTreeTracker
+        Follows the child processes and their CPU usage between reports.
     obs_service_url : Optional[str]
         The URL of the observation service, if registration is required.
     metadata : Union[dict, resources_report_model.ProcessMetadata]
@@ -96,6 +98,9 @@ class ProcessMonitoringProbe(Probe):
 
         self.environment = config.environment
         self.process = psutil.Process(self.pid)
+        self.tracker = ProcessTreeTracker(
+            self.process, self.config.child_refresh_interval, self.reader
+        )
         if self.config.require_register:
             self.obs_service_url = self.config.obs_service_url
 
@@ -113,10 +118,10 @@ class ProcessMonitoringProbe(Probe):
         Returns
         -------
         dict
-            Dictionary containing the CPU usage information.
+            Dictionary containing the CPU usage of the process and its children since the previous report, in
+            percentage.
         """
-        process_usage = report_proc_child_cpu(self.process)
-        return process_usage
+        return self.tracker.sample()
 
     def get_mem_usage(self) -> dict:
         """
@@ -127,7 +132,10 @@ class ProcessMonitoringProbe(Probe):
         dict
             Dictionary containing the memory usage in megabytes.
         """
-        data = report_proc_mem(self.process)
+        if self.reader is None:
+            data = report_proc_mem(self.process)
+        else:
+            data = self.reader.process_memory(self.pid)
         return {
             "rss": {"value": convert_to_mbyte(data["rss"]), "unit": "Mb"},
             "vms": {"value": convert_to_mbyte(data["vms"]), "unit": "Mb"},
@@ -151,7 +159,11 @@ class ProcessMonitoringProbe(Probe):
         cpu_usage = self.get_cpu_usage()
         mem_usage = self.get_mem_usage()
         allowed_cpu_list = get_process_allowed_cpus()
-        allowed_memory_size = get_process_allowed_memory()
+        allowed_memory_size = (
+            get_process_allowed_memory()
+            if self.reader is None
+            else self.reader.memory_limit()
+        )
 
         if self.environment == EnvironmentEnum.hpc:
             report = {
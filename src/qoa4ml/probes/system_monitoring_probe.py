@@ -130,7 +130,9 @@ class SystemMonitoringProbe(Probe):
         dict
             Dictionary containing the CPU usage information in percentage.
         """
-        value = get_sys_cpu_util()
+        value = (
+            get_sys_cpu_util() if self.reader is None else self.reader.system_cpu_util()
+        )
         return {"value": value, "unit": "percentage"}
 
     def get_gpu_metadata(self) -> dict:
@@ -184,7 +186,7 @@ class SystemMonitoringProbe(Probe):
         dict
             Dictionary containing the memory usage in megabytes.
         """
-        mem = get_sys_mem()
+        mem = get_sys_mem() if self.reader is None else self.reader.system_memory()
         return {"value": convert_to_mbyte(mem["used"]), "unit": "Mb"}
 
     def create_report(self) -> str:
@@ -5,27 +5,33 @@ import threading
 import time
 import traceback
 import uuid
-from threading import Thread
-from typing import Any, Generic, Optional, TypeVar, Union
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Generic, Optional, TypeVar, Union
 
+import lazy_import
 import requests
-from pydantic import create_model
+from pydantic import BaseModel, create_model
 
 # from .connector.mqtt_connector import Mqtt_Connector
 from qoa4ml.config.configs import (
     AMQPConnectorConfig,
+    CgroupPressureProbeConfig,
     ClientConfig,
     ClientInfo,
     ConnectorConfig,
     DebugConnectorConfig,
     DockerProbeConfig,
+    KafkaConnectorConfig,
     ProbeConfig,
     ProcessProbeConfig,
+    SocketConnectorConfig,
     SystemProbeConfig,
 )
 from qoa4ml.connector.amqp_connector import AmqpConnector
 from qoa4ml.connector.base_connector import BaseConnector
 from qoa4ml.connector.debug_connector import DebugConnector
+from qoa4ml.connector.socket_connector import SocketConnector
 from qoa4ml.lang.attributes import ServiceQualityEnum
 from qoa4ml.lang.common_models import Metric
 from qoa4ml.lang.datamodel_enum import (
@@ -33,17 +39,29 @@ from qoa4ml.lang.datamodel_enum import (
     ReportTypeEnum,
     ServiceAPIEnum,
 )
+from qoa4ml.probes.cgroup_pressure_probe import CgroupPressureProbe
 from qoa4ml.probes.docker_monitoring_probe import DockerMonitoringProbe
 from qoa4ml.probes.probe import Probe
+from qoa4ml.probes.probe_scheduler import ProbeScheduler
 from qoa4ml.probes.process_monitoring_probe import ProcessMonitoringProbe
 from qoa4ml.probes.system_monitoring_probe import SystemMonitoringProbe
 from qoa4ml.reports.abstract_report import AbstractReport
+from qoa4ml.reports.metric_record import MetricRecord, check_metric_record
 from qoa4ml.reports.ml_reports import MLReport
 from qoa4ml.utils.logger import qoa_logger
 from qoa4ml.utils.qoa_utils import (
     load_config,
     set_logger_level,
 )
+from qoa4ml.utils.report_sender import ReportSender
+
+if TYPE_CHECKING:
+    from qoa4ml.connector.kafka_connector import KafkaConnector
+else:
+    # NOTE: confluent-kafka is an optional dependency
+    KafkaConnector = lazy_import.lazy_class(
+        "qoa4ml.connector.kafka_connector.KafkaConnector"
+    )
 
 headers = {"Content-Type": "application/json"}
 
@@ -52,7 +70,347 @@ headers = {"Content-Type": "application/json"}
 T = TypeVar("T", bound=AbstractReport)
 
 
-class QoaClient(Generic[T]):
+def get_report_type(category: int) -> ReportTypeEnum:
+    """
+    Map a metric category to the report type it is recorded in.
+
+    Parameters
+    ----------
+    category : int
+        The category of the metric (0: service, 1: data, 2: security).
+
+    Returns
+    -------
+    ReportTypeEnum
+        The report type of the category.
+
+    Raises
+    ------
+    RuntimeError
+        If the category type is not supported.
+    """
+    if category == 0:
+        return ReportTypeEnum.service
+    elif category == 1:
+        return ReportTypeEnum.data
+    elif category == 2:
+        return ReportTypeEnum.security
+    raise RuntimeError("Report type not supported")
+
+
+class ReportObserver(Generic[T]):
+    """
+    ReportObserver records observations in the report returned by `qoa_report`.
+
+    Attributes
+    ----------
+    qoa_report : T
+        The report observations are recorded in, provided by the subclass.
+    stage_id : str
+        The stage metrics are recorded for, provided by the subclass.
+    timer_start : Optional[float]
+        The start time of the running timer, None when no timer runs.
+
+    Methods
+    -------
+    observe_metric(metric_name: MetricNameEnum, value: Any, category: int = 0, description: str = "") -> None
+        Observe and record a metric.
+    observe_inference(inference_value: Any) -> None
+        Observe and record inference data.
+    observe_inference_metric(metric_name: MetricNameEnum, value: Any) -> None
+        Observe and record an inference metric.
+    import_previous_report(reports: Union[dict, list[dict]]) -> None
+        Import and process previous reports.
+    timer() -> dict
+        Start or stop a timer and record the response time.
+
+    Notes
+    -----
+    Shared by `QoaClient`, `RequestScope` and `AsyncQoaClient`, which only differ in the report they record in.
+    """
+
+    qoa_report: T
+    stage_id: str
+    timer_start: Optional[float] = None
+
+    def observe_metric(
+        self,
+        metric_name: MetricNameEnum,
+        value: Any,
+        category: int = 0,
+        description: str = "",
+    ) -> None:
+        """
+        Observe and record a metric.
+
+        Parameters
+        ----------
+        metric_name : MetricNameEnum
+            The name of the metric being observed.
+        value : Any
+            The value of the observed metric.
+        category : int, optional
+            The category of the metric (0: service, 1: data, 2: security), default is 0.
+        description : str, optional
+            An optional description of the observed metric, default is "".
+
+        Raises
+        ------
+        RuntimeError
+            If the category type is not supported.
+        """
+        self.qoa_report.record_metric(
+            get_report_type(category), self.stage_id, metric_name, value, description
+        )
+
+    def observe_inference(self, inference_value: Any) -> None:
+        """
+        Observe and record inference data.
+
+        Parameters
+        ----------
+        inference_value : Any
+            The value of the inference to be observed.
+        """
+        self.qoa_report.observe_inference(inference_value)
+
+    def observe_inference_metric(self, metric_name: MetricNameEnum, value: Any) -> None:
+        """
+        Observe and record an inference metric.
+
+        Parameters
+        ----------
+        metric_name : MetricNameEnum
+            The name of the inference metric being observed.
+        value : Any
+            The value of the observed metric.
+        """
+        self.qoa_report.observe_inference_metric(
+            Metric(metric_name=metric_name, records=[value])
+        )
+
+    def import_previous_report(self, reports: Union[dict, list[dict]]) -> None:
+        """
+        Import and process previous reports.
+
+        Parameters
+        ----------
+        reports : Union[dict, list[dict]]
+            A single report or a list of reports to be processed.
+        """
+        if not isinstance(reports, list):
+            reports = [reports]
+        for report in reports:
+            self.qoa_report.process_previous_report(report)
+
+    def timer(self) -> dict:
+        """
+        Start or stop a timer and record the response time.
+
+        Returns
+        -------
+        dict
+            Empty when the timer starts, otherwise the start time and response time.
+
+        Notes
+        -----
+        - When called for the first time, it starts the timer.
+        - When called again, it stops the timer and records the response time as a metric.
+        """
+        if self.timer_start is None:
+            self.timer_start = time.time()
+            return {}
+        response_time = {
+            "startTime": self.timer_start,
+            "responseTime": time.time() - self.timer_start,
+        }
+        self.timer_start = None
+        self.observe_metric(ServiceQualityEnum.RESPONSE_TIME, response_time, category=0)
+        return response_time
+
+
+class BaseQoaClient(ReportObserver[T]):
+    """
+    BaseQoaClient loads the configuration and identity shared by `QoaClient` and `AsyncQoaClient`.
+
+    Parameters
+    ----------
+    report_cls : type[T], optional
+        The class type for reports, default is MLReport.
+    config_dict : dict, optional
+        A dictionary to load the client's configuration from.
+    config_path : str, optional
+        Path to a JSON or YAML configuration file.
+    registration_url : str, optional
+        URL for registering the client and receiving connector configurations.
+
+    Attributes
+    ----------
+    configuration : ClientConfig
+        The client configuration.
+    client_config : ClientInfo
+        The client information, with its instance ID and a new client ID.
+    instance_id : uuid.UUID
+        From the `INSTANCE_ID` environment variable, else from the configuration, else a new one.
+    registration_url : Optional[str]
+        The registration URL from the parameters, else from the configuration.
+
+    Methods
+    -------
+    init_connector(configuration: ConnectorConfig) -> BaseConnector
+        Initialize a blocking connector based on the configuration provided.
+    get_client_config() -> ClientInfo
+        Get the current client configuration.
+    set_config(key: str, value: Any) -> None
+        Update a specific configuration setting by key.
+    build_report(report: Optional[dict] = None, reset: bool = True, corr_id: Optional[str] = None) -> BaseModel
+        Generate the client report, or wrap a user-defined report with the client metadata.
+
+    Notes
+    -----
+    - If both `config_dict` and `config_path` are provided, the `config_path` will take precedence.
+    - The method will raise an exception if the necessary configuration details are not found.
+    """
+
+    def __init__(
+        self,
+        report_cls: type[T] = MLReport,
+        config_dict: Optional[dict] = None,
+        config_path: Optional[str] = None,
+        registration_url: Optional[str] = None,
+    ):
+        if config_dict is not None:
+            self.configuration = ClientConfig.model_validate(config_dict)
+
+        if config_path is not None:
+            self.configuration = ClientConfig.model_validate(load_config(config_path))
+
+        set_logger_level(self.configuration.client.logging_level)
+        self.client_config = self.configuration.client
+        self.functionality = self.client_config.functionality
+        self.stage_id = self.client_config.stage_id
+        self.report_cls = report_cls
+
+        instance_id = os.environ.get("INSTANCE_ID")
+        if instance_id:
+            qoa_logger.info("Setting instance_id with INSTANCE_ID")
+        elif self.client_config.instance_id:
+            qoa_logger.info("Setting instance_id with client.instance_id")
+            instance_id = self.client_config.instance_id
+        self.instance_id = uuid.UUID(instance_id) if instance_id else uuid.uuid4()
+        self.client_config.instance_id = str(self.instance_id)
+        self.client_config.id = str(uuid.uuid4())
+        self.registration_url = registration_url or self.configuration.registration_url
+
+    def init_connector(self, configuration: ConnectorConfig) -> BaseConnector:
+        """
+        Initialize a blocking connector based on the configuration provided.
+
+        Parameters
+        ----------
+        configuration : ConnectorConfig
+            Configuration settings for initializing the connector.
+
+        Returns
+        -------
+        BaseConnector
+            An instance of the connector (e.g., AMQP, Debug, Socket, Kafka).
+
+        Raises
+        ------
+        RuntimeError
+            If the connector configuration type is not supported.
+        """
+        if configuration.connector_class == ServiceAPIEnum.amqp and isinstance(
+            configuration.config, AMQPConnectorConfig
+        ):
+            return AmqpConnector(configuration.config)
+        elif configuration.connector_class == ServiceAPIEnum.debug and isinstance(
+            configuration.config, DebugConnectorConfig
+        ):
+            return DebugConnector(configuration.config)
+        elif configuration.connector_class == ServiceAPIEnum.socket and isinstance(
+            configuration.config, SocketConnectorConfig
+        ):
+            return SocketConnector(configuration.config)
+        elif configuration.connector_class == ServiceAPIEnum.kafka and isinstance(
+            configuration.config, KafkaConnectorConfig
+        ):
+            return KafkaConnector(configuration.config)
+
+        raise RuntimeError("Connector config is not of correct type")
+
+    def get_client_config(self) -> ClientConfig:
+        """
+        Get the current client configuration.
+
+        Returns
+        -------
+        ClientConfig
+            The client's current configuration settings.
+        """
+        return self.client_config
+
+    def set_config(self, key: str, value: Any) -> None:
+        """
+        Update a specific configuration setting by key.
+
+        Parameters
+        ----------
+        key : str
+            The configuration attribute name to be updated.
+        value : Any
+            The value to set for the specified key.
+
+        Raises
+        ------
+        Exception
+            Logs an error if setting the configuration value fails.
+        """
+        try:
+            self.client_config.__setattr__(key, value)
+        except Exception as e:
+            qoa_logger.exception(f"Error {type(e)} when setConfig in QoA client")
+
+    def build_report(
+        self,
+        report: Optional[dict] = None,
+        reset: bool = True,
+        corr_id: Optional[str] = None,
+    ) -> BaseModel:
+        """
+        Generate the client report, or wrap a user-defined report with the client metadata.
+
+        Parameters
+        ----------
+        report : dict, optional
+            The user-defined report data. If None, the client report is generated.
+        reset : bool, optional
+            Whether to reset the client report after generating it, default is True.
+        corr_id : str, optional
+            The correlation ID for the report, default is None.
+
+        Returns
+        -------
+        BaseModel
+            The report model.
+        """
+        if report is None:
+            return self.qoa_report.generate_report(reset, corr_id=corr_id)
+        user_defined_report_model = create_model(
+            "UserDefinedReportModel",
+            metadata=(dict, ...),
+            timestamp=(float, ...),
+            report=(dict, ...),
+        )
+        return user_defined_report_model(
+            report=report,
+            metadata=copy.deepcopy(self.client_config.__dict__),
+            timestamp=time.time(),
+        )
+
+
+class QoaClient(BaseQoaClient[T]):
     def __init__(
         self,
         report_cls: type[T] = MLReport,
@@ -76,38 +434,18 @@ class QoaClient(Generic[T]):
 
         Notes
         -----
-        - If both `config_dict` and `config_path` are provided, the `config_dict` will take precedence.
+        - If both `config_dict` and `config_path` are provided, the `config_path` will take precedence.
         - If neither `config_dict` nor `config_path` is provided, the client may attempt to fetch configurations from the `registration_url`.
         - The method will raise an exception if the necessary configuration details are not found.
         """
-        if config_dict is not None:
-            self.configuration = ClientConfig.model_validate(config_dict)
-
-        if config_path is not None:
-            self.configuration = ClientConfig.model_validate(load_config(config_path))
-
-        set_logger_level(self.configuration.client.logging_level)
-        self.client_config = self.configuration.client
+        super().__init__(report_cls, config_dict, config_path, registration_url)
         self.connector_list: dict[str, BaseConnector] = {}
-        self.timer_flag = False
-        self.functionality = self.client_config.functionality
-        self.stage_id = self.client_config.stage_id
         self.process_monitor_flag = 0
         self.inference_flag = False
-
-        self.instance_id = os.environ.get("INSTANCE_ID")
-        if self.instance_id:
-            qoa_logger.info("Setting instance_id with INSTANCE_ID")
-            self.instance_id = uuid.UUID(self.instance_id)
-        elif self.configuration.client.instance_id:
-            qoa_logger.info("Setting instance_id with client.instance_id")
-            self.instance_id = uuid.UUID(self.configuration.client.instance_id)
-        else:
-            self.instance_id = str(uuid.uuid4())
-
-        self.client_config.instance_id = str(self.instance_id)
-        self.client_config.id = str(uuid.uuid4())
         self.qoa_report = report_cls(self.client_config)
+        # NOTE: request scopes are merged into this report one at a time when they are submitted
+        self.scope_report = report_cls(self.client_config)
+        self.scope_lock = threading.Lock()
         if self.configuration.connector:
             connector_conf = self.configuration.connector
             try:
@@ -117,14 +455,9 @@ class QoaClient(Generic[T]):
                 qoa_logger.exception(
                     f"Error {type(e)} when configuring connector in QoaClient"
                 )
-        elif registration_url or self.configuration.registration_url:
+        elif self.registration_url:
             try:
-                if registration_url:
-                    registration_data = self.registration(registration_url)
-                else:
-                    registration_data = self.registration(
-                        self.configuration.registration_url
-                    )
+                registration_data = self.registration(self.registration_url)
                 json_data = registration_data.json()
                 response = json_data["response"]
                 if isinstance(response, dict):
@@ -153,13 +486,19 @@ class QoaClient(Generic[T]):
             self.default_connector = None
         else:
             self.default_connector = next(iter(self.connector_list.keys()))
+        self.report_sender = ReportSender(
+            self.configuration.sender, self.connector_list
+        )
 
         self.probes_list = None
+        self.probe_scheduler = None
         if self.configuration.probes:
             self.probes_list = self.init_probes(
                 self.configuration.probes, self.configuration.client
             )
-        self.lock = threading.Lock()
+            self.probe_scheduler = ProbeScheduler(self.configuration.scheduler)
+            for probe in self.probes_list:
+                self.probe_scheduler.add_probe(probe)
 
     def registration(self, url: str) -> requests.Response:
         """
@@ -228,159 +567,16 @@ class QoaClient(Generic[T]):
                 probes_list.append(
                     SystemMonitoringProbe(probe_config, selected_connector, client_info)
                 )
+            elif isinstance(probe_config, CgroupPressureProbeConfig):
+                probes_list.append(
+                    CgroupPressureProbe(probe_config, selected_connector, client_info)
+                )
             else:
                 raise ValueError(
                     f"Probe config type {type(probe_config)} is not supported yet"
                 )
         return probes_list
 
-    def init_connector(self, configuration: ConnectorConfig) -> BaseConnector:
-        """
-        Initialize a connector based on the configuration provided.
-
-        Parameters
-        ----------
-        configuration : ConnectorConfig
-            Configuration settings for initializing the connector.
-
-        Returns
-        -------
-        BaseConnector
-            An instance of the connector (e.g., AMQP, Debug).
-
-        Raises
-        ------
-        RuntimeError
-            If the connector configuration type is not supported.
-        """
-        if configuration.connector_class == ServiceAPIEnum.amqp and isinstance(
-            configuration.config, AMQPConnectorConfig
-        ):
-            return AmqpConnector(configuration.config)
-        elif configuration.connector_class == ServiceAPIEnum.debug and isinstance(
-            configuration.config, DebugConnectorConfig
-        ):
-            return DebugConnector(configuration.config)
-
-        raise RuntimeError("Connector config is not of correct type")
-
-    def get_client_config(self) -> ClientConfig:
-        """
-        Get the current client configuration.
-
-        Returns
-        -------
-        ClientConfig
-            The client's current configuration settings.
-        """
-        return self.client_config
-
-    def set_config(self, key: str, value: Any) -> None:
-        """
-        Update a specific configuration setting by key.
-
-        Parameters
-        ----------
-        key : str
-            The configuration attribute name to be updated.
-        value : Any
-            The value to set for the specified key.
-
-        Raises
-        ------
-        Exception
-            Logs an error if setting the configuration value fails.
-        """
-        try:
-            self.client_config.__setattr__(key, value)
-        except Exception as e:
-            qoa_logger.exception(f"Error {type(e)} when setConfig in QoA client")
-
-    def observe_metric(
-        self,
-        metric_name: MetricNameEnum,
-        value: Any,
-        category: int = 0,
-        description: str = "",
-    ) -> None:
-        """
-        Observe and report a metric.
-
-        Parameters
-        ----------
-        metric_name : MetricNameEnum
-            The name of the metric being observed.
-        value : Any
-            The value of the observed metric.
-        category : int, optional
-            The category of the metric (0: service, 1: data, 2: security), default is 0.
-        description : str, optional
-            An optional description of the observed metric, default is "".
-
-        Raises
-        ------
-        RuntimeError
-            If the category type is not supported.
-        """
-        if category == 0:
-            report_type = ReportTypeEnum.service
-        elif category == 1:
-            report_type = ReportTypeEnum.data
-        elif category == 2:
-            report_type = ReportTypeEnum.security
-        else:
-            raise RuntimeError("Report type not supported")
-
-        self.qoa_report.observe_metric(
-            report_type,
-            self.stage_id,
-            Metric(metric_name=metric_name, records=[value], description=description),
-        )
-
-    def timer(self) -> dict:
-        """
-        Start or stop a timer and record the response time.
-
-        Returns
-        -------
-        dict
-            A dictionary containing the start time and response time.
-
-        Notes
-        -----
-        - When called for the first time, it starts the timer.
-        - When called again, it stops the timer and records the response time as a metric.
-        """
-        if self.timer_flag is False:
-            self.timer_flag = True
-            self.timerStart = time.time()
-            return {}
-        else:
-            self.timer_flag = False
-            response_time = {
-                "startTime": self.timerStart,
-                "responseTime": time.time() - self.timerStart,
-            }
-            self.observe_metric(
-                ServiceQualityEnum.RESPONSE_TIME, response_time, category=0
-            )
-            return response_time
-
-    def import_previous_report(self, reports: Union[dict, list[dict]]) -> None:
-        """
-        Import and process previous reports.
-
-        Parameters
-        ----------
-        reports : Union[dict, list[dict]]
-            A single report or a list of reports to be processed.
-        """
-        if isinstance(reports, list):
-            for report in reports:
-                self.qoa_report.process_previous_report(report)
-        else:
-            self.qoa_report.process_previous_report(reports)
-
     def asyn_report(self, body_mess: str, connectors: Optional[list] = None) -> None:
         """
         Asynchronously send a report through the connectors.
@@ -390,30 +586,22 @@ class QoaClient(Generic[T]):
         body_mess : str
             The message body to be sent.
         connectors : list, optional
-            A list of connectors to send the report through. If None, the default connector is used.
+            A list of connector names to send the report through. If None, the default connector is used.
 
         Notes
         -----
-        Uses threading to send reports asynchronously.
+        The report is put on the bounded queue of the report sender, whose background threads send it.
         """
-        self.lock.acquire()
         if connectors is None:
             if self.default_connector:
-                chosen_connector = self.connector_list[self.default_connector]
-                if isinstance(chosen_connector, AmqpConnector):
-                    if not chosen_connector.check_connection():
-                        chosen_connector.reconnect()
-
-                    chosen_connector.send_report(body_mess, corr_id=str(uuid.uuid4()))
-                else:
-                    chosen_connector.send_report(body_mess)
+                connectors = [self.default_connector]
             else:
                 qoa_logger.error(
                     "No default connector, please specify the connector to use"
                 )
-        else:
-            pass
-        self.lock.release()
+                return
+        for connector_name in connectors:
+            self.report_sender.submit(connector_name, body_mess)
 
     def report(
         self,
@@ -431,7 +619,7 @@ class QoaClient(Generic[T]):
         report : dict, optional
             The report data to be submitted. If None, a report will be generated.
         connectors : list, optional
-            A list of connectors through which to send the report, default is None.
+            A list of connector names through which to send the report, default is None.
         submit : bool, optional
             Whether to submit the report, default is False.
         reset : bool, optional
@@ -449,32 +637,47 @@ class QoaClient(Generic[T]):
         The method will create a report based on the current state if none is provided.
         If `submit` is True, the report will be sent through the default or specified connectors.
         """
-        if report is None:
-            return_report = self.qoa_report.generate_report(reset, corr_id=corr_id)
-        else:
-            user_defined_report_model = create_model(
-                "UserDefinedReportModel",
-                metadata=(dict, ...),
-                timestamp=(float, ...),
-                report=(dict, ...),
-            )
-            return_report = user_defined_report_model(
-                report=report,
-                metadata=copy.deepcopy(self.client_config.__dict__),
-                timestamp=time.time(),
-            )
+        return_report = self.build_report(report, reset, corr_id)
 
         if submit:
             if self.default_connector is not None:
-                sub_thread = Thread(
-                    target=self.asyn_report,
-                    args=(return_report.model_dump_json(), connectors),
-                )
-                sub_thread.start()
+                self.asyn_report(return_report.model_dump_json(), connectors)
             else:
                 qoa_logger.warning("No connector available")
         return return_report.model_dump(mode="json")
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every submitted report has been sent.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum seconds to wait, None waits until all reports are sent.
+
+        Returns
+        -------
+        bool
+            True if all submitted reports were sent within the timeout.
+        """
+        return self.report_sender.flush(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Send the queued reports and close all connectors.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum seconds to wait for queued reports, default is `sender.shutdown_timeout` from the config.
+        """
+        self.report_sender.close(timeout)
+        for connector in self.connector_list.values():
+            try:
+                connector.close()
+            except Exception as e:
+                qoa_logger.exception(f"Error {type(e)} when closing connector")
+
     def start_all_probes(self) -> None:
         """
         Start all probes for monitoring, running them in the background.
@@ -486,14 +689,14 @@ class QoaClient(Generic[T]):
 
         Notes
         -----
-        If the probe takes a long time to report and the main process exits, no report may be sent.
+        - If the probe takes a long time to report and the main process exits, no report may be sent.
+        - All probes share one scheduler thread and `scheduler.num_workers` worker threads, see `ProbeScheduler`.
         """
-        if not self.probes_list:
+        if not self.probes_list or self.probe_scheduler is None:
             raise RuntimeError(
                 "There is no initiated probes, please recheck the config"
             )
-        for probe in self.probes_list:
-            probe.start_reporting()
+        self.probe_scheduler.start()
 
     def stop_all_probes(self) -> None:
         """
@@ -508,49 +711,62 @@ class QoaClient(Generic[T]):
         -----
         This method stops the background monitoring activities of all active probes.
         """
-        if not self.probes_list:
+        if not self.probes_list or self.probe_scheduler is None:
             raise RuntimeError(
                 "There are no initiated probes, please recheck the config"
             )
-        for probe in self.probes_list:
-            probe.stop_reporting()
+        self.probe_scheduler.stop()
 
-    def observe_inference(self, inference_value: Any) -> None:
+    def get_probe_stats(self) -> dict[str, dict]:
         """
-        Observe and record inference data.
+        Get the scheduling statistics of the probes.
 
-        Parameters
-        ----------
-        inference_value : Any
-            The value of the inference to be observed.
-
-        Notes
-        -----
-        This method is used to record predictions or inference results for later analysis.
+        Returns
+        -------
+        dict[str, dict]
+            For each probe, its interval, priority, number of runs, overruns and skipped ticks, and its longest
+            report duration in seconds. Empty if no probe is configured.
         """
-        self.qoa_report.observe_inference(inference_value)
+        if self.probe_scheduler is None:
+            return {}
+        return self.probe_scheduler.get_stats()
 
-    def observe_inference_metric(
+    @contextmanager
+    def request_scope(
         self,
-        metric_name: MetricNameEnum,
-        value: Any,
-    ) -> None:
+        corr_id: Optional[str] = None,
+        submit: bool = True,
+        connectors: Optional[list] = None,
+    ) -> Iterator["RequestScope[T]"]:
         """
-        Observe and report a specific inference metric.
+        Open a scope whose observations are kept apart from the shared client report.
 
         Parameters
         ----------
-        metric_name : MetricNameEnum
-            The name of the inference metric being observed.
-        value : Any
-            The value of the observed metric.
+        corr_id : str, optional
+            The correlation ID of the request, added to the report metadata.
+        submit : bool, optional
+            Whether to submit the scope report when the scope exits, default is True.
+        connectors : list, optional
+            A list of connector names through which to send the report, default is the default connector.
+
+        Yields
+        ------
+        RequestScope[T]
+            The scope to observe the metrics and inference of one request.
 
         Notes
         -----
-        This method can be used to log performance metrics, evaluation scores, etc. during inference.
+        - Concurrent requests each use their own scope, so they can observe metrics in parallel without a lock.
+        - The scope report is generated when the scope exits, even if the request raised, unless `report` was
+          already called on the scope.
         """
-        metric = Metric(metric_name=metric_name, records=[value])
-        self.qoa_report.observe_inference_metric(metric)
+        scope = RequestScope(self, corr_id)
+        try:
+            yield scope
+        finally:
+            if not scope.reported:
+                scope.report(submit=submit, connectors=connectors)
 
     def __str__(self) -> str:
         """
@@ -566,3 +782,143 @@ class QoaClient(Generic[T]):
         This method is particularly useful for debugging and logging purposes.
         """
         return self.client_config.model_dump_json() + "\n" + str(self.connector_list)
+
+
+class ScopeObservations:
+    """
+    ScopeObservations buffers the observations of a request scope until its report is generated.
+
+    Attributes
+    ----------
+    metrics : dict[tuple, MetricRecord]
+        The latest value of each metric, keyed by report type, stage and metric name.
+    inferences : list[Any]
+        The observed inference values.
+    inference_metrics : list[Metric]
+        The observed inference metrics.
+    previous_reports : list[dict]
+        The imported previous reports.
+
+    Notes
+    -----
+    It takes the observation methods of a report, so `ReportObserver` records in it like in a report.
+    """
+
+    __slots__ = ("inference_metrics", "inferences", "metrics", "previous_reports")
+
+    def __init__(self) -> None:
+        self.metrics: dict[tuple, MetricRecord] = {}
+        self.inferences: list[Any] = []
+        self.inference_metrics: list[Metric] = []
+        self.previous_reports: list[dict] = []
+
+    def record_metric(
+        self,
+        report_type: ReportTypeEnum,
+        stage: str,
+        metric_name: MetricNameEnum,
+        value: Any,
+        description: str = "",
+    ) -> None:
+        check_metric_record(metric_name, value, description)
+        self.metrics[(report_type, stage, metric_name)] = MetricRecord(
+            report_type, stage, metric_name, value, description
+        )
+
+    def observe_inference(self, inference_value: Any) -> None:
+        self.inferences.append(inference_value)
+
+    def observe_inference_metric(self, metric: Metric) -> None:
+        self.inference_metrics.append(metric)
+
+    def process_previous_report(self, previous_report_dict: dict) -> None:
+        self.previous_reports.append(previous_report_dict)
+
+    def merge_into(self, report: AbstractReport) -> None:
+        for previous_report in self.previous_reports:
+            report.process_previous_report(previous_report)
+        for record in self.metrics.values():
+            report.record_metric(
+                record.report_type,
+                record.stage,
+                record.metric_name,
+                record.value,
+                record.description,
+            )
+        for inference_value in self.inferences:
+            report.observe_inference(inference_value)
+        for metric in self.inference_metrics:
+            report.observe_inference_metric(metric)
+
+
+class RequestScope(ReportObserver[T]):
+    """
+    RequestScope records the observations of a single request apart from the shared client report.
+
+    Parameters
+    ----------
+    client : QoaClient[T]
+        The client whose configuration and connectors are used.
+    corr_id : str, optional
+        The correlation ID of the request, default is None.
+
+    Attributes
+    ----------
+    qoa_report : ScopeObservations
+        The observations of this request, merged into a report when it is generated.
+    reported : bool
+        Whether the report of this scope was already generated.
+
+    Methods
+    -------
+    report(submit: bool = True, connectors: Optional[list] = None) -> dict
+        Generate the report of the request and optionally submit it.
+
+    Notes
+    -----
+    - Observations are only buffered, the report is built by `report` from the `scope_report` of the client,
+      so a scope doesn't create a report or copy the client configuration.
+    - Errors the report class raises for an observation, e.g. for an unsupported report type, are raised by
+      `report`.
+    """
+
+    def __init__(self, client: QoaClient[T], corr_id: Optional[str] = None) -> None:
+        self.client = client
+        self.corr_id = corr_id
+        self.stage_id = client.stage_id
+        self.qoa_report = ScopeObservations()
+        self.reported = False
+
+    def report(self, submit: bool = True, connectors: Optional[list] = None) -> dict:
+        """
+        Generate the report of the request and optionally submit it.
+
+        Parameters
+        ----------
+        submit : bool, optional
+            Whether to submit the report, default is True.
+        connectors : list, optional
+            A list of connector names through which to send the report, default is the default connector.
+
+        Returns
+        -------
+        dict
+            The JSON-encoded report.
+        """
+        self.reported = True
+        with self.client.scope_lock:
+            scope_report = self.client.scope_report
+            try:
+                self.qoa_report.merge_into(scope_report)
+            except BaseException:
+                scope_report.reset()
+                raise
+            return_report = scope_report.generate_report(
+                reset=True, corr_id=self.corr_id
+            )
+        if submit:
+            if self.client.default_connector is not None:
+                self.client.asyn_report(return_report.model_dump_json(), connectors)
+            else:
+                qoa_logger.warning("No connector available")
+        return return_report.model_dump(mode="json")
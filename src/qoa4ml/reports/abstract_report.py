@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Optional
 
 from qoa4ml.lang.common_models import Metric
+from qoa4ml.lang.datamodel_enum import MetricNameEnum, ReportTypeEnum
 from qoa4ml.reports.ml_report_model import BaseReport
 
 
@@ -28,6 +29,21 @@ class AbstractReport(ABC):
     def observe_metric(self, report_type, stage, metric: Metric):
         pass
 
+    def record_metric(
+        self,
+        report_type: ReportTypeEnum,
+        stage: str,
+        metric_name: MetricNameEnum,
+        value: Any,
+        description: str = "",
+    ) -> None:
+        # NOTE: reports with a cheaper recording path override this
+        self.observe_metric(
+            report_type,
+            stage,
+            Metric(metric_name=metric_name, records=[value], description=description),
+        )
+
     @abstractmethod
     def observe_inference(self, inference_value):
         pass
@@ -0,0 +1,74 @@
+from typing import Any
+
+from qoa4ml.lang.common_models import Metric
+from qoa4ml.lang.datamodel_enum import MetricNameEnum, ReportTypeEnum
+
+RECORD_TYPES = (dict, float, int, tuple, str)
+
+
+class MetricRecord:
+    """
+    MetricRecord is the unvalidated form of an observed metric, kept until the report is generated.
+
+    Parameters
+    ----------
+    report_type : ReportTypeEnum
+        The type of report the metric belongs to.
+    stage : str
+        The stage of the process in which the metric is recorded.
+    metric_name : MetricNameEnum
+        The name of the metric.
+    value : Any
+        The observed value.
+    description : str
+        The description of the metric.
+    """
+
+    __slots__ = ("description", "metric_name", "report_type", "stage", "value")
+
+    def __init__(
+        self,
+        report_type: ReportTypeEnum,
+        stage: str,
+        metric_name: MetricNameEnum,
+        value: Any,
+        description: str,
+    ) -> None:
+        self.report_type = report_type
+        self.stage = stage
+        self.metric_name = metric_name
+        self.value = value
+        self.description = description
+
+
+def check_metric_record(
+    metric_name: MetricNameEnum, value: Any, description: str
+) -> None:
+    """
+    Check that a metric can be built from a recorded value.
+
+    Parameters
+    ----------
+    metric_name : MetricNameEnum
+        The name of the metric.
+    value : Any
+        The observed value.
+    description : str
+        The description of the metric.
+
+    Raises
+    ------
+    ValidationError
+        If the metric name or the value isn't valid for a `Metric`.
+
+    Notes
+    -----
+    Names and values of the common types are checked without building the model; any other is validated by
+    building it, so invalid values raise as they do when the `Metric` is built directly.
+    """
+    if (
+        not isinstance(metric_name, str)
+        or not isinstance(value, RECORD_TYPES)
+        or not isinstance(description, str)
+    ):
+        Metric(metric_name=metric_name, records=[value], description=description)
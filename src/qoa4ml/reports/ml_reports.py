@@ -5,8 +5,9 @@ from uuid import UUID, uuid4
 
 from qoa4ml.config.configs import ClientInfo
 from qoa4ml.lang.common_models import Metric
-from qoa4ml.lang.datamodel_enum import ReportTypeEnum
+from qoa4ml.lang.datamodel_enum import MetricNameEnum, ReportTypeEnum
 from qoa4ml.reports.abstract_report import AbstractReport
+from qoa4ml.reports.metric_record import MetricRecord, check_metric_record
 from qoa4ml.reports.ml_report_model import (
     BaseReport,
     GeneralMlInferenceReport,
@@ -28,6 +29,11 @@ class MLReport(AbstractReport):
     ----------
     client_config : ClientInfo
         A deep copy of the client configuration.
+    instance_id : UUID
+        The instance ID of the client, parsed once.
+    pending_records : dict[tuple, MetricRecord]
+        The latest value of each metric recorded with `record_metric` and not yet added to the report, keyed by
+        report type, stage and metric name.
     init_time : float
         The initialization time of the report.
     previous_report : list[GeneralMlInferenceReport]
@@ -45,6 +51,10 @@ class MLReport(AbstractReport):
         Process and incorporate a previous report.
     observe_metric(report_type: ReportTypeEnum, stage: str, metric: Metric) -> None
         Observe and record a metric.
+    record_metric(report_type: ReportTypeEnum, stage: str, metric_name: MetricNameEnum, value: Any, description: str = "") -> None
+        Record a metric value, deferring validation to report generation.
+    flush_records() -> None
+        Build the models of the recorded metrics and add them to the report.
     observe_inference(inference_value: Any) -> None
         Observe and record inference data.
     observe_inference_metric(metric: Metric) -> None
@@ -63,6 +73,8 @@ class MLReport(AbstractReport):
             Configuration settings related to the client.
         """
         self.client_config = copy.deepcopy(client_config)
+        self.instance_id = UUID(self.client_config.instance_id)
+        self.spare_report = GeneralMlInferenceReport()
         self.reset()
         self.init_time = time.time()
 
@@ -72,10 +84,12 @@ class MLReport(AbstractReport):
 
         Notes
         -----
-        - This method initializes a new report model and clears the list of previous reports.
+        - This method swaps in the pre-allocated empty report model and clears the list of previous reports.
         """
         self.previous_report: list[GeneralMlInferenceReport] = []
-        self.report = GeneralMlInferenceReport()
+        self.pending_records: dict[tuple, MetricRecord] = {}
+        self.report = self.spare_report
+        self.spare_report = GeneralMlInferenceReport()
 
     def combine_stage_report(
         self,
@@ -127,6 +141,7 @@ class MLReport(AbstractReport):
         -----
         - Service quality, data quality, and ML inference reports are combined with the current report.
         """
+        self.flush_records()
         previous_report = GeneralMlInferenceReport(**previous_report_dict)
         self.previous_report.append(previous_report)
 
@@ -158,6 +173,12 @@ class MLReport(AbstractReport):
         ValueError
             If the stage name is empty or the report type is not handled.
         """
+        self.flush_records()
+        self.add_metric(report_type, stage, metric)
+
+    def add_metric(
+        self, report_type: ReportTypeEnum, stage: str, metric: Metric
+    ) -> None:
         if stage == "":
             raise ValueError("Stage name can't be empty")
 
@@ -176,7 +197,70 @@ class MLReport(AbstractReport):
         if metric.metric_name not in report_dict:
             report_dict[metric.metric_name] = {}
 
-        report_dict[metric.metric_name][UUID(self.client_config.instance_id)] = metric
+        report_dict[metric.metric_name][self.instance_id] = metric
+
+    def record_metric(
+        self,
+        report_type: ReportTypeEnum,
+        stage: str,
+        metric_name: MetricNameEnum,
+        value: Any,
+        description: str = "",
+    ) -> None:
+        """
+        Record a metric value, deferring validation to report generation.
+
+        Parameters
+        ----------
+        report_type : ReportTypeEnum
+            The type of report being generated.
+        stage : str
+            The stage of the process in which the metric is recorded.
+        metric_name : MetricNameEnum
+            The name of the metric.
+        value : Any
+            The observed value.
+        description : str, optional
+            The description of the metric, default is "".
+
+        Raises
+        ------
+        ValueError
+            If the stage name is empty or the report type is not handled.
+        ValidationError
+            If the metric name or the value isn't valid for a `Metric`.
+
+        Notes
+        -----
+        - The value replaces the previous one of the metric, the `Metric` model is built by `flush_records`.
+        - Invalid values raise as they do with `observe_metric`, see `check_metric_record`.
+        """
+        if stage == "":
+            raise ValueError("Stage name can't be empty")
+        if report_type != ReportTypeEnum.service and report_type != ReportTypeEnum.data:
+            raise ValueError(f"Can't handle report type {report_type}")
+        check_metric_record(metric_name, value, description)
+        self.pending_records[(report_type, stage, metric_name)] = MetricRecord(
+            report_type, stage, metric_name, value, description
+        )
+
+    def flush_records(self) -> None:
+        """
+        Build the models of the recorded metrics and add them to the report.
+        """
+        if not self.pending_records:
+            return
+        records, self.pending_records = self.pending_records, {}
+        for record in records.values():
+            self.add_metric(
+                record.report_type,
+                record.stage,
+                Metric(
+                    metric_name=record.metric_name,
+                    records=[record.value],
+                    description=record.description,
+                ),
+            )
 
     def observe_inference(self, inference_value: Any) -> None:
         """
@@ -191,7 +275,7 @@ class MLReport(AbstractReport):
         -----
         - Raises a warning if inference data already exists for the current instance.
         """
-        instance_id = UUID(self.client_config.instance_id)
+        instance_id = self.instance_id
 
         if instance_id in self.report.ml_inference:
             raise RuntimeWarning(
@@ -214,7 +298,7 @@ class MLReport(AbstractReport):
         metric : Metric
             The inference-specific metric to be recorded.
         """
-        instance_id = UUID(self.client_config.instance_id)
+        instance_id = self.instance_id
 
         if instance_id in self.report.ml_inference:
             self.report.ml_inference[instance_id].metrics.append(metric)
@@ -247,9 +331,12 @@ class MLReport(AbstractReport):
         Notes
         -----
         - Adds metadata such as client configuration, timestamp, and runtime to the report.
-        - Deep copies the current state of the report before optionally resetting it.
+        - With `reset`, the current report is handed off as is and an empty one is swapped in, without copying.
+          The client configuration in its metadata is shared by all handed-off reports and must not be modified.
+        - Without `reset`, a deep copy of the current state of the report is returned.
         """
-        self.report.metadata["client_config"] = copy.deepcopy(self.client_config)
+        self.flush_records()
+        self.report.metadata["client_config"] = self.client_config
         self.report.metadata["timestamp"] = time.time()
         if corr_id is not None:
             self.report.metadata["corr_id"] = corr_id
@@ -257,7 +344,9 @@ class MLReport(AbstractReport):
             self.report.metadata["timestamp"] - self.init_time
         )
 
-        report = copy.deepcopy(self.report)
         if reset:
+            report = self.report
             self.reset()
+        else:
+            report = copy.deepcopy(self.report)
         return report
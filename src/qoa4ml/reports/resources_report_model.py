@@ -19,6 +19,10 @@ class SystemMetadata(BaseMetadata):
     model: str | None = None
 
 
+class CgroupMetadata(BaseMetadata):
+    cgroup: str
+
+
 class ResourceReport(BaseModel):
     metadata: dict | None = None
     usage: dict
@@ -40,6 +44,15 @@ class SystemReport(BaseModel):
     mem: ResourceReport
 
 
+class CgroupPressureReport(BaseModel):
+    metadata: CgroupMetadata
+    timestamp: float
+    pressure: dict
+    cpu: dict
+    memory: dict
+    io: dict
+
+
 class DockerContainerMetadata(BaseMetadata):
     id: str
     image: str
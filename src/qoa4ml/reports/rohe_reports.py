@@ -80,29 +80,46 @@ class RoheReport(AbstractReport):
             Configuration settings related to the client.
         """
         self.client_config = copy.deepcopy(client_config)
+        self.execution_instance = MicroserviceInstance(
+            id=UUID(self.client_config.instance_id),
+            name=self.client_config.name,
+            functionality=self.client_config.functionality,
+            stage=self.client_config.stage_id,
+        )
+        self.spare_buffers = self.allocate_buffers()
         self.reset()
         self.init_time = time.time()
 
+    def allocate_buffers(
+        self,
+    ) -> tuple[EnsembleInferenceReport, ExecutionGraph, RoheReportModel]:
+        """
+        Allocate the empty models a report is built in.
+
+        Returns
+        -------
+        tuple[EnsembleInferenceReport, ExecutionGraph, RoheReportModel]
+            An empty inference report, execution graph, and report.
+        """
+        return (
+            EnsembleInferenceReport(),
+            ExecutionGraph(linked_list={}),
+            RoheReportModel(),
+        )
+
     def reset(self) -> None:
         """
         Reset the report to an initial state.
 
         Notes
         -----
-        - This method initializes a new report model and clears the list of previous reports.
-        - It also resets the inference report, execution graph, and execution instance.
+        - This method swaps in the pre-allocated empty report models and clears the list of previous reports.
+        - The execution instance only depends on the client configuration and is kept across resets.
         """
         self.previous_report: list[RoheReportModel] = []
-        self.inference_report = EnsembleInferenceReport()
-        self.execution_graph = ExecutionGraph(linked_list={})
-        self.report = RoheReportModel()
+        self.inference_report, self.execution_graph, self.report = self.spare_buffers
+        self.spare_buffers = self.allocate_buffers()
         self.previous_microservice_instance = []
-        self.execution_instance = MicroserviceInstance(
-            id=UUID(self.client_config.instance_id),
-            name=self.client_config.name,
-            functionality=self.client_config.functionality,
-            stage=self.client_config.stage_id,
-        )
 
     def import_report_from_file(self, file_path: str) -> None:
         """
@@ -294,7 +311,7 @@ class RoheReport(AbstractReport):
         if metric.metric_name not in report_dict:
             report_dict[metric.metric_name] = {}
 
-        report_dict[metric.metric_name][UUID(self.client_config.instance_id)] = metric
+        report_dict[metric.metric_name][self.execution_instance.id] = metric
         self.report.inference_report = self.inference_report
 
     def observe_inference(self, inference_value: Any) -> None:
@@ -389,10 +406,13 @@ class RoheReport(AbstractReport):
         Notes
         -----
         - Adds metadata such as client configuration, timestamp, and runtime to the report.
-        - Builds the execution graph and deep copies the current state of the report before optionally resetting it.
+        - Builds the execution graph. With `reset`, the current report is handed off as is and empty models are
+          swapped in, without copying. The client configuration in its metadata is shared by all handed-off
+          reports and must not be modified.
+        - Without `reset`, a deep copy of the current state of the report is returned.
         """
         self.build_execution_graph()
-        self.report.metadata["client_config"] = copy.deepcopy(self.client_config)
+        self.report.metadata["client_config"] = self.client_config
         self.report.metadata["timestamp"] = time.time()
         if corr_id is not None:
             self.report.metadata["corr_id"] = corr_id
@@ -400,7 +420,9 @@ class RoheReport(AbstractReport):
             self.report.metadata["timestamp"] - self.init_time
         )
 
-        report = copy.deepcopy(self.report)
         if reset:
+            report = self.report
             self.reset()
+        else:
+            report = copy.deepcopy(self.report)
         return report
@@ -0,0 +1,117 @@
+import queue
+import threading
+from typing import Any, Optional
+
+from ..lang.datamodel_enum import OverflowPolicyEnum
+
+STOP = object()
+
+
+class BoundedQueue(queue.Queue):
+    """
+    BoundedQueue is a bounded `queue.Queue` that applies an overflow policy when it is full.
+
+    Parameters
+    ----------
+    maxsize : int
+        The maximum number of queued items.
+    overflow_policy : OverflowPolicyEnum
+        What `offer` does when the queue is full.
+    block_timeout : Optional[float], optional
+        Seconds the block policy waits for a free slot before dropping the item, None waits forever.
+
+    Methods
+    -------
+    offer(item: Any) -> tuple[bool, int]
+        Queue an item, applying the overflow policy when the queue is full.
+    stop()
+        Queue the `STOP` signal for one consumer.
+
+    Notes
+    -----
+    - The drop oldest policy never drops `STOP`; the new item is dropped instead.
+    - Every dropped item is marked done, so `join` still returns once the queued items are processed.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        overflow_policy: OverflowPolicyEnum,
+        block_timeout: Optional[float] = None,
+    ) -> None:
+        super().__init__(maxsize=maxsize)
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+
+    def offer(self, item: Any) -> tuple[bool, int]:
+        """
+        Queue an item, applying the overflow policy when the queue is full.
+
+        Parameters
+        ----------
+        item : Any
+            The item to be queued.
+
+        Returns
+        -------
+        tuple[bool, int]
+            Whether the item was queued, and the number of items dropped, including the item itself.
+        """
+        if self.overflow_policy == OverflowPolicyEnum.block:
+            try:
+                self.put(item, timeout=self.block_timeout)
+                return True, 0
+            except queue.Full:
+                return False, 1
+
+        dropped = 0
+        while True:
+            try:
+                self.put_nowait(item)
+                return True, dropped
+            except queue.Full:
+                if self.overflow_policy == OverflowPolicyEnum.drop_newest:
+                    return False, dropped + 1
+            try:
+                oldest = self.get_nowait()
+            except queue.Empty:
+                continue
+            self.task_done()
+            if oldest is STOP:
+                # NOTE: never drop a shutdown signal, keep the new item out instead
+                self.put(oldest)
+                return False, dropped + 1
+            dropped += 1
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Queue the `STOP` signal for one consumer.
+
+        Parameters
+        ----------
+        timeout : Optional[float], optional
+            Seconds to wait for a free slot, None waits forever.
+
+        Raises
+        ------
+        queue.Full
+            If no slot was freed within the timeout.
+        """
+        self.put(STOP, timeout=timeout)
+
+
+class CounterMixin:
+    """
+    CounterMixin counts events in integer attributes from several threads.
+
+    Attributes
+    ----------
+    stats_lock : threading.Lock
+        The lock guarding the counters, set by the class using the mixin.
+    """
+
+    stats_lock: threading.Lock
+
+    def _count(self, counter: str, value: int = 1) -> None:
+        with self.stats_lock:
+            setattr(self, counter, getattr(self, counter) + value)
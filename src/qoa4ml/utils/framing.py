@@ -0,0 +1,108 @@
+import socket
+import struct
+from typing import Optional
+
+HEADER = struct.Struct("!I")
+HEADER_SIZE = HEADER.size
+
+
+def encode_frame(body_message: str) -> bytes:
+    """
+    Encode a report as a length-prefixed frame.
+
+    Parameters
+    ----------
+    body_message : str
+        The report, usually a JSON document.
+
+    Returns
+    -------
+    bytes
+        A 4-byte big-endian length followed by the UTF-8 encoded report.
+    """
+    payload = body_message.encode("utf-8")
+    return HEADER.pack(len(payload)) + payload
+
+
+class FrameReader:
+    """
+    FrameReader decodes length-prefixed frames from a stream socket into a preallocated buffer.
+
+    Parameters
+    ----------
+    bufsize : int
+        The initial size of the receive buffer.
+    max_frame_size : int
+        The largest frame accepted, in bytes.
+
+    Attributes
+    ----------
+    buffer : bytearray
+        The receive buffer, grown only when a frame doesn't fit.
+    start : int
+        Offset of the first byte not yet decoded.
+    end : int
+        Offset after the last byte received.
+
+    Methods
+    -------
+    read(sock: socket.socket) -> Optional[list[str]]
+        Receive once from the socket and return the complete frames, or None when the peer closed the connection.
+
+    Raises
+    ------
+    ValueError
+        If a frame announces a size larger than `max_frame_size`.
+
+    Notes
+    -----
+    - Data is received with `recv_into` and frames are decoded from a memoryview of the buffer, so no intermediate
+      bytes objects are built.
+    - A partial frame is moved to the front of the buffer before the next receive.
+    """
+
+    def __init__(self, bufsize: int, max_frame_size: int) -> None:
+        self.buffer = bytearray(max(bufsize, HEADER_SIZE))
+        self.view = memoryview(self.buffer)
+        self.max_frame_size = max_frame_size
+        self.start = 0
+        self.end = 0
+
+    def read(self, sock: socket.socket) -> Optional[list[str]]:
+        if self.end == len(self.buffer):
+            self.compact()
+        received = sock.recv_into(self.view[self.end :])
+        if received == 0:
+            return None
+        self.end += received
+        return self.decode()
+
+    def decode(self) -> list[str]:
+        frames = []
+        while self.end - self.start >= HEADER_SIZE:
+            (size,) = HEADER.unpack_from(self.buffer, self.start)
+            if size > self.max_frame_size:
+                raise ValueError(
+                    f"Frame of {size} bytes exceeds the limit of {self.max_frame_size} bytes"
+                )
+            frame_end = self.start + HEADER_SIZE + size
+            if frame_end > self.end:
+                if HEADER_SIZE + size > len(self.buffer):
+                    self.grow(HEADER_SIZE + size)
+                break
+            frames.append(str(self.view[self.start + HEADER_SIZE : frame_end], "utf-8"))
+            self.start = frame_end
+        if self.start == self.end:
+            self.start = self.end = 0
+        return frames
+
+    def compact(self) -> None:
+        pending = self.end - self.start
+        self.buffer[:pending] = bytes(self.view[self.start : self.end])
+        self.start, self.end = 0, pending
+
+    def grow(self, size: int) -> None:
+        self.compact()
+        self.view.release()
+        self.buffer.extend(bytes(size - len(self.buffer)))
+        self.view = memoryview(self.buffer)
@@ -0,0 +1,181 @@
+import time
+from typing import Optional
+
+import psutil
+
+from qoa4ml.utils.procfs_reader import ProcfsReader
+
+
+class TrackedChild:
+    """
+    TrackedChild is a descendant of the monitored process, with its report slot and its last CPU time.
+    """
+
+    __slots__ = ("cpu_time", "process", "slot")
+
+    def __init__(self, process: psutil.Process, slot: int, cpu_time: float) -> None:
+        self.process = process
+        self.slot = slot
+        self.cpu_time = cpu_time
+
+
+class ProcessTreeTracker:
+    """
+    ProcessTreeTracker follows the CPU usage of a process and its descendants between samples.
+
+    Parameters
+    ----------
+    process : psutil.Process
+        The root process of the tree.
+    refresh_interval : float, optional
+        Seconds between two walks of the process tree looking for new descendants, default is 10.0. A zero interval
+        walks the tree on every sample.
+    reader : Optional[ProcfsReader], optional
+        Reads the CPU times of the root process from procfs instead of psutil, default is None.
+
+    Attributes
+    ----------
+    children : dict[int, TrackedChild]
+        The tracked descendants, keyed by PID.
+    last_refresh : float
+        The monotonic time of the last walk of the tree.
+    reported_exited_cpu_time : float
+        CPU time of exited descendants already reported, not yet found in the CPU times of reaped children.
+
+    Methods
+    -------
+    refresh()
+        Walk the tree, track the new descendants and forget the exited ones.
+    sample() -> dict
+        Get the CPU usage of the process and its descendants since the previous sample.
+
+    Notes
+    -----
+    - The tree is walked every `refresh_interval`, or on the next sample when a tracked descendant exited or a
+      direct child was reaped. Between walks, a sample only reads the CPU times of the known processes, each
+      within `oneshot()`.
+    - Usages are CPU percentages over the time since the previous sample, the first sample covers the time since
+      the tracker was created. A descendant created and exited between two samples isn't seen.
+    - A descendant keeps the `child_<slot>` key of its first sample until it exits, then its slot is reused, so
+      the report keys stay few and stable.
+    - The CPU time of reaped descendants not reported in their `child_<slot>` is reported as `reaped`, e.g. the
+      last moments of a descendant or one that exited between two samples.
+    """
+
+    def __init__(
+        self,
+        process: psutil.Process,
+        refresh_interval: float = 10.0,
+        reader: Optional[ProcfsReader] = None,
+    ) -> None:
+        self.process = process
+        self.refresh_interval = refresh_interval
+        self.reader = reader
+        self.children: dict[int, TrackedChild] = {}
+        self.free_slots: list[int] = []
+        self.stale = False
+        self.last_refresh = 0.0
+        self.reported_exited_cpu_time = 0.0
+        self.main_cpu_time, self.reaped_cpu_time = self.read_main()
+        self.last_sample = time.monotonic()
+        self.refresh()
+
+    def read_main(self) -> tuple[float, float]:
+        if self.reader is not None:
+            user, system, children_user, children_system = (
+                self.reader.process_cpu_times(self.process.pid)
+            )
+            return user + system, children_user + children_system
+        cpu_times = self.process.cpu_times()
+        return (
+            cpu_times.user + cpu_times.system,
+            cpu_times.children_user + cpu_times.children_system,
+        )
+
+    def next_slot(self) -> int:
+        if self.free_slots:
+            return self.free_slots.pop()
+        return len(self.children)
+
+    def untrack(self, pid: int) -> None:
+        child = self.children.pop(pid)
+        self.reported_exited_cpu_time += child.cpu_time
+        self.free_slots.append(child.slot)
+        # NOTE: the lowest free slot is reused first
+        self.free_slots.sort(reverse=True)
+
+    def refresh(self) -> None:
+        try:
+            descendants = self.process.children(recursive=True)
+        except psutil.NoSuchProcess:
+            descendants = []
+        current = {child.pid: child for child in descendants}
+        last_sample_time = time.time() - (time.monotonic() - self.last_sample)
+        for pid in [pid for pid in self.children if pid not in current]:
+            self.untrack(pid)
+        for pid, process in current.items():
+            if pid in self.children:
+                continue
+            try:
+                with process.oneshot():
+                    # NOTE: a descendant started since the last sample used all its CPU time within this interval
+                    created = process.create_time() >= last_sample_time
+                    cpu_times = process.cpu_times()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            cpu_time = 0.0 if created else cpu_times.user + cpu_times.system
+            self.children[pid] = TrackedChild(process, self.next_slot(), cpu_time)
+        self.stale = False
+        self.last_refresh = time.monotonic()
+
+    def sample(self) -> dict:
+        """
+        Get the CPU usage of the process and its descendants since the previous sample.
+
+        Returns
+        -------
+        dict
+            The number of tracked descendants, the usage of each descendant keyed by `child_<slot>`, the usage of
+            the process itself, of the descendants reaped since the previous sample and the total, in percentage
+            of one CPU.
+        """
+        now = time.monotonic()
+        main_cpu_time, reaped_cpu_time = self.read_main()
+        if reaped_cpu_time != self.reaped_cpu_time:
+            self.stale = True
+        if self.stale or now - self.last_refresh >= self.refresh_interval:
+            self.refresh()
+        elapsed = max(now - self.last_sample, 1e-9)
+
+        children_usage: dict[str, float] = {}
+        for pid, child in list(self.children.items()):
+            try:
+                with child.process.oneshot():
+                    cpu_times = child.process.cpu_times()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                self.untrack(pid)
+                self.stale = True
+                continue
+            cpu_time = cpu_times.user + cpu_times.system
+            children_usage[f"child_{child.slot}"] = (
+                max(cpu_time - child.cpu_time, 0.0) / elapsed * 100
+            )
+            child.cpu_time = cpu_time
+
+        main_usage = (main_cpu_time - self.main_cpu_time) / elapsed * 100
+        # NOTE: the CPU time of reaped descendants includes what their last samples already reported
+        reaped_cpu_time_delta = max(reaped_cpu_time - self.reaped_cpu_time, 0.0)
+        reported = min(reaped_cpu_time_delta, self.reported_exited_cpu_time)
+        self.reported_exited_cpu_time -= reported
+        reaped_usage = (reaped_cpu_time_delta - reported) / elapsed * 100
+        self.main_cpu_time = main_cpu_time
+        self.reaped_cpu_time = reaped_cpu_time
+        self.last_sample = now
+        return {
+            "child_process": len(children_usage),
+            "value": children_usage,
+            "main_process": main_usage,
+            "reaped": reaped_usage,
+            "total": main_usage + reaped_usage + sum(children_usage.values()),
+            "unit": "percentage",
+        }
@@ -0,0 +1,205 @@
+import os
+from typing import Optional, Union
+
+import numpy as np
+
+from qoa4ml.utils.logger import qoa_logger
+from qoa4ml.utils.qoa_utils import get_process_allowed_memory
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# NOTE: user, nice, system, idle, iowait, irq, softirq, steal, guest, guest_nice
+CPU_TIME_COLUMNS = 10
+MEMINFO_KEYS = (b"MemTotal:", b"MemFree:", b"MemAvailable:")
+# NOTE: indices in /proc/<pid>/stat after the command name, i.e. the field number minus 3
+STAT_UTIME, STAT_STIME, STAT_CUTIME, STAT_CSTIME = 11, 12, 13, 14
+STAT_VSIZE, STAT_RSS = 20, 21
+
+
+class PreadFile:
+    """
+    PreadFile is a file kept open and re-read from its start, so each read costs one system call.
+    """
+
+    __slots__ = ("fd", "path", "size")
+
+    def __init__(self, path: str, size: int = 4096) -> None:
+        self.path = path
+        self.size = size
+        self.fd = os.open(path, os.O_RDONLY)
+
+    def read(self) -> bytes:
+        while True:
+            data = os.pread(self.fd, self.size, 0)
+            if len(data) < self.size:
+                return data
+            self.size *= 2
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class ProcfsReader:
+    """
+    ProcfsReader reads process and system statistics from procfs and cgroupfs without psutil.
+
+    Parameters
+    ----------
+    root : str, optional
+        The procfs mount point, default is "/proc".
+    cgroup_root : str, optional
+        The cgroupfs mount point, default is "/sys/fs/cgroup".
+
+    Attributes
+    ----------
+    files : dict[str, PreadFile]
+        The files opened so far, keyed by path.
+    cpu_times : np.ndarray
+        The CPU times of each core at the last read, in clock ticks.
+    meminfo : np.ndarray
+        The `MEMINFO_KEYS` values at the last read, in kB.
+
+    Methods
+    -------
+    system_cpu_util() -> dict
+        Get the utilization of each core since the previous call, in percentage.
+    system_memory() -> dict
+        Get the total, free, available and used system memory in bytes.
+    process_cpu_times(pid: Union[int, str]) -> tuple[float, float, float, float]
+        Get the user, system, children user and children system CPU seconds of a process.
+    process_memory(pid: Union[int, str]) -> dict
+        Get the resident and virtual memory of a process in bytes.
+    memory_limit(pid: Union[int, str]) -> Optional[Union[float, str]]
+        Get the cgroup memory limit of a process.
+    close()
+        Close the open files.
+
+    Notes
+    -----
+    - Files are opened on first use and re-read with `os.pread`, values are parsed into arrays allocated once, so
+      sampling at a high frequency neither reopens files nor builds result objects like psutil does.
+    - The values match psutil's: per-core utilization excludes idle and iowait time, and used memory is the total
+      minus the available memory.
+    """
+
+    def __init__(
+        self, root: str = "/proc", cgroup_root: str = "/sys/fs/cgroup"
+    ) -> None:
+        self.root = root
+        self.cgroup_root = cgroup_root
+        self.files: dict[str, PreadFile] = {}
+        self.cpu_times = np.zeros((0, CPU_TIME_COLUMNS), dtype=np.int64)
+        self.previous_cpu_times = self.cpu_times.copy()
+        self.cpu_delta = self.cpu_times.copy()
+        self.meminfo = np.zeros(len(MEMINFO_KEYS), dtype=np.int64)
+        self.read_cpu_times()
+        self.previous_cpu_times = self.cpu_times.copy()
+
+    def read(self, path: str) -> bytes:
+        file = self.files.get(path)
+        if file is None:
+            file = PreadFile(path)
+            self.files[path] = file
+        return file.read()
+
+    def read_cpu_times(self) -> None:
+        data = self.read(os.path.join(self.root, "stat"))
+        # NOTE: the per-core lines follow the aggregated `cpu` line
+        start = data.index(b"\ncpu0") + 1
+        end = start
+        while data.startswith(b"cpu", end):
+            end = data.index(b"\n", end) + 1
+        fields = data[start:end].split()
+        cores = data.count(b"\ncpu", start - 1, end)
+        if cores != len(self.cpu_times):
+            # NOTE: a core went on or offline, the next utilization starts over
+            self.cpu_times = np.zeros((cores, CPU_TIME_COLUMNS), dtype=np.int64)
+            self.previous_cpu_times = self.cpu_times.copy()
+            self.cpu_delta = self.cpu_times.copy()
+        if len(fields) != cores * (CPU_TIME_COLUMNS + 1):
+            raise ValueError(f"Expected {CPU_TIME_COLUMNS} CPU times per core")
+        # NOTE: drop the `cpuN` labels, the values fill the preallocated array in place
+        del fields[:: CPU_TIME_COLUMNS + 1]
+        self.cpu_times.ravel()[:] = list(map(int, fields))
+
+    def system_cpu_util(self) -> dict:
+        self.previous_cpu_times, self.cpu_times = (
+            self.cpu_times,
+            self.previous_cpu_times,
+        )
+        self.read_cpu_times()
+        delta = np.subtract(self.cpu_times, self.previous_cpu_times, out=self.cpu_delta)
+        # NOTE: guest times are already counted in user and nice times
+        total = delta[:, :8].sum(axis=1)
+        busy = total - delta[:, 3] - delta[:, 4]
+        return {
+            f"core_{core_num}": round(
+                min(max(core_busy * 100.0 / core_total, 0.0), 100.0), 1
+            )
+            if core_total > 0
+            else 0.0
+            for core_num, (core_busy, core_total) in enumerate(
+                zip(busy.tolist(), total.tolist())
+            )
+        }
+
+    def system_memory(self) -> dict:
+        data = self.read(os.path.join(self.root, "meminfo"))
+        for index, key in enumerate(MEMINFO_KEYS):
+            start = data.find(key)
+            self.meminfo[index] = (
+                0
+                if start < 0
+                else int(data[start + len(key) : data.index(b"kB", start)])
+            )
+        total, free, available = (self.meminfo * 1024).tolist()
+        return {
+            "total": total,
+            "available": available,
+            "used": total - available,
+            "free": free,
+        }
+
+    def process_stat(self, pid: Union[int, str]) -> list[bytes]:
+        data = self.read(os.path.join(self.root, str(pid), "stat"))
+        # NOTE: the command name may hold spaces and parentheses
+        return data[data.rindex(b")") + 2 :].split()
+
+    def process_cpu_times(
+        self, pid: Union[int, str]
+    ) -> tuple[float, float, float, float]:
+        stat = self.process_stat(pid)
+        return (
+            int(stat[STAT_UTIME]) / CLOCK_TICKS,
+            int(stat[STAT_STIME]) / CLOCK_TICKS,
+            int(stat[STAT_CUTIME]) / CLOCK_TICKS,
+            int(stat[STAT_CSTIME]) / CLOCK_TICKS,
+        )
+
+    def process_memory(self, pid: Union[int, str]) -> dict:
+        stat = self.process_stat(pid)
+        return {"rss": int(stat[STAT_RSS]) * PAGE_SIZE, "vms": int(stat[STAT_VSIZE])}
+
+    def memory_limit(
+        self, pid: Union[int, str] = "self"
+    ) -> Optional[Union[float, str]]:
+        # NOTE: shares the cache of get_process_allowed_memory, read again when the limit or the tasks change
+        return get_process_allowed_memory(self.root, self.cgroup_root, str(pid))
+
+    def close(self) -> None:
+        for file in self.files.values():
+            file.close()
+        self.files = {}
+
+
+def create_procfs_reader(
+    root: str = "/proc", cgroup_root: str = "/sys/fs/cgroup"
+) -> Optional[ProcfsReader]:
+    """
+    Create a procfs reader, or return None so callers fall back to psutil when procfs can't be read.
+    """
+    try:
+        return ProcfsReader(root, cgroup_root)
+    except OSError as e:
+        qoa_logger.warning(f"Unable to read {root}, falling back to psutil: {e}")
+        return None
@@ -1,21 +1,21 @@
+import functools
 import glob
 import json
 import logging
 import os
 import pathlib
 import re
-import shlex
-import subprocess
 import sys
 import time
 import traceback
 from threading import Thread
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 import numpy as np
 import psutil
 import yaml
 
+from qoa4ml.lang.datamodel_enum import CgroupVersionEnum
 from qoa4ml.utils.logger import qoa_logger
 
 
@@ -45,36 +45,46 @@ def make_folder(temp_path: str) -> bool:
         return False
 
 
-def get_cgroup_version() -> str:
+@functools.cache
+def get_cgroup_version(proc_root: str = "/proc") -> CgroupVersionEnum:
     """
-    Retrieve the current cgroup version.
+    Retrieve the cgroup version managing the process.
+
+    Parameters
+    ----------
+    proc_root : str, optional
+        The procfs mount point, default is "/proc".
 
     Returns
     -------
-    str
-        The cgroup version ("v1" or "v2").
+    CgroupVersionEnum
+        The cgroup version, v1 if any controller is mounted on a cgroup v1 hierarchy.
 
     Notes
     -----
-    Uses subprocess to execute the `mount` command and grep for cgroup version.
-    """
-    proc1 = subprocess.Popen("mount", stdout=subprocess.PIPE)
-    proc2 = subprocess.Popen(
-        shlex.split("grep cgroup"),
-        stdin=proc1.stdout,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-    )
-    if proc1.stdout:
-        proc1.stdout.close()
-    out, _ = proc2.communicate()
-    return "v2" if "cgroup2" in out.decode() else "v1"
+    - Reads the filesystem types of the mounts in `/proc/self/mountinfo`, on first call only.
+    - Without mountinfo, falls back on v1, the layout of older systems.
+    """
+    filesystems = set()
+    try:
+        with open(os.path.join(proc_root, "self", "mountinfo")) as file:
+            for line in file:
+                # NOTE: the filesystem type follows the " - " separator of the optional fields
+                _, separator, rest = line.partition(" - ")
+                if separator:
+                    filesystems.add(rest.split(" ", 1)[0])
+    except OSError as e:
+        qoa_logger.warning(f"Unable to read the mounts, assuming cgroup v1: {e}")
+    if "cgroup2" in filesystems and "cgroup" not in filesystems:
+        return CgroupVersionEnum.v2
+    return CgroupVersionEnum.v1
 
 
-if get_cgroup_version() == "v2":
-    CGROUP_VERSION = "v2"
-else:
-    CGROUP_VERSION = "v1"
+def __getattr__(name: str) -> Any:
+    # NOTE: CGROUP_VERSION used to be detected at import, it is now detected on first use
+    if name == "CGROUP_VERSION":
+        return "v2" if get_cgroup_version() == CgroupVersionEnum.v2 else "v1"
+    raise AttributeError(f"module {__name__} has no attribute {name}")
 
 
 def set_logger_level(logging_level: int) -> None:
@@ -786,56 +796,129 @@ def get_process_allowed_cpus() -> list[int]:
     return list(affinity)
 
 
-def get_process_allowed_memory() -> Optional[float]:
+_memory_limit_files: dict[tuple[str, str, str], str] = {}
+
+
+def get_memory_limit_file(
+    proc_root: str = "/proc", cgroup_root: str = "/sys/fs/cgroup", pid: str = "self"
+) -> Optional[str]:
+    """
+    Find the file holding the cgroup memory limit of a process.
+
+    Parameters
+    ----------
+    proc_root : str, optional
+        The procfs mount point, default is "/proc".
+    cgroup_root : str, optional
+        The cgroupfs mount point, default is "/sys/fs/cgroup".
+    pid : str, optional
+        The process ID, default is the calling process.
+
+    Returns
+    -------
+    Optional[str]
+        The path of `memory.max` with cgroup v2 or `memory.limit_in_bytes` with cgroup v1, or None if the process
+        has no readable memory limit.
+
+    Notes
+    -----
+    - The limit of a job is set on its cgroup and shared by its `task_<n>` sub-cgroups, the file of the job cgroup
+      is returned for a process in a task sub-cgroup.
+    - The file found is cached on the cgroup membership of the process, i.e. the content of `/proc/<pid>/cgroup`,
+      so a process moved to another cgroup or a reused PID gets the right file. A missing file is looked for again.
+    """
+    try:
+        with open(os.path.join(proc_root, pid, "cgroup")) as file:
+            membership = file.read()
+    except OSError:
+        return None
+    key = (proc_root, cgroup_root, membership)
+    limit_file = _memory_limit_files.get(key)
+    if limit_file is None:
+        limit_file = find_memory_limit_file(proc_root, cgroup_root, membership)
+        if limit_file is not None:
+            _memory_limit_files[key] = limit_file
+    return limit_file
+
+
+def find_memory_limit_file(
+    proc_root: str, cgroup_root: str, membership: str
+) -> Optional[str]:
+    version = get_cgroup_version(proc_root)
+    for line in membership.splitlines():
+        parts = line.strip().split(":", 2)
+        if len(parts) != 3:
+            continue
+        hierarchy, controllers, cgroup_path = parts
+        cgroup_path = re.sub(r"/task_\d+", "", cgroup_path).lstrip("/")
+        if version == CgroupVersionEnum.v2 and hierarchy == "0":
+            limit_file = os.path.join(cgroup_root, cgroup_path, "memory.max")
+        elif version == CgroupVersionEnum.v1 and "memory" in controllers.split(","):
+            limit_file = os.path.join(
+                cgroup_root, "memory", cgroup_path, "memory.limit_in_bytes"
+            )
+        else:
+            continue
+        return limit_file if os.path.isfile(limit_file) else None
+    return None
+
+
+def count_cgroup_tasks(cgroup_dir: str) -> int:
+    return max(len(glob.glob(os.path.join(cgroup_dir, "task_*"))), 1)
+
+
+def parse_memory_limit(limit: str, number_of_tasks: int) -> Union[float, str]:
+    limit = limit.strip()
+    try:
+        return int(limit) / number_of_tasks
+    except ValueError:
+        # NOTE: "max" with cgroup v2 when there is no limit
+        return limit
+
+
+_memory_limit_cache: dict[str, tuple[tuple[int, int], Union[float, str]]] = {}
+
+
+def get_process_allowed_memory(
+    proc_root: str = "/proc", cgroup_root: str = "/sys/fs/cgroup", pid: str = "self"
+) -> Optional[Union[float, str]]:
     """
-    Retrieve the memory limit allowed to the process.
+    Retrieve the memory limit allowed to a process.
+
+    Parameters
+    ----------
+    proc_root : str, optional
+        The procfs mount point, default is "/proc".
+    cgroup_root : str, optional
+        The cgroupfs mount point, default is "/sys/fs/cgroup".
+    pid : str, optional
+        The process ID, default is the calling process.
 
     Returns
     -------
-    Optional[float]
-        The memory limit in bytes, or None if unable to retrieve.
+    Optional[Union[float, str]]
+        The memory limit in bytes shared among the tasks of the job, the limit as written if it isn't a number,
+        or None if unable to retrieve.
 
     Notes
     -----
     - Supports both cgroup v1 and v2 formats to get the memory limit.
+    - The limit is cached, and read again only when the modification time of the limit file or of its cgroup
+      directory changes, i.e. when the limit is set or a task is added or removed.
     """
-    if CGROUP_VERSION == "v1":
-        with open("/proc/self/cgroup") as file:
-            for line in file:
-                parts = line.strip().split(":")
-                if len(parts) == 3 and parts[1] == "memory":
-                    cgroup_path = parts[2]
-                    memory_limit_file = re.sub(r"/task_\d+", "", cgroup_path)
-
-                    number_of_tasks = len(
-                        glob.glob(f"/sys/fs/cgroup/memory{memory_limit_file}/task_*")
-                    )
-
-                    with open(
-                        f"/sys/fs/cgroup/memory{memory_limit_file}/memory.limit_in_bytes"
-                    ) as limit_file:
-                        memory_limit_str = limit_file.read().strip()
-                        try:
-                            memory_limit_int = int(memory_limit_str)
-                            return memory_limit_int / number_of_tasks
-                        except ValueError:
-                            return memory_limit_str
-            return None
-    else:
-        with open("/proc/self/cgroup") as file:
-            for line in file:
-                parts = line.strip().split(":")
-                cgroup_path = parts[2]
-                pattern = r"/task_\d+"
-                cgroup_path = re.sub(pattern, "", cgroup_path)
-                with open(f"/sys/fs/cgroup{cgroup_path}/memory.max") as limit_file:
-                    number_of_tasks = len(
-                        glob.glob(f"/sys/fs/cgroup{cgroup_path}/task_*")
-                    )
-                    memory_limit_str = limit_file.read().strip()
-                    try:
-                        memory_limit_int = int(memory_limit_str)
-                        return memory_limit_int / number_of_tasks
-                    except ValueError:
-                        return memory_limit_str
-            return None
+    limit_file = get_memory_limit_file(proc_root, cgroup_root, pid)
+    if limit_file is None:
+        return None
+    cgroup_dir = os.path.dirname(limit_file)
+    try:
+        mtimes = (os.stat(limit_file).st_mtime_ns, os.stat(cgroup_dir).st_mtime_ns)
+        cached = _memory_limit_cache.get(limit_file)
+        if cached is not None and cached[0] == mtimes:
+            return cached[1]
+        with open(limit_file) as file:
+            limit = parse_memory_limit(file.read(), count_cgroup_tasks(cgroup_dir))
+    except OSError as e:
+        qoa_logger.warning(f"Unable to read the memory limit in {limit_file}: {e}")
+        return None
+    _memory_limit_cache[limit_file] = (mtimes, limit)
+    return limit
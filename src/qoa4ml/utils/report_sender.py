@@ -0,0 +1,214 @@
+import queue
+import threading
+import time
+import weakref
+from typing import Optional
+
+from qoa4ml.config.configs import ReportSenderConfig
+from qoa4ml.connector.base_connector import BaseConnector
+from qoa4ml.utils.bounded_queue import STOP, BoundedQueue, CounterMixin
+from qoa4ml.utils.logger import qoa_logger
+
+
+class ReportSender(CounterMixin):
+    """
+    ReportSender sends reports through connectors from long-lived background threads fed by a bounded queue.
+
+    Parameters
+    ----------
+    config : ReportSenderConfig
+        Configuration settings for the queue and the sender threads.
+    connectors : dict[str, BaseConnector]
+        The connectors reports can be sent through, keyed by connector name.
+
+    Attributes
+    ----------
+    queue : BoundedQueue
+        Bounded queue of (connector name, report) waiting to be sent.
+    sent : int
+        Number of reports handed to a connector successfully.
+    dropped : int
+        Number of reports dropped because the queue was full.
+    failed : int
+        Number of reports whose connector raised while sending.
+
+    Methods
+    -------
+    submit(connector_name: str, body_message: str) -> bool
+        Queue a report for a connector, applying the overflow policy when the queue is full.
+    flush(timeout: Optional[float] = None) -> bool
+        Wait until every queued report has been sent.
+    close(timeout: Optional[float] = None) -> None
+        Send the remaining reports and stop the sender threads.
+    """
+
+    def __init__(
+        self, config: ReportSenderConfig, connectors: dict[str, BaseConnector]
+    ) -> None:
+        self.config = config
+        self.connectors = connectors
+        self.connector_locks = {name: threading.Lock() for name in connectors}
+        self.queue = BoundedQueue(
+            config.queue_size, config.overflow_policy, config.block_timeout
+        )
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self.closed = False
+        self.stats_lock = threading.Lock()
+        # NOTE: the threads only hold a weak reference, so an unused sender is collected and its threads stopped
+        self.workers = [
+            threading.Thread(
+                target=run_sender,
+                args=(self.queue, weakref.ref(self), config.batch_size),
+                daemon=True,
+                name=f"qoa-report-sender-{i}",
+            )
+            for i in range(config.num_workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+        self.finalizer = weakref.finalize(
+            self, stop_sender, self.queue, self.workers, config.shutdown_timeout
+        )
+
+    def submit(self, connector_name: str, body_message: str) -> bool:
+        """
+        Queue a report for a connector, applying the overflow policy when the queue is full.
+
+        Parameters
+        ----------
+        connector_name : str
+            The name of the connector to send the report through.
+        body_message : str
+            The report to be sent.
+
+        Returns
+        -------
+        bool
+            True if the report was queued, False if it was dropped.
+        """
+        if self.closed:
+            qoa_logger.warning("Report sender is closed, dropping report")
+            self._count("dropped")
+            return False
+        if connector_name not in self.connectors:
+            qoa_logger.error(f"Unknown connector {connector_name}, dropping report")
+            self._count("dropped")
+            return False
+
+        queued, dropped = self.queue.offer((connector_name, body_message))
+        if dropped:
+            self._count("dropped", dropped)
+        return queued
+
+    def _send_batch(self, batch: list[tuple[str, str]]) -> None:
+        per_connector: dict[str, list[str]] = {}
+        for connector_name, body_message in batch:
+            per_connector.setdefault(connector_name, []).append(body_message)
+
+        for connector_name, body_messages in per_connector.items():
+            try:
+                with self.connector_locks[connector_name]:
+                    self.connectors[connector_name].send_report_batch(body_messages)
+                self._count("sent", len(body_messages))
+            except Exception as e:
+                self._count("failed", len(body_messages))
+                qoa_logger.exception(
+                    f"Error {type(e)} when sending {len(body_messages)} reports through {connector_name}"
+                )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued report has been sent.
+
+        Parameters
+        ----------
+        timeout : Optional[float], optional
+            Maximum seconds to wait, None waits until the queue is drained.
+
+        Returns
+        -------
+        bool
+            True if the queue was drained within the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Send the remaining reports and stop the sender threads.
+
+        Parameters
+        ----------
+        timeout : Optional[float], optional
+            Maximum seconds to wait for queued reports, default is `shutdown_timeout` from the config.
+
+        Notes
+        -----
+        Called automatically at interpreter exit, or when the sender is garbage collected. Reports still queued
+        after the timeout are lost.
+        """
+        self.closed = True
+        if self.finalizer.detach() is None:
+            return
+        stop_sender(
+            self.queue,
+            self.workers,
+            self.config.shutdown_timeout if timeout is None else timeout,
+        )
+
+
+def run_sender(
+    items: BoundedQueue, sender_ref: "weakref.ref[ReportSender]", batch_size: int
+) -> None:
+    while True:
+        item = items.get()
+        if item is STOP:
+            items.task_done()
+            return
+        batch = [item]
+        stop = False
+        while len(batch) < batch_size:
+            try:
+                next_item = items.get_nowait()
+            except queue.Empty:
+                break
+            if next_item is STOP:
+                stop = True
+                break
+            batch.append(next_item)
+
+        sender = sender_ref()
+        if sender is not None:
+            sender._send_batch(batch)
+            # NOTE: release the sender before waiting for the next reports
+            del sender
+        for _ in range(len(batch) + stop):
+            items.task_done()
+        if stop:
+            return
+
+
+def stop_sender(
+    items: BoundedQueue, workers: list[threading.Thread], timeout: float
+) -> None:
+    deadline = time.monotonic() + timeout
+    for _ in workers:
+        try:
+            items.stop(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Full:
+            break
+    for worker in workers:
+        # NOTE: the last reference to a sender may be released by one of its threads
+        if worker is not threading.current_thread():
+            worker.join(max(deadline - time.monotonic(), 0))
+    pending = items.qsize()
+    if pending:
+        qoa_logger.warning(f"Report sender closed with {pending} unsent reports")
@@ -0,0 +1,152 @@
+import threading
+
+from qoa4ml.collector.host_object import BatchHostObject, HostObject
+from qoa4ml.collector.kafka_collector import KafkaCollector
+from qoa4ml.config.configs import KafkaCollectorConfig
+
+
+class FakeMessage:
+    def __init__(self, partition: int, offset: int):
+        self._partition = partition
+        self._offset = offset
+
+    def error(self):
+        return None
+
+    def topic(self):
+        return "reports"
+
+    def partition(self):
+        return self._partition
+
+    def offset(self):
+        return self._offset
+
+    def headers(self):
+        return None
+
+    def value(self):
+        return f'{{"partition": {self._partition}, "offset": {self._offset}}}'.encode()
+
+
+class FakeConsumer:
+    def __init__(self, messages: list):
+        self.all_messages = list(messages)
+        self.messages = messages
+        self.collector_stop = None
+        self.commits = 0
+        self.committed = {}
+        self.closed = False
+
+    def subscribe(self, topics):
+        self.topics = topics
+
+    def consume(self, num_messages, timeout):
+        batch, self.messages = (
+            self.messages[:num_messages],
+            self.messages[num_messages:],
+        )
+        if not batch:
+            self.collector_stop()
+        return batch
+
+    def commit(self, offsets=None, asynchronous=True):
+        self.commits += 1
+        for offset in offsets:
+            self.committed[offset.partition] = offset.offset
+
+    def seek(self, partition):
+        replayed = [
+            message
+            for message in self.all_messages
+            if message.partition() == partition.partition
+            and message.offset() >= partition.offset
+            and message not in self.messages
+        ]
+        self.messages = replayed + self.messages
+
+    def get_watermark_offsets(self, partition, cached=False):
+        return 0, 20
+
+    def close(self):
+        self.closed = True
+
+
+class RecordingHost(HostObject):
+    def __init__(self):
+        self.received = []
+        self.lock = threading.Lock()
+
+    def message_processing(self, ch, method, props, body):
+        with self.lock:
+            self.received.append((method.partition(), method.offset()))
+
+
+class FailingHost(RecordingHost):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def message_processing(self, ch, method, props, body):
+        key = (method.partition(), method.offset())
+        if self.failures.get(key, 0):
+            self.failures[key] -= 1
+            raise ValueError("processing failed")
+        super().message_processing(ch, method, props, body)
+
+
+class RecordingBatchHost(BatchHostObject):
+    def __init__(self):
+        self.batches = []
+
+    def batch_processing(self, messages):
+        self.batches.append(len(messages))
+
+
+def make_collector(host, num_messages):
+    config = KafkaCollectorConfig(
+        topic="reports", broker_url="fake", group_id="test", batch_size=10
+    )
+    messages = [FakeMessage(i % 2, i // 2) for i in range(num_messages)]
+    consumer = FakeConsumer(messages)
+    collector = KafkaCollector(config, host, consumer=consumer)
+    consumer.collector_stop = collector.stop
+    return collector
+
+
+def test_messages_are_dispatched_in_partition_order_and_committed():
+    host = RecordingHost()
+    collector = make_collector(host, 30)
+    collector.start_collecting()
+
+    for partition in (0, 1):
+        offsets = [offset for p, offset in host.received if p == partition]
+        assert offsets == list(range(15))
+    assert collector.consumer.commits == 3
+    assert collector.consumer.closed
+    metrics = collector.get_metrics()
+    assert metrics["consumed"] == 30 and metrics["failed"] == 0
+    assert metrics["lag"] == {"reports[0]": 5, "reports[1]": 5}
+
+
+def test_batch_host_receives_messages_per_partition():
+    host = RecordingBatchHost()
+    collector = make_collector(host, 20)
+    collector.start_collecting()
+    assert sorted(host.batches) == [5, 5, 5, 5]
+    assert collector.get_metrics()["batches"] == 2
+
+
+def test_failed_messages_are_redelivered_then_dropped():
+    # NOTE: (0, 2) succeeds on its second attempt, (1, 1) fails more than max_retries times
+    host = FailingHost({(0, 2): 1, (1, 1): 5})
+    collector = make_collector(host, 10)
+    collector.start_collecting()
+
+    assert [offset for p, offset in host.received if p == 0] == [0, 1, 2, 3, 4]
+    assert [offset for p, offset in host.received if p == 1] == [0, 2, 3, 4]
+    assert collector.consumer.committed == {0: 5, 1: 5}
+    metrics = collector.get_metrics()
+    assert metrics["consumed"] == 9
+    assert metrics["dropped"] == 1
+    assert metrics["failed"] == 5
@@ -0,0 +1,142 @@
+import pika
+import pytest
+
+from qoa4ml.config.configs import AMQPConnectorConfig
+from qoa4ml.connector import amqp_connector
+from qoa4ml.connector.amqp_connector import AmqpConnector
+
+
+class FakeChannel:
+    def __init__(self):
+        self.is_open = True
+        self.published = []
+        self.confirm = False
+
+    def exchange_declare(self, exchange, exchange_type):
+        pass
+
+    def confirm_delivery(self):
+        self.confirm = True
+
+    def basic_publish(self, exchange, routing_key, properties, body):
+        self.published.append(body)
+
+
+class FakeBlockingConnection:
+    opened = 0
+    attempts = 0
+    refused = False
+
+    def __init__(self, parameters):
+        FakeBlockingConnection.attempts += 1
+        if FakeBlockingConnection.refused:
+            raise pika.exceptions.AMQPConnectionError("refused")
+        FakeBlockingConnection.opened += 1
+        self.is_open = True
+        self.out_channel = FakeChannel()
+
+    def channel(self):
+        return self.out_channel
+
+    def close(self):
+        self.is_open = False
+        self.out_channel.is_open = False
+
+
+def make_connector(monkeypatch, **kwargs):
+    FakeBlockingConnection.opened = 0
+    FakeBlockingConnection.attempts = 0
+    FakeBlockingConnection.refused = False
+    monkeypatch.setattr(
+        amqp_connector.pika, "BlockingConnection", FakeBlockingConnection
+    )
+    config = AMQPConnectorConfig(
+        end_point="localhost",
+        exchange_name="qoa4ml",
+        exchange_type="topic",
+        out_routing_key="qoa.report.ml",
+        **kwargs,
+    )
+    return AmqpConnector(config)
+
+
+def test_persistent_connection_is_reused(monkeypatch):
+    connector = make_connector(monkeypatch)
+    for i in range(100):
+        connector.send_report(f"report {i}")
+    assert FakeBlockingConnection.opened == 1
+    assert len(connector.out_channel.published) == 100
+
+
+def test_reconnect_only_when_connection_closed(monkeypatch):
+    connector = make_connector(monkeypatch)
+    connector.send_report("first")
+    connector.out_connection.close()
+    connector.send_report("second")
+    connector.send_report("third")
+    assert FakeBlockingConnection.opened == 2
+    assert connector.out_channel.published == ["second", "third"]
+
+
+def test_reconnect_when_publish_fails(monkeypatch):
+    connector = make_connector(monkeypatch)
+    channel = connector.out_channel
+
+    def lose_connection(exchange, routing_key, properties, body):
+        connector.out_connection.is_open = False
+        raise pika.exceptions.StreamLostError("lost")
+
+    channel.basic_publish = lose_connection
+    connector.send_report("report")
+    assert FakeBlockingConnection.opened == 2
+    assert connector.out_channel.published == ["report"]
+
+
+def test_unconfirmed_reports_are_republished(monkeypatch):
+    connector = make_connector(
+        monkeypatch, publisher_confirms=True, reconnect_backoff=0.0
+    )
+    assert connector.out_channel.confirm
+    connector.send_report("first")
+    connector.out_connection.close()
+
+    # NOTE: a failed reconnect keeps the report instead of raising
+    FakeBlockingConnection.refused = True
+    for report in ("second", "third"):
+        connector.send_report(report)
+    assert len(connector.unconfirmed) == 2
+
+    FakeBlockingConnection.refused = False
+    connector.send_report("fourth")
+    assert connector.out_channel.published == ["second", "third", "fourth"]
+    assert not connector.unconfirmed
+
+
+def test_reconnect_backs_off_and_bounds_the_queued_reports(monkeypatch):
+    connector = make_connector(monkeypatch, max_unconfirmed=2, reconnect_backoff=60)
+    connector.out_connection.close()
+    FakeBlockingConnection.refused = True
+    for i in range(3):
+        connector.send_report(f"report {i}")
+    # NOTE: the first failure delays the next attempt, the other reports are only queued
+    assert FakeBlockingConnection.attempts == 2
+    assert [body for _, _, body in connector.unconfirmed] == ["report 1", "report 2"]
+    assert connector.dropped == 1
+
+
+def test_connection_per_report(monkeypatch):
+    connector = make_connector(monkeypatch, persistent_connection=False)
+    for i in range(5):
+        connector.send_report(f"report {i}")
+    assert FakeBlockingConnection.opened == 6
+    assert not connector.check_connection()
+
+    def fail(self, exchange, routing_key, properties, body):
+        raise pika.exceptions.UnroutableError([])
+
+    monkeypatch.setattr(FakeChannel, "basic_publish", fail)
+    with pytest.raises(pika.exceptions.UnroutableError):
+        connector.send_report("unroutable")
+    # NOTE: the connection opened for the report is closed even though it failed
+    assert not connector.out_connection.is_open
+    assert not connector.unconfirmed
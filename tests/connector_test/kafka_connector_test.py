@@ -0,0 +1,73 @@
+import threading
+
+from qoa4ml.config.configs import KafkaConnectorConfig
+from qoa4ml.connector.kafka_connector import KafkaConnector
+
+
+class FakeMessage:
+    def latency(self):
+        return 0.01
+
+
+class FakeProducer:
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self.queued = []
+        self.produced = []
+        self.flushes = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.queued)
+
+    def produce(self, topic, value, on_delivery):
+        with self.lock:
+            if len(self.queued) >= self.capacity:
+                raise BufferError("Local: Queue full")
+            self.queued.append((value, on_delivery))
+
+    def poll(self, timeout=None):
+        with self.lock:
+            queued, self.queued = self.queued, []
+        for value, on_delivery in queued:
+            self.produced.append(value)
+            on_delivery(None, FakeMessage())
+        return len(queued)
+
+    def flush(self, timeout=None):
+        self.flushes += 1
+        self.poll()
+        return len(self.queued)
+
+
+config = KafkaConnectorConfig(topic="reports", broker_url="localhost:9092")
+
+
+def test_reports_are_not_flushed_per_message():
+    producer = FakeProducer()
+    connector = KafkaConnector(config, producer=producer)
+    for i in range(10):
+        connector.send_report(f'{{"index": {i}}}')
+    assert producer.flushes == 0
+    connector.close()
+    assert producer.flushes == 1
+    assert len(producer.produced) == 10
+    stats = connector.get_delivery_stats()
+    assert stats["delivered"] == 10 and stats["failed"] == 0
+    assert stats["queued"] == 0
+    assert stats["max_latency"] == 0.01
+
+
+def test_full_queue_is_drained_before_dropping():
+    producer = FakeProducer(capacity=1)
+    connector = KafkaConnector(
+        config.model_copy(update={"synchronous": True}), producer=producer
+    )
+    connector.send_report("first")
+    assert producer.flushes == 1
+    producer.queued.append((b"stuck", lambda err, msg: None))
+    producer.poll = lambda timeout=None: 0
+    connector.send_report("dropped")
+    assert connector.failed == 1
+    producer.queued.clear()
+    connector.close()
@@ -0,0 +1,146 @@
+import json
+import socket
+import threading
+import time
+
+from qoa4ml.collector.socket_collector import SocketCollector
+from qoa4ml.config.configs import SocketCollectorConfig, SocketConnectorConfig
+from qoa4ml.connector.socket_connector import SocketConnector
+from qoa4ml.utils.framing import FrameReader, encode_frame
+
+
+class ChunkedSocket:
+    def __init__(self, data: bytes, chunk: int):
+        self.chunks = [data[i : i + chunk] for i in range(0, len(data), chunk)]
+
+    def recv_into(self, view) -> int:
+        if not self.chunks:
+            return 0
+        chunk = self.chunks.pop(0)
+        view[: len(chunk)] = chunk
+        return len(chunk)
+
+
+def test_frame_reader_reassembles_split_and_large_frames():
+    messages = ["a", json.dumps({"value": "é" * 50}), "b" * 100]
+    sock = ChunkedSocket(b"".join(encode_frame(m) for m in messages), chunk=7)
+    reader = FrameReader(bufsize=16, max_frame_size=1024)
+    received = []
+    while (frames := reader.read(sock)) is not None:
+        received.extend(frames)
+    assert received == messages
+
+
+def test_reports_are_pipelined_on_one_connection():
+    received = []
+    collector = SocketCollector(
+        SocketCollectorConfig(host="127.0.0.1", port=0, backlog=5, bufsize=64),
+        received.append,
+    )
+    server = threading.Thread(target=collector.start_collecting, daemon=True)
+    server.start()
+    assert collector.ready.wait(5)
+    port = collector.server_socket.getsockname()[1]
+
+    connector = SocketConnector(SocketConnectorConfig(host="127.0.0.1", port=port))
+    reports = [json.dumps({"type": "system", "index": i}) for i in range(50)]
+    for report in reports[:10]:
+        connector.send_report(report)
+    first_socket = connector.client_socket
+    connector.send_report_batch(reports[10:])
+    assert connector.client_socket is first_socket
+
+    deadline = time.time() + 5
+    while len(received) < len(reports) and time.time() < deadline:
+        time.sleep(0.01)
+    connector.close()
+    collector.stop()
+    server.join(5)
+    assert received == reports
+
+
+def test_connector_reconnects_after_the_connection_broke():
+    received = []
+    collector = SocketCollector(
+        SocketCollectorConfig(host="127.0.0.1", port=0, backlog=5, bufsize=64),
+        received.append,
+    )
+    threading.Thread(target=collector.start_collecting, daemon=True).start()
+    assert collector.ready.wait(5)
+    port = collector.server_socket.getsockname()[1]
+
+    connector = SocketConnector(SocketConnectorConfig(host="127.0.0.1", port=port))
+    connector.send_report("first")
+    connector.client_socket.shutdown(socket.SHUT_RDWR)
+    connector.send_report("second")
+
+    deadline = time.time() + 5
+    while len(received) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    connector.close()
+    collector.stop()
+    assert received == ["first", "second"]
+
+
+def test_slow_processing_fills_the_queue_without_blocking_reads():
+    release = threading.Event()
+    collector = SocketCollector(
+        SocketCollectorConfig(
+            host="127.0.0.1",
+            port=0,
+            backlog=5,
+            bufsize=64,
+            queue_size=2,
+            overflow_policy="drop_newest",
+        ),
+        lambda report: release.wait(5),
+    )
+    server = threading.Thread(target=collector.start_collecting, daemon=True)
+    server.start()
+    assert collector.ready.wait(5)
+    port = collector.server_socket.getsockname()[1]
+
+    connector = SocketConnector(SocketConnectorConfig(host="127.0.0.1", port=port))
+    connector.send_report_batch([str(i) for i in range(10)])
+    deadline = time.time() + 5
+    while collector.get_stats()["received"] < 10 and time.time() < deadline:
+        time.sleep(0.01)
+    stats = collector.get_stats()
+    assert stats["connections"] == 1
+    assert stats["queue_depth"] <= 2
+    assert stats["dropped"] >= 7
+
+    release.set()
+    connector.close()
+    collector.stop()
+    server.join(5)
+    stats = collector.get_stats()
+    assert stats["processed"] == 10 - stats["dropped"]
+
+
+def test_connector_reconnects_after_the_peer_closed():
+    server_socket = socket.create_server(("127.0.0.1", 0))
+    received = []
+
+    def serve():
+        for _ in range(2):
+            client_socket, _ = server_socket.accept()
+            reader = FrameReader(bufsize=64, max_frame_size=1024)
+            received.extend(reader.read(client_socket) or [])
+            # NOTE: the server closes its side after each report
+            client_socket.close()
+
+    server = threading.Thread(target=serve, daemon=True)
+    server.start()
+    port = server_socket.getsockname()[1]
+    connector = SocketConnector(SocketConnectorConfig(host="127.0.0.1", port=port))
+    connector.send_report("first")
+    deadline = time.time() + 5
+    while not received and time.time() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    connector.send_report("second")
+    server.join(5)
+    connector.close()
+    server_socket.close()
+    assert received == ["first", "second"]
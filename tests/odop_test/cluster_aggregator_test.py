@@ -0,0 +1,136 @@
+import socket
+import threading
+import time
+
+import numpy as np
+import pytest
+import requests
+import uvicorn
+
+from qoa4ml.config.configs import ClusterAggregatorConfig, NodeAggregatorConfig
+from qoa4ml.observability.odop_obs.cluster_aggregator import ClusterAggregator
+from qoa4ml.observability.odop_obs.node_aggregator import NodeAggregator
+from qoa4ml.observability.odop_obs.sketch import QuantileSketch
+from qoa4ml.observability.odop_obs.summary import SUMMARIES_URL_PATH, FieldSummary
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def cluster_url():
+    port = free_port()
+    cluster = ClusterAggregator(ClusterAggregatorConfig(host="127.0.0.1", port=port))
+    server = uvicorn.Server(
+        uvicorn.Config(cluster.app, host="127.0.0.1", port=port, log_level="error")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join()
+
+
+def test_cluster_queries_merge_node_summaries(tmp_path, cluster_url):
+    now = time.time()
+    for index in range(3):
+        aggregator = NodeAggregator(
+            NodeAggregatorConfig(
+                socket_collector_config={
+                    "host": "127.0.0.1",
+                    "port": 0,
+                    "backlog": 5,
+                    "bufsize": 4096,
+                },
+                environment="HPC",
+                query_method="GET",
+                data_separator="dot",
+                unit_conversion={"cpu": {"usage": {"percentage": 3}}},
+                database_backend="columnar",
+                cluster_aggregator_url=cluster_url,
+                summary_interval=30,
+            ),
+            tmp_path / f"node-{index}",
+        )
+        aggregator.summary_pusher.node_name = f"node-{index}"
+        aggregator.embedded_database.insert_multiple(
+            [
+                (
+                    now - 20 + i,
+                    {"type": "process", "metadata.pid": str(pid)},
+                    {"cpu.usage.value": float(100 * index + i), "cpu.usage.unit": 3},
+                )
+                for i in range(10)
+                for pid in (1, 2)
+            ]
+        )
+        assert aggregator.summary_pusher.push_once(now + 1)
+        aggregator.embedded_database.close()
+
+    nodes = requests.get(f"{cluster_url}/cluster/nodes", timeout=5).json()
+    assert sorted(nodes) == ["node-0", "node-1", "node-2"]
+
+    def aggregate(**params):
+        response = requests.get(
+            f"{cluster_url}/cluster/aggregate",
+            params={"window": 60, **params},
+            timeout=5,
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    (cluster,) = aggregate(function="MAX")
+    assert cluster["count"]["cpu"]["usage"]["value"] == 60
+    assert cluster["fields"]["cpu"]["usage"] == {"value": 209.0, "unit": "percentage"}
+    (cluster,) = aggregate(function="AVERAGE")
+    assert cluster["fields"]["cpu"]["usage"]["value"] == pytest.approx(104.5)
+
+    per_node = aggregate(function="MIN", group_by=["node"], tags=["metadata.pid=2"])
+    assert {
+        group["tags"]["node"]: group["fields"]["cpu"]["usage"]["value"]
+        for group in per_node
+    } == {"node-0": 0.0, "node-1": 100.0, "node-2": 200.0}
+    assert all(group["count"]["cpu"]["usage"]["value"] == 10 for group in per_node)
+
+    (cluster,) = aggregate(function="PERCENTILE", percentile=50)
+    assert cluster["fields"]["cpu"]["usage"]["value"] == pytest.approx(104.0, rel=0.02)
+
+
+def test_sketch_quantiles_are_within_relative_accuracy():
+    values = np.random.default_rng(0).lognormal(size=10_000)
+    merged = QuantileSketch(0.01)
+    for part in np.array_split(values, 4):
+        sketch = QuantileSketch(0.01)
+        sketch.add(part)
+        merged.merge(QuantileSketch.from_dict(sketch.to_dict()))
+    for q in (0.01, 0.5, 0.99):
+        expected = np.quantile(values, q, method="lower")
+        assert merged.quantile(q) == pytest.approx(expected, rel=0.011)
+
+
+def test_resent_summaries_replace_the_stored_ones(cluster_url):
+    now = time.time()
+
+    def push(relative_accuracy):
+        field = FieldSummary.from_values(np.array([1.0, 2.0]), relative_accuracy)
+        summary = {
+            "node": "node-0",
+            "start": now - 10,
+            "end": now,
+            "series": [{"tags": {"type": "node"}, "fields": {"cpu": field.to_dict()}}],
+        }
+        return requests.post(
+            f"{cluster_url}{SUMMARIES_URL_PATH}", json=summary, timeout=5
+        )
+
+    assert push(0.01).status_code == 200
+    assert push(0.01).status_code == 200
+    nodes = requests.get(f"{cluster_url}/cluster/nodes", timeout=5).json()
+    assert nodes["node-0"]["summaries"] == 1
+
+    assert push(0.05).status_code == 400
@@ -0,0 +1,91 @@
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from qoa4ml.observability.odop_obs import columnar_database
+from qoa4ml.observability.odop_obs.columnar_database import ColumnarDatabase
+
+
+def test_range_query_spans_segments_and_buffer(tmp_path):
+    database = ColumnarDatabase(tmp_path / "node", segment_size=4)
+    start = time.time() - 100
+    for i in range(10):
+        database.insert(start + i, {"type": "node", "node_name": "a"}, {"cpu": i})
+        database.insert(start + i, {"type": "process", "pid": "1"}, {"cpu": -i})
+    assert len(database.series[(("node_name", "a"), ("type", "node"))].segments) == 2
+
+    (node,) = database.query_range(start + 2, start + 8.5, {"type": "node"})
+    assert node.fields["cpu"].tolist() == list(range(2, 9))
+    assert np.all(np.diff(node.timestamps) > 0)
+
+    (process,) = database.query_range(start + 1, start + 2, {"pid": 1})
+    assert process.fields["cpu"].tolist() == [-1, -2]
+
+
+def test_segments_are_memory_mapped_and_reloaded(tmp_path):
+    database = ColumnarDatabase(tmp_path / "node", segment_size=5)
+    start = time.time() - 10
+    for i in range(5):
+        database.insert(start + i, {"type": "node"}, {"cpu": float(i)})
+    (series,) = database.query_range(start, start + 10)
+    assert isinstance(series.fields["cpu"].base, np.memmap)
+
+    database.insert(start + 5, {"type": "node"}, {"cpu": 5.0, "mem": 1.0})
+    database.close()
+    reopened = ColumnarDatabase(tmp_path / "node")
+    (series,) = reopened.query_range(start, start + 10)
+    assert series.fields["cpu"].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+    assert np.isnan(series.fields["mem"][:5]).all()
+    (latest,) = reopened.get_lastest_timestamp()
+    assert latest.fields == {"cpu": 5.0, "mem": 1.0}
+
+
+def test_failed_segment_write_keeps_the_points_buffered(tmp_path, monkeypatch):
+    database = ColumnarDatabase(tmp_path / "node", segment_size=2)
+    start = time.time() - 10
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(columnar_database, "write_columns", fail)
+    database.insert_multiple(
+        [(start + i, {"type": "node"}, {"cpu": float(i)}) for i in range(3)]
+    )
+    monkeypatch.undo()
+    database.flush()
+    (series,) = database.query_range(start, start + 10)
+    assert series.fields["cpu"].tolist() == [0.0, 1.0, 2.0]
+
+
+def test_memory_maps_are_bounded_and_expired_series_pruned(tmp_path):
+    database = ColumnarDatabase(tmp_path / "node", segment_size=2, max_open_segments=2)
+    start = time.time() - 100
+    database.insert(start, {"type": "process", "pid": "1"}, {"cpu": 1.0})
+    for i in range(10):
+        database.insert(start + 50 + i, {"type": "node"}, {"cpu": float(i)})
+    (series,) = database.query_range(start + 50, start + 60, {"type": "node"})
+    assert series.fields["cpu"].tolist() == [float(i) for i in range(10)]
+    segments = database.series[(("type", "node"),)].segments
+    assert sum(segment.columns is not None for segment in segments) == 2
+
+    database.remove_before(start + 10)
+    (latest,) = database.get_lastest_timestamp()
+    assert latest.tags == {"type": "node"}
+
+
+def test_non_numeric_fields_are_dropped(tmp_path):
+    database = ColumnarDatabase(tmp_path / "node", segment_size=2)
+    start = 1_700_000_000.0
+    database.insert_multiple(
+        [
+            (start, {"type": "node"}, {"cpu": 1.0, "state": "running"}),
+            (start + 1, {"type": "node"}, {"cpu": 2.0, "mem": 10**400}),
+        ]
+    )
+    (series,) = database.query_range(start, start + 1)
+    assert series.fields["cpu"].tolist() == [1.0, 2.0]
+    assert set(series.fields) == {"cpu"}
+    (latest,) = database.get_lastest_timestamp()
+    assert latest.time == datetime.fromtimestamp(start + 1, tz=timezone.utc)
+    database.close()
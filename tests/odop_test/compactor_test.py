@@ -0,0 +1,121 @@
+import time
+
+import pytest
+
+from qoa4ml.config.configs import RetentionPolicyConfig
+from qoa4ml.observability.odop_obs import embedded_database
+from qoa4ml.observability.odop_obs.base_database import to_ns
+from qoa4ml.observability.odop_obs.columnar_database import ColumnarDatabase
+from qoa4ml.observability.odop_obs.compactor import Compactor
+from qoa4ml.observability.odop_obs.embedded_database import EmbeddedDatabase
+
+START = 1_700_000_010.0
+TAGS = {"type": "process", "metadata.pid": "1"}
+
+
+def fill(database, seconds: int) -> None:
+    database.insert_multiple(
+        [
+            (START + i, TAGS, {"cpu.usage.value": float(i), "cpu.usage.unit": 3})
+            for i in range(seconds)
+        ]
+    )
+
+
+def test_rollups_cascade_and_raw_points_expire(tmp_path):
+    raw = ColumnarDatabase(tmp_path / "raw", segment_size=10)
+    rollup_10s = ColumnarDatabase(tmp_path / "10s")
+    rollup_30s = ColumnarDatabase(tmp_path / "30s")
+    compactor = Compactor(
+        RetentionPolicyConfig(duration=20),
+        raw,
+        [
+            (RetentionPolicyConfig(resolution=10), rollup_10s),
+            (RetentionPolicyConfig(resolution=30), rollup_30s),
+        ],
+        "dot",
+        lag=5,
+    )
+    fill(raw, 65)
+    compactor.run_once(now=START + 65)
+
+    (series,) = rollup_10s.query_range(START, START + 100)
+    assert (series.timestamps / 1e9 - START).tolist() == [0, 10, 20, 30, 40, 50]
+    assert series.fields["cpu.usage.value.min"].tolist()[:2] == [0.0, 10.0]
+    assert series.fields["cpu.usage.value.max"].tolist()[:2] == [9.0, 19.0]
+    assert series.fields["cpu.usage.value.mean"].tolist()[:2] == [4.5, 14.5]
+    assert series.fields["cpu.usage.value.count"].tolist() == [10.0] * 6
+    assert series.fields["cpu.usage.unit"].tolist() == [3.0] * 6
+
+    (series,) = rollup_30s.query_range(START, START + 100)
+    assert (series.timestamps / 1e9 - START).tolist() == [0, 30]
+    assert series.fields["cpu.usage.value.mean"].tolist() == [14.5, 44.5]
+    assert series.fields["cpu.usage.value.count"].tolist() == [30.0, 30.0]
+
+    (series,) = raw.query_range(START, START + 100)
+    assert series.timestamps[0] / 1e9 - START == 45
+    assert len(series) == 20
+    # NOTE: the segment straddling the cutoff was rewritten, the expired ones removed
+    assert sum(1 for _ in (tmp_path / "raw" / "series_0").iterdir()) == 2
+
+    # NOTE: rolled up buckets aren't rolled up again, even by a new compactor
+    compactor.run_once(now=START + 65)
+    Compactor(
+        RetentionPolicyConfig(),
+        raw,
+        [(RetentionPolicyConfig(resolution=10), rollup_10s)],
+        "dot",
+        lag=5,
+    ).run_once(now=START + 65)
+    (series,) = rollup_10s.query_range(START, START + 100)
+    assert len(series) == 6
+
+
+def test_tinyflux_points_expire(tmp_path):
+    database = EmbeddedDatabase(tmp_path / "raw.csv")
+    fill(database, 10)
+    database.remove_before(START + 6)
+    (series,) = database.query_range(START, START + 100)
+    assert series.fields["cpu.usage.value"].tolist() == [6.0, 7.0, 8.0, 9.0]
+    database.close()
+
+
+def test_tinyflux_points_inserted_during_expiry_are_kept(tmp_path, monkeypatch):
+    database = EmbeddedDatabase(tmp_path / "raw.csv")
+    fill(database, 10)
+    read_lines = embedded_database.read_lines
+
+    def insert_while_reading(path, size):
+        # NOTE: the file is filtered without the lock, inserting meanwhile doesn't block
+        database.insert(START + 10, TAGS, {"cpu.usage.value": 10.0})
+        yield from read_lines(path, size)
+
+    monkeypatch.setattr(embedded_database, "read_lines", insert_while_reading)
+    database.remove_before(START + 6)
+    (series,) = database.query_range(START, START + 100)
+    assert series.fields["cpu.usage.value"].tolist() == [6.0, 7.0, 8.0, 9.0, 10.0]
+    database.close()
+
+
+@pytest.fixture
+def tokyo_time_zone(monkeypatch):
+    monkeypatch.setenv("TZ", "Asia/Tokyo")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_tinyflux_points_expire_outside_utc(tmp_path, tokyo_time_zone):
+    database = EmbeddedDatabase(tmp_path / "raw.csv")
+    fill(database, 10)
+    database.remove_before(START + 6)
+    (series,) = database.query_range(START + 7, START + 100)
+    assert series.timestamps[0] == to_ns(START + 7)
+    assert series.fields["cpu.usage.value"].tolist() == [7.0, 8.0, 9.0]
+    database.close()
+
+    reopened = EmbeddedDatabase(tmp_path / "raw.csv")
+    assert reopened.get_time_range() == (START + 6, START + 9)
+    assert not (tmp_path / "raw.csv.tmp").exists()
+    reopened.close()
@@ -0,0 +1,73 @@
+import time
+from datetime import datetime
+
+from qoa4ml.observability.odop_obs.embedded_database import EmbeddedDatabase
+
+
+def test_latest_point_of_each_series(tmp_path):
+    db_path = tmp_path / "node.csv"
+    database = EmbeddedDatabase(db_path)
+    now = time.time()
+    for i in range(5):
+        database.insert(now + i, {"type": "node", "node_name": "a"}, {"cpu": float(i)})
+        database.insert(now + i, {"type": "process", "pid": "1"}, {"cpu": float(-i)})
+    database.insert(now, {"type": "node", "node_name": "a"}, {"cpu": 100.0})
+
+    latest = {p.tags["type"]: p.fields["cpu"] for p in database.get_lastest_timestamp()}
+    assert latest == {"node": 4.0, "process": -4.0}
+
+    database.close()
+    reopened = EmbeddedDatabase(db_path)
+    latest = {p.tags["type"]: p.fields["cpu"] for p in reopened.get_lastest_timestamp()}
+    assert latest == {"node": 4.0, "process": -4.0}
+
+
+def test_stale_series_are_left_out(tmp_path):
+    database = EmbeddedDatabase(tmp_path / "node.csv", latest_ttl=10)
+    database.insert(time.time() - 60, {"type": "process", "pid": "1"}, {"cpu": 1.0})
+    database.insert(time.time(), {"type": "process", "pid": "2"}, {"cpu": 2.0})
+    (point,) = database.get_lastest_timestamp()
+    assert point.tags["pid"] == "2"
+
+
+def test_public_api_without_tinyflux_internals(tmp_path):
+    database = EmbeddedDatabase(tmp_path / "node.csv")
+    database.internals.available = False
+    start = 1_700_000_000.0
+    for i in (3, 1, 2, 0):
+        database.insert(start + i, {"type": "node"}, {"cpu": float(i)})
+    assert database.get_time_range() == (start, start + 3)
+
+    # NOTE: chunks may hold points past their bounds, which readers leave out
+    chunks = [
+        series.fields["cpu"][
+            (series.timestamps >= start_ns) & (series.timestamps < end_ns)
+        ].tolist()
+        for start_ns, end_ns, (series,) in database.iter_chunks(start, start + 3, 2)
+    ]
+    assert chunks == [[0.0, 1.0], [2.0, 3.0]]
+
+    database.remove_before(start + 2)
+    (series,) = database.query_range(start, start + 3)
+    assert series.fields["cpu"].tolist() == [2.0, 3.0]
+    database.close()
+
+
+def test_local_times_of_older_files_are_converted(tmp_path, monkeypatch):
+    monkeypatch.setenv("TZ", "Asia/Tokyo")
+    time.tzset()
+    try:
+        start = 1_700_000_000.0
+        db_path = tmp_path / "node.csv"
+        # NOTE: older versions wrote naive local times
+        local_time = datetime.fromtimestamp(start).isoformat()
+        db_path.write_text(f"{local_time},_default,t_type,node,f_cpu,1.0\r\n")
+
+        for _ in range(2):
+            database = EmbeddedDatabase(db_path)
+            assert database.get_time_range() == (start, start)
+            database.close()
+        assert (tmp_path / "node.csv.utc").exists()
+    finally:
+        monkeypatch.undo()
+        time.tzset()
@@ -0,0 +1,84 @@
+import pytest
+
+from qoa4ml.lang.datamodel_enum import DatabaseBackendEnum, ExportFormatEnum
+from qoa4ml.observability.odop_obs.columnar_database import ColumnarDatabase
+from qoa4ml.observability.odop_obs.embedded_database import EmbeddedDatabase
+from qoa4ml.observability.odop_obs.export import (
+    iter_export,
+    iter_record_batches,
+    main,
+)
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+START = 1_700_000_000.0
+
+
+@pytest.fixture(params=list(DatabaseBackendEnum))
+def database(tmp_path, request):
+    if request.param == DatabaseBackendEnum.columnar:
+        database = ColumnarDatabase(tmp_path / "node", segment_size=7)
+    else:
+        database = EmbeddedDatabase(tmp_path / "node")
+    # NOTE: the later points are inserted first, TinyFlux then rebuilds its index when reading
+    for seconds in (range(10, 20), range(10)):
+        database.insert_multiple(
+            [
+                (
+                    START + i,
+                    {"type": "process", "metadata.pid": pid},
+                    {"cpu.usage.value": float(i), "cpu.usage.unit": 3},
+                )
+                for i in seconds
+                for pid in ("1", "2")
+            ]
+        )
+    yield database
+    database.close()
+
+
+def test_arrow_stream_covers_every_point_once(database):
+    batches = iter_record_batches(
+        database, START, START + 19, {"metadata.pid": "2"}, chunk_seconds=6
+    )
+    payload = b"".join(iter_export(batches, ExportFormatEnum.arrow))
+    table = pa.ipc.open_stream(payload).read_all()
+
+    assert table.num_rows == 40
+    assert table.schema.field("timestamp").type == pa.timestamp("ns", tz="UTC")
+    values = [
+        row["value"] for row in table.to_pylist() if row["field"] == "cpu.usage.value"
+    ]
+    assert values == [float(i) for i in range(20)]
+    assert dict(table.column("tags")[0].as_py()) == {
+        "type": "process",
+        "metadata.pid": "2",
+    }
+
+
+def test_cli_writes_parquet(database, tmp_path):
+    backend = (
+        DatabaseBackendEnum.columnar
+        if isinstance(database, ColumnarDatabase)
+        else DatabaseBackendEnum.tinyflux
+    )
+    database.close()
+    output = tmp_path / "node.parquet"
+    main(
+        [
+            str(tmp_path / "node"),
+            str(output),
+            "--backend",
+            backend.value,
+            "--field",
+            "cpu.usage.value",
+            "--start",
+            str(START + 10),
+        ]
+    )
+    table = pq.read_table(output)
+    assert table.num_rows == 20
+    assert sorted(table.column("value").to_pylist()) == sorted(
+        [float(i) for i in range(10, 20)] * 2
+    )
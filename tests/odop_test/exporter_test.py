@@ -0,0 +1,46 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from qoa4ml.config.configs import ExporterConfig
+from qoa4ml.lang.datamodel_enum import DatabaseBackendEnum
+from qoa4ml.observability.odop_obs.exporter import Exporter
+
+
+@pytest.mark.parametrize("backend", list(DatabaseBackendEnum))
+def test_buffered_points_are_written_on_shutdown(tmp_path, backend):
+    config = ExporterConfig(
+        host="127.0.0.1",
+        port=0,
+        node_aggregator={
+            "socket_collector_config": {
+                "host": "127.0.0.1",
+                "port": 0,
+                "backlog": 5,
+                "bufsize": 4096,
+            },
+            "environment": "HPC",
+            "query_method": "GET",
+            "data_separator": "dot",
+            "unit_conversion": {"cpu": {"usage": {"percentage": 3}}},
+            "database_backend": backend,
+            "write_flush_interval": 3600,
+        },
+    )
+    exporter = Exporter(config, tmp_path)
+    aggregator = exporter.node_aggregator
+    now = time.time()
+    with TestClient(exporter.app):
+        for i in range(5):
+            aggregator.write_buffer.add(
+                now - 5 + i, {"type": "process"}, {"cpu.usage.value": float(i)}
+            )
+        assert aggregator.write_buffer.get_stats()["pending"] == 5
+
+    database = aggregator.create_database(aggregator.node_name, None)
+    try:
+        (series,) = database.query_range(now - 10, now)
+        assert list(series.fields["cpu.usage.value"]) == [0.0, 1.0, 2.0, 3.0, 4.0]
+    finally:
+        database.close()
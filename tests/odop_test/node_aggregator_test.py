@@ -0,0 +1,256 @@
+import json
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from qoa4ml.config.configs import NodeAggregatorConfig
+from qoa4ml.lang.datamodel_enum import DatabaseBackendEnum
+from qoa4ml.observability.odop_obs.node_aggregator import NodeAggregator
+from qoa4ml.reports.resources_report_model import CgroupPressureReport, ProcessReport
+
+config = NodeAggregatorConfig(
+    socket_collector_config={
+        "host": "127.0.0.1",
+        "port": 0,
+        "backlog": 5,
+        "bufsize": 4096,
+    },
+    environment="HPC",
+    query_method="GET",
+    data_separator="dot",
+    unit_conversion={"cpu": {"usage": {"percentage": 3}}, "mem": {"Mb": 2}},
+    database_backend="columnar",
+)
+
+
+@pytest.fixture(params=list(DatabaseBackendEnum))
+def client(tmp_path, request):
+    aggregator = NodeAggregator(
+        config.model_copy(update={"database_backend": request.param}), tmp_path
+    )
+    now = time.time()
+    for i in range(10):
+        for pid in ("1", "2"):
+            aggregator.embedded_database.insert(
+                now - 10 + i,
+                {"type": "process", "metadata.pid": pid},
+                {"cpu.usage.value": float(i * int(pid)), "cpu.usage.unit": 3},
+            )
+    app = FastAPI()
+    app.include_router(aggregator.router)
+    yield TestClient(app)
+    aggregator.embedded_database.close()
+
+
+def test_range_of_one_process(client):
+    response = client.get(
+        "/metrics/range",
+        params={
+            "window": 5.5,
+            "tags": ["metadata.pid=2"],
+            "fields": ["cpu.usage.value", "cpu.usage.unit"],
+        },
+    )
+    assert response.status_code == 200
+    (series,) = response.json()
+    assert series["tags"] == {"type": "process", "metadata": {"pid": "2"}}
+    assert series["fields"]["cpu"]["usage"]["value"] == [10.0, 12.0, 14.0, 16.0, 18.0]
+    assert series["fields"]["cpu"]["usage"]["unit"] == "percentage"
+    assert len(series["timestamps"]) == 5
+
+
+def test_aggregates_per_process(client):
+    response = client.get(
+        "/metrics/aggregate", params={"function": "MAX", "window": 60}
+    )
+    maxima = {
+        series["tags"]["metadata"]["pid"]: series["fields"]["cpu"]["usage"]["value"]
+        for series in response.json()
+    }
+    assert maxima == {"1": 9.0, "2": 18.0}
+
+    response = client.get(
+        "/metrics/aggregate",
+        params={
+            "function": "PERCENTILE",
+            "percentile": 50,
+            "window": 60,
+            "tags": ["metadata.pid=1"],
+        },
+    )
+    (series,) = response.json()
+    assert series["count"] == 10
+    assert series["fields"]["cpu"]["usage"]["value"] == 4.5
+
+
+def test_invalid_queries_are_rejected(client):
+    assert client.get("/metrics/range").status_code == 400
+    response = client.get(
+        "/metrics/aggregate", params={"function": "PERCENTILE", "window": 60}
+    )
+    assert response.status_code == 400
+
+
+def test_reports_are_written_in_batches(tmp_path):
+    aggregator = NodeAggregator(
+        config.model_copy(update={"write_batch_size": 3}), tmp_path
+    )
+    now = time.time()
+    for i in range(4):
+        aggregator.process_report(
+            json.dumps(
+                {
+                    "type": "process",
+                    "metadata": {"pid": "7"},
+                    "timestamp": now - 4 + i,
+                    "cpu": {"usage": {"value": float(i), "unit": "percentage"}},
+                }
+            )
+        )
+    (series,) = aggregator.embedded_database.query_range(now - 10, now)
+    assert series.fields["cpu.usage.value"].tolist() == [0.0, 1.0, 2.0]
+    assert aggregator.write_buffer.get_stats()["pending"] == 1
+    # NOTE: the latest point is known before its batch is written
+    (latest,) = aggregator.embedded_database.get_lastest_timestamp()
+    assert latest.fields["cpu.usage.value"] == 3.0
+
+    aggregator.flush()
+    (series,) = aggregator.embedded_database.query_range(now - 10, now)
+    assert series.fields["cpu.usage.value"].tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert series.fields["cpu.usage.unit"].tolist() == [3.0] * 4
+    aggregator.embedded_database.close()
+
+
+def test_pressure_reports_are_stored_per_cgroup(tmp_path):
+    aggregator = NodeAggregator(config, tmp_path)
+    point = aggregator.normalize_report(
+        {
+            "type": "pressure",
+            "metadata": {"cgroup": "/job_1"},
+            "timestamp": 1_700_000_000,
+            "pressure": {"cpu": {"some": 25.0, "full": 0.0}},
+            "cpu": {"stat": {"nr_throttled": 5.0, "throttled_ratio": 0.25}},
+            "memory": {"events": {"oom_kill": 0.0}},
+            "io": {},
+        }
+    )
+    assert point == (
+        1_700_000_000,
+        {"type": "cgroup", "metadata.cgroup": "/job_1"},
+        {
+            "pressure.cpu.some": 25.0,
+            "pressure.cpu.full": 0.0,
+            "cpu.stat.nr_throttled": 5.0,
+            "cpu.stat.throttled_ratio": 0.25,
+            "memory.events.oom_kill": 0.0,
+        },
+    )
+    aggregator.embedded_database.close()
+
+
+def test_prometheus_payload_is_cached_until_new_points(tmp_path):
+    aggregator = NodeAggregator(config, tmp_path)
+    aggregator.node_name = "node-1"
+    app = FastAPI()
+    app.include_router(aggregator.router)
+    client = TestClient(app)
+    tags = {"type": "process", "metadata.pid": "12"}
+    aggregator.embedded_database.insert(
+        time.time(), tags, {"cpu.usage.value": 12.5, "cpu.usage.unit": 3}
+    )
+
+    response = client.get("/metrics/prometheus")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert response.text == (
+        "# TYPE odop_cpu_usage_value gauge\n"
+        'odop_cpu_usage_value{node="node-1",type="process",pid="12",unit="percentage"} 12.5\n'
+    )
+    payload = aggregator.prometheus_payload
+    client.get("/metrics/prometheus")
+    assert aggregator.prometheus_payload is payload
+
+    aggregator.embedded_database.insert(
+        time.time(), tags, {"cpu.usage.value": 50.0, "cpu.usage.unit": 3}
+    )
+    assert "} 50.0\n" in client.get("/metrics/prometheus").text
+    aggregator.embedded_database.close()
+
+
+def test_stream_sends_the_selected_fields_with_their_units(tmp_path):
+    aggregator = NodeAggregator(config, tmp_path)
+    app = FastAPI()
+    app.include_router(aggregator.router)
+    client = TestClient(app)
+
+    def ingest():
+        deadline = time.time() + 5
+        while not aggregator.subscriptions.subscribers and time.time() < deadline:
+            time.sleep(0.01)
+        aggregator.process_report(
+            json.dumps(
+                {
+                    "type": "process",
+                    "metadata": {"pid": "7"},
+                    "timestamp": 1_700_000_000,
+                    "cpu": {"usage": {"value": 12.5, "unit": "percentage"}},
+                    "mem": {"rss": {"value": 100.0, "unit": "Mb"}},
+                }
+            )
+        )
+        # NOTE: the test client returns once the stream ends
+        aggregator.subscriptions.close()
+
+    thread = threading.Thread(target=ingest)
+    thread.start()
+    response = client.get(
+        "/metrics/stream",
+        params={"tags": ["metadata.pid=7"], "fields": ["cpu.usage.value"]},
+    )
+    thread.join()
+    aggregator.embedded_database.close()
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    (event,) = [event for event in response.text.split("\n\n") if event]
+    name, data = event.split("\n")
+    assert name == "event: metric"
+    point = json.loads(data.removeprefix("data: "))
+    assert point["cpu"] == {"usage": {"value": 12.5, "unit": "percentage"}}
+    assert "mem" not in point
+
+
+def test_edge_reports_are_parsed_with_the_report_models(tmp_path):
+    aggregator = NodeAggregator(
+        config.model_copy(update={"environment": "Edge"}), tmp_path
+    )
+    process = ProcessReport(
+        metadata={"pid": "7", "user": "odop"},
+        timestamp=1_700_000_000,
+        cpu={"usage": {"value": 12.5, "unit": "percentage"}},
+        mem={"usage": {"value": 100.0, "unit": "Mb"}},
+    ).model_dump()
+    assert aggregator.normalize_report(process) == (
+        1_700_000_000,
+        {"type": "process", "metadata.pid": "7", "metadata.user": "odop"},
+        {
+            "cpu.usage.value": 12.5,
+            "cpu.usage.unit": 3,
+            "mem.usage.value": 100.0,
+            "mem.usage.unit": 2,
+        },
+    )
+    pressure = CgroupPressureReport(
+        metadata={"cgroup": "/job_1"},
+        timestamp=1_700_000_000,
+        pressure={"cpu": {"some": 25.0}},
+        cpu={},
+        memory={},
+        io={},
+    ).model_dump()
+    point = aggregator.normalize_report(pressure)
+    assert point[1] == {"type": "cgroup", "metadata.cgroup": "/job_1"}
+    assert point[2] == {"pressure.cpu.some": 25.0}
+    assert aggregator.normalize_report({"timestamp": 1}) is None
+    aggregator.embedded_database.close()
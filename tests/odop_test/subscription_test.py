@@ -0,0 +1,47 @@
+import asyncio
+import json
+import threading
+
+from qoa4ml.observability.odop_obs.subscription import Subscriber, SubscriptionHub
+
+
+def render(timestamp: float, tags: dict, fields: dict) -> dict:
+    return {"timestamp": timestamp, **tags, **fields}
+
+
+def test_slow_subscribers_get_the_latest_point_of_each_series():
+    async def scenario():
+        hub = SubscriptionHub()
+        subscriber = Subscriber(
+            asyncio.get_running_loop(),
+            tags={"type": "process"},
+            fields=["cpu"],
+            buffer_size=2,
+        )
+        hub.subscribe(subscriber)
+        events = subscriber.events(render, heartbeat=5)
+
+        def ingest():
+            hub.publish(1.0, {"type": "node"}, {"cpu": 1.0})
+            for timestamp, pid in ((1.0, "1"), (2.0, "1"), (3.0, "2"), (4.0, "3")):
+                hub.publish(
+                    timestamp, {"type": "process", "pid": pid}, {"cpu": 5.0, "mem": 1.0}
+                )
+
+        thread = threading.Thread(target=ingest)
+        thread.start()
+        thread.join()
+        received = [await events.__anext__() for _ in range(3)]
+        hub.unsubscribe(subscriber)
+        await events.aclose()
+        return received, hub.subscribers
+
+    received, subscribers = asyncio.run(scenario())
+    # NOTE: pid 1 was replaced by its newer point, then evicted by pid 3
+    assert received[0] == "event: dropped\ndata: 2\n\n"
+    points = [json.loads(event.split("data: ")[1]) for event in received[1:]]
+    assert points == [
+        {"timestamp": 3.0, "type": "process", "pid": "2", "cpu": 5.0},
+        {"timestamp": 4.0, "type": "process", "pid": "3", "cpu": 5.0},
+    ]
+    assert subscribers == ()
@@ -0,0 +1,33 @@
+from qoa4ml.observability.odop_obs.unit_converter import UnitConverter
+
+unit_conversion = {
+    "cpu": {"usage": {"milicpu": 1, "cputime": 2, "percentage": 3}},
+    "gpu": {"usage": {"percentage": 1}},
+    "mem": {"Gb": 1, "Mb": 2, "Kb": 3},
+    "frequency": {"GHz": 1, "MHz": 2},
+}
+
+
+def test_convert_and_revert_round_trip():
+    converter = UnitConverter(unit_conversion)
+    report = {
+        "cpu.usage.value": 12.5,
+        "cpu.usage.unit": "percentage",
+        "cpu.metadata.frequency.unit": "GHz",
+        "cpu.metadata.model": "x86",
+        "gpu.usage.mem.unit": "Mb",
+        "mem.usage.unit": "Kb",
+    }
+    for _ in range(2):
+        converted = converter.convert(dict(report))
+        assert converted == {
+            "cpu.usage.value": 12.5,
+            "cpu.usage.unit": 3,
+            "cpu.metadata.frequency.unit": 1,
+            "cpu.metadata.model": "x86",
+            "gpu.usage.mem.unit": 2,
+            "mem.usage.unit": 3,
+        }
+        assert converter.revert(converted) == report
+    assert len(converter.convert_plans) == 1
+    assert len(converter.revert_plans) == 1
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import os
+import socket
+
+from qoa4ml.async_qoa_client import AsyncQoaClient
+from qoa4ml.connector.async_base_connector import (
+    AsyncBaseConnector,
+    AsyncConnectorAdapter,
+)
+from qoa4ml.connector.socket_connector import SocketConnector
+from qoa4ml.utils.framing import FrameReader
+
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+
+class RecordingConnector(AsyncBaseConnector):
+    def __init__(self):
+        self.reports = []
+
+    async def send_report(self, body_message: str) -> None:
+        await asyncio.sleep(0)
+        self.reports.append(json.loads(body_message))
+
+
+def test_async_report_with_debug_connector():
+    async def main():
+        async with AsyncQoaClient(
+            config_path=f"{dir_path}/config/client.yaml"
+        ) as client:
+            client.observe_metric("test", 1.0)
+            return await client.report(submit=True)
+
+    report = asyncio.run(main())
+    assert "test" in report["service"]["gateway"]["metrics"]
+
+
+def test_concurrent_requests_have_separate_reports():
+    client = AsyncQoaClient(config_path=f"{dir_path}/config/client.yaml")
+    connector = RecordingConnector()
+    client.connector_list = {"recording": connector}
+    client.default_connector = "recording"
+
+    async def handle_request(i: int):
+        client.observe_metric("request", i)
+        await asyncio.sleep(0.01)
+        client.observe_inference({"value": i})
+        await client.report(submit=True)
+
+    async def main():
+        await client.start()
+        await asyncio.gather(*(handle_request(i) for i in range(20)))
+        await client.close()
+
+    asyncio.run(main())
+    assert len(connector.reports) == 20
+    for report in connector.reports:
+        metric = report["service"]["gateway"]["metrics"]["request"]
+        (recorded,) = metric.values()
+        (inference,) = report["ml_inference"].values()
+        assert inference["prediction"]["value"] == recorded["records"][0]
+
+
+def test_requests_have_separate_timers_and_reports():
+    client = AsyncQoaClient(config_path=f"{dir_path}/config/client.yaml")
+    connector = RecordingConnector()
+    client.connector_list = {"recording": connector}
+    client.default_connector = "recording"
+
+    async def handle_request(i: int):
+        async with client.request():
+            client.timer()
+            await asyncio.sleep(0.01 * i)
+            client.observe_metric("request", i)
+            client.timer()
+            await client.report(submit=True, connectors=["recording", "missing"])
+
+    async def main():
+        # NOTE: the tasks copy a context where the parent already started a report and a timer
+        client.observe_metric("parent", 1)
+        client.timer()
+        await asyncio.gather(*(handle_request(i) for i in range(1, 4)))
+        assert client.timer_start is not None
+        parent = await client.report(reset=False)
+        assert "request" not in parent["service"]["gateway"]["metrics"]
+
+    asyncio.run(main())
+    assert len(connector.reports) == 3
+    for report in connector.reports:
+        metrics = report["service"]["gateway"]["metrics"]
+        assert "parent" not in metrics
+        (recorded,) = metrics["request"].values()
+        (response_time,) = metrics["response_time"].values()
+        i = recorded["records"][0]
+        assert response_time["records"][0]["responseTime"] >= 0.01 * i
+
+
+def test_blocking_connectors_run_in_a_worker_thread():
+    server = socket.create_server(("127.0.0.1", 0))
+    config = {
+        "client": {"stage_id": "gateway", "functionality": "REST"},
+        "connector": [
+            {
+                "name": "socket_connector",
+                "connector_class": "socket",
+                "config": {"host": "127.0.0.1", "port": server.getsockname()[1]},
+            }
+        ],
+    }
+    client = AsyncQoaClient(config_dict=config)
+    connector = client.connector_list["socket_connector"]
+    assert isinstance(connector, AsyncConnectorAdapter)
+    assert isinstance(connector.connector, SocketConnector)
+
+    async def main():
+        async with client:
+            client.observe_metric("test", 1.0)
+            await client.report(submit=True)
+
+    asyncio.run(main())
+    peer, _ = server.accept()
+    reader = FrameReader(4096, 1 << 20)
+    (body,) = reader.read(peer)
+    assert "test" in json.loads(body)["service"]["gateway"]["metrics"]
+    peer.close()
+    server.close()
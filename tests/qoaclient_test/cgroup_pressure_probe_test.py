@@ -0,0 +1,82 @@
+import json
+import time
+
+import pytest
+
+from qoa4ml.config.configs import ClientConfig
+from qoa4ml.probes.cgroup_pressure_probe import CgroupPressureProbe
+
+
+def write_counters(cgroup, stall_us, throttled, oom_kills, rbytes):
+    for resource in ("cpu", "memory"):
+        (cgroup / f"{resource}.pressure").write_text(
+            f"some avg10=0.00 avg60=0.00 avg300=0.00 total={stall_us}\n"
+            f"full avg10=0.00 avg60=0.00 avg300=0.00 total={stall_us // 2}\n"
+        )
+    (cgroup / "cpu.stat").write_text(
+        f"usage_usec 1000\nnr_periods {throttled * 4}\nnr_throttled {throttled}\n"
+        f"throttled_usec {throttled * 100}\n"
+    )
+    (cgroup / "memory.events").write_text(
+        f"low 0\nhigh 0\nmax 0\noom 0\noom_kill {oom_kills}\n"
+    )
+    (cgroup / "io.stat").write_text(
+        f"8:0 rbytes={rbytes} wbytes=0 rios=1 wios=0\n"
+        f"8:16 rbytes={rbytes} wbytes=0 rios=1 wios=0\n"
+    )
+
+
+@pytest.fixture
+def cgroup(tmp_path):
+    proc = tmp_path / "proc" / "self"
+    proc.mkdir(parents=True)
+    (proc / "cgroup").write_text("0::/job_1\n")
+    (proc / "mountinfo").write_text(
+        "30 1 0:26 / /sys/fs/cgroup rw - cgroup2 cgroup2 rw,nsdelegate\n"
+    )
+    cgroup = tmp_path / "cgroup" / "job_1"
+    cgroup.mkdir(parents=True)
+    write_counters(cgroup, stall_us=0, throttled=0, oom_kills=0, rbytes=0)
+    return tmp_path
+
+
+def test_pressure_probe_reports_rates_between_ticks(cgroup):
+    config = ClientConfig(
+        client={},
+        probes=[
+            {
+                "probe_type": "pressure",
+                "frequency": 1,
+                "require_register": False,
+                "log_latency_flag": False,
+                "environment": "HPC",
+                "procfs_root": str(cgroup / "proc"),
+                "cgroupfs_root": str(cgroup / "cgroup"),
+            }
+        ],
+    ).probes[0]
+    probe = CgroupPressureProbe(config, None)
+    assert probe.cgroup == "/job_1"
+    assert "io.pressure" not in probe.files
+
+    write_counters(
+        cgroup / "cgroup" / "job_1",
+        stall_us=500_000,
+        throttled=10,
+        oom_kills=2,
+        rbytes=1000,
+    )
+    # NOTE: the previous tick was two seconds ago
+    probe.last_sample = time.monotonic() - 2.0
+    report = json.loads(probe.create_report())
+
+    assert report["type"] == "pressure"
+    assert report["metadata"] == {"cgroup": "/job_1"}
+    assert report["pressure"]["cpu"]["some"] == pytest.approx(25.0, rel=0.01)
+    assert report["pressure"]["memory"]["full"] == pytest.approx(12.5, rel=0.01)
+    assert "io" not in report["pressure"]
+    assert report["cpu"]["stat"]["nr_throttled"] == pytest.approx(5.0, rel=0.01)
+    assert report["cpu"]["stat"]["throttled_ratio"] == pytest.approx(0.25)
+    assert report["cpu"]["stat"]["usage_usec"] == 0.0
+    assert report["memory"]["events"]["oom_kill"] == pytest.approx(1.0, rel=0.01)
+    assert report["io"]["stat"]["rbytes"] == pytest.approx(1000.0, rel=0.01)
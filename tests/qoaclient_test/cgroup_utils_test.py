@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from qoa4ml.lang.datamodel_enum import CgroupVersionEnum
+from qoa4ml.utils import qoa_utils
+
+V1_MOUNT = "35 25 0:30 / /sys/fs/cgroup/memory rw - cgroup cgroup rw,memory\n"
+V2_MOUNT = "30 25 0:26 / /sys/fs/cgroup/unified rw - cgroup2 cgroup2 rw\n"
+
+
+@pytest.mark.parametrize(
+    "mounts, version",
+    [
+        (V2_MOUNT, CgroupVersionEnum.v2),
+        (V1_MOUNT + V2_MOUNT, CgroupVersionEnum.v1),
+        ("", CgroupVersionEnum.v1),
+    ],
+)
+def test_cgroup_version_from_mountinfo(tmp_path, mounts, version):
+    (tmp_path / "self").mkdir()
+    (tmp_path / "self" / "mountinfo").write_text(
+        "22 1 259:1 / / rw,relatime shared:1 - ext4 /dev/root rw\n" + mounts
+    )
+    assert qoa_utils.get_cgroup_version(str(tmp_path)) == version
+
+
+def test_memory_limit_is_read_again_when_modified(tmp_path, monkeypatch):
+    limit_file = tmp_path / "memory.max"
+    limit_file.write_text("1000\n")
+    monkeypatch.setattr(
+        qoa_utils, "get_memory_limit_file", lambda *args: str(limit_file)
+    )
+    assert qoa_utils.get_process_allowed_memory() == 1000
+
+    # NOTE: same modification times, the cached limit is returned
+    stat = os.stat(limit_file)
+    limit_file.write_text("2000\n")
+    os.utime(limit_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert qoa_utils.get_process_allowed_memory() == 1000
+
+    os.utime(limit_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert qoa_utils.get_process_allowed_memory() == 2000
+    (tmp_path / "task_0").mkdir()
+    (tmp_path / "task_1").mkdir()
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2))
+    assert qoa_utils.get_process_allowed_memory() == 1000
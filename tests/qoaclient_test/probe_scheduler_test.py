@@ -0,0 +1,64 @@
+import threading
+import time
+
+from qoa4ml.config.configs import ProbeConfig, ProbeSchedulerConfig
+from qoa4ml.probes.probe import Probe
+from qoa4ml.probes.probe_scheduler import ProbeScheduler
+
+
+class RecordingConnector:
+    def __init__(self) -> None:
+        self.reports = []
+        self.lock = threading.Lock()
+
+    def send_report(self, report):
+        with self.lock:
+            self.reports.append(report)
+
+
+class SleepingProbe(Probe):
+    def __init__(self, name, frequency, duration, priority, connector):
+        config = ProbeConfig(
+            probe_type=name,
+            frequency=frequency,
+            require_register=False,
+            log_latency_flag=False,
+            priority=priority,
+        )
+        super().__init__(config, connector)
+        self.name = name
+        self.duration = duration
+
+    def create_report(self):
+        time.sleep(self.duration)
+        return self.name
+
+
+def test_scheduler_counts_overruns_and_keeps_the_schedule():
+    connector = RecordingConnector()
+    scheduler = ProbeScheduler(ProbeSchedulerConfig(num_workers=2, jitter=0.1))
+    scheduler.add_probe(SleepingProbe("fast", 20, 0.0, 0, connector), "fast")
+    scheduler.add_probe(SleepingProbe("slow", 20, 0.12, 0, connector), "slow")
+    scheduler.start()
+    time.sleep(2.2)
+    scheduler.stop()
+    stats = scheduler.get_stats()
+
+    # NOTE: the first tick is on the next whole second, leaving at least 1.2 seconds of 50 ms ticks
+    assert stats["fast"]["runs"] >= 20
+    assert stats["fast"]["overruns"] == 0
+    assert stats["slow"]["overruns"] == stats["slow"]["runs"] > 0
+    assert stats["slow"]["skipped_ticks"] >= stats["slow"]["runs"]
+    assert connector.reports.count("fast") == stats["fast"]["runs"]
+
+
+def test_scheduler_runs_higher_priority_first():
+    connector = RecordingConnector()
+    scheduler = ProbeScheduler(ProbeSchedulerConfig(num_workers=1))
+    for priority in range(3):
+        scheduler.add_probe(SleepingProbe(f"p{priority}", 1, 0.0, priority, connector))
+    scheduler.start()
+    time.sleep(1.5)
+    scheduler.stop()
+
+    assert connector.reports[:3] == ["p2", "p1", "p0"]
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+import time
+
+import psutil
+
+from qoa4ml.utils.process_tree import ProcessTreeTracker
+
+
+def test_tracker_reports_child_cpu_deltas_and_follows_churn():
+    tracker = ProcessTreeTracker(psutil.Process(), refresh_interval=3600)
+    child = subprocess.Popen([sys.executable, "-c", "while True: pass"])
+    try:
+        # NOTE: new children are only looked for on refresh
+        assert tracker.sample()["child_process"] == 0
+        tracker.refresh()
+        time.sleep(0.5)
+        usage = tracker.sample()
+        assert usage["child_process"] == 1
+        assert usage["unit"] == "percentage"
+        assert usage["value"]["child_0"] > 20
+        assert usage["total"] >= usage["value"]["child_0"]
+    finally:
+        child.kill()
+        child.wait()
+
+    # NOTE: reaping the child changes the children CPU times, which triggers a refresh
+    assert tracker.sample()["child_process"] == 0
+    assert tracker.children == {}
+
+
+def test_reaped_children_cpu_is_reported():
+    tracker = ProcessTreeTracker(psutil.Process(), refresh_interval=3600)
+    code = "import time\nend = time.time() + 0.5\nwhile time.time() < end: pass"
+    # NOTE: the child starts and exits between two samples, it is never tracked
+    subprocess.run([sys.executable, "-c", code], check=True)
+    usage = tracker.sample()
+    assert usage["child_process"] == 0
+    assert usage["reaped"] > 20
+    assert usage["total"] >= usage["reaped"] + usage["main_process"] - 1e-9
@@ -0,0 +1,101 @@
+import os
+
+import psutil
+import pytest
+
+from qoa4ml.utils.procfs_reader import CLOCK_TICKS, PAGE_SIZE, ProcfsReader
+
+MEMINFO = """MemTotal:       16000000 kB
+MemFree:         4000000 kB
+MemAvailable:   10000000 kB
+Buffers:          200000 kB
+"""
+PID_STAT = (
+    "42 (my (odd) worker) S 1 42 42 0 -1 4194304 100 0 0 0 {utime} {stime} 7 3 "
+    "20 0 4 0 1000 {vsize} {rss} 18446744073709551615"
+)
+
+
+def write_stat(root, cores):
+    lines = ["cpu  0 0 0 0 0 0 0 0 0 0"] + [
+        f"cpu{index} {user} 0 {system} {idle} {iowait} 0 0 0 0 0"
+        for index, (user, system, idle, iowait) in enumerate(cores)
+    ]
+    (root / "stat").write_text("\n".join([*lines, "intr 1 2 3", "ctxt 99"]) + "\n")
+
+
+@pytest.fixture
+def fake_procfs(tmp_path):
+    root = tmp_path / "proc"
+    (root / "42").mkdir(parents=True)
+    (root / "self").mkdir()
+    write_stat(root, [(100, 100, 800, 0), (0, 0, 1000, 0)])
+    (root / "meminfo").write_text(MEMINFO)
+    (root / "42" / "stat").write_text(
+        PID_STAT.format(utime=250, stime=50, vsize=8192000, rss=1000)
+    )
+    (root / "self" / "cgroup").write_text("0::/job_1/task_0\n")
+    (root / "self" / "mountinfo").write_text(
+        "30 1 0:26 / /sys/fs/cgroup rw,nosuid - cgroup2 cgroup2 rw,nsdelegate\n"
+    )
+    cgroup = tmp_path / "cgroup" / "job_1"
+    cgroup.mkdir(parents=True)
+    (cgroup / "memory.max").write_text("2147483648\n")
+    (cgroup / "task_0").mkdir()
+    (cgroup / "task_1").mkdir()
+    reader = ProcfsReader(str(root), str(tmp_path / "cgroup"))
+    yield root, reader
+    reader.close()
+
+
+def test_procfs_reader_parses_a_fake_procfs(fake_procfs):
+    root, reader = fake_procfs
+
+    # NOTE: the files stay open, rewriting them in place is seen by the next read
+    write_stat(root, [(150, 150, 850, 50), (0, 0, 1100, 0)])
+    assert reader.system_cpu_util() == {"core_0": 50.0, "core_1": 0.0}
+    assert reader.system_cpu_util() == {"core_0": 0.0, "core_1": 0.0}
+
+    assert reader.system_memory() == {
+        "total": 16000000 * 1024,
+        "available": 10000000 * 1024,
+        "used": 6000000 * 1024,
+        "free": 4000000 * 1024,
+    }
+    assert reader.process_cpu_times(42) == (
+        250 / CLOCK_TICKS,
+        50 / CLOCK_TICKS,
+        7 / CLOCK_TICKS,
+        3 / CLOCK_TICKS,
+    )
+    assert reader.process_memory(42) == {"rss": 1000 * PAGE_SIZE, "vms": 8192000}
+    assert reader.memory_limit() == 2147483648 / 2
+
+
+@pytest.mark.skipif(not os.path.isfile("/proc/self/stat"), reason="needs procfs")
+def test_procfs_reader_matches_psutil():
+    reader = ProcfsReader()
+    process = psutil.Process()
+    memory = reader.process_memory(os.getpid())
+    assert memory["vms"] == pytest.approx(process.memory_info().vms, rel=0.01)
+    assert reader.system_memory()["total"] == psutil.virtual_memory().total
+    assert len(reader.system_cpu_util()) == len(psutil.cpu_percent(percpu=True))
+    reader.close()
+
+
+def test_memory_limit_follows_the_cgroup_of_the_process(fake_procfs, tmp_path):
+    root, reader = fake_procfs
+    assert reader.memory_limit() == 2147483648 / 2
+
+    # NOTE: a missing limit file is looked for again once the process moves
+    (root / "self" / "cgroup").write_text("0::/job_2\n")
+    assert reader.memory_limit() is None
+    job = tmp_path / "cgroup" / "job_2"
+    job.mkdir()
+    (job / "memory.max").write_text("1000\n")
+    assert reader.memory_limit() == 1000
+
+    # NOTE: a task added to the job changes the share of each task
+    (job / "task_0").mkdir()
+    (job / "task_1").mkdir()
+    assert reader.memory_limit() == 500
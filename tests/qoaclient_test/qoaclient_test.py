@@ -1,6 +1,9 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from random import random
 
+import pytest
+
 from qoa4ml.qoa_client import QoaClient
 from qoa4ml.reports.ml_reports import MLReport
 
@@ -54,3 +57,49 @@ def test_submiting_custom_report():
         "test": "123456",
     }
     qoa_client.report(report=report, submit=True)
+
+
+def test_request_scopes_in_parallel():
+    qoa_client = QoaClient(
+        report_cls=MLReport, config_path=f"{dir_path}/config/client.yaml"
+    )
+
+    def handle_request(i):
+        with qoa_client.request_scope(corr_id=str(i)) as scope:
+            scope.timer()
+            scope.observe_metric("request", i)
+            scope.observe_inference(float(i))
+            scope.timer()
+            return scope.report(submit=False)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        reports = list(executor.map(handle_request, range(64)))
+
+    for i, report in enumerate(reports):
+        assert report["metadata"]["corr_id"] == str(i)
+        (metric,) = report["service"]["gateway"]["metrics"]["request"].values()
+        assert metric["records"] == [i]
+        (inference,) = report["ml_inference"].values()
+        assert inference["prediction"] == float(i)
+    assert not qoa_client.qoa_report.report.service
+
+
+def test_request_scope_is_reported_when_the_request_raises():
+    qoa_client = QoaClient(
+        report_cls=MLReport, config_path=f"{dir_path}/config/client.yaml"
+    )
+    submitted = []
+    qoa_client.asyn_report = lambda body, connectors=None: submitted.append(body)
+    with pytest.raises(ValueError):
+        with qoa_client.request_scope(corr_id="failed") as scope:
+            scope.observe_metric("request", 1)
+            raise ValueError("request failed")
+    (body,) = submitted
+    assert '"corr_id":"failed"' in body
+
+    # NOTE: an observation the report rejects is raised on submit and leaves nothing behind
+    with pytest.raises(ValueError):
+        with qoa_client.request_scope(submit=False) as scope:
+            scope.observe_metric("leak", 1, category=2)
+    assert not qoa_client.scope_report.report.service
+    assert not qoa_client.scope_report.pending_records
@@ -0,0 +1,99 @@
+import gc
+import threading
+
+from qoa4ml.config.configs import ReportSenderConfig
+from qoa4ml.connector.base_connector import BaseConnector
+from qoa4ml.utils.report_sender import ReportSender
+
+
+class RecordingConnector(BaseConnector):
+    def __init__(self):
+        self.batches = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.sending = threading.Event()
+
+    def send_report(self, body_message: str):
+        self.send_report_batch([body_message])
+
+    def send_report_batch(self, body_messages: list[str]) -> None:
+        self.sending.set()
+        self.gate.wait()
+        self.batches.append(body_messages)
+
+    @property
+    def reports(self):
+        return [report for batch in self.batches for report in batch]
+
+
+def make_sender(**kwargs):
+    connector = RecordingConnector()
+    return ReportSender(ReportSenderConfig(**kwargs), {"test": connector}), connector
+
+
+def fill_while_blocked(sender, connector, count):
+    connector.gate.clear()
+    sender.submit("test", "in flight")
+    # wait until the worker holds the first report so the queue state is deterministic
+    assert connector.sending.wait(5)
+    for i in range(count):
+        sender.submit("test", str(i))
+    connector.gate.set()
+    sender.close()
+
+
+def test_reports_are_coalesced_and_flushed_on_close():
+    sender, connector = make_sender(batch_size=50)
+    connector.gate.clear()
+    for i in range(120):
+        sender.submit("test", str(i))
+    connector.gate.set()
+    sender.close()
+    assert connector.reports == [str(i) for i in range(120)]
+    assert len(connector.batches) < 120
+    assert sender.sent == 120
+
+
+def test_drop_oldest_policy():
+    sender, connector = make_sender(queue_size=3, overflow_policy="drop_oldest")
+    fill_while_blocked(sender, connector, 5)
+    assert connector.reports == ["in flight", "2", "3", "4"]
+    assert sender.dropped == 2
+
+
+def test_drop_newest_policy():
+    sender, connector = make_sender(queue_size=3, overflow_policy="drop_newest")
+    fill_while_blocked(sender, connector, 5)
+    assert connector.reports == ["in flight", "0", "1", "2"]
+    assert sender.dropped == 2
+
+
+def test_block_policy_with_timeout():
+    sender, connector = make_sender(
+        queue_size=2, overflow_policy="block", block_timeout=0.01
+    )
+    fill_while_blocked(sender, connector, 3)
+    assert connector.reports == ["in flight", "0", "1"]
+    assert sender.dropped == 1
+
+
+def test_unknown_connector_is_dropped():
+    sender, connector = make_sender()
+    assert not sender.submit("missing", "report")
+    sender.close()
+    assert sender.dropped == 1
+    assert not sender.submit("test", "after close")
+    assert connector.reports == []
+
+
+def test_unused_sender_is_collected_and_its_threads_stopped():
+    sender, connector = make_sender(num_workers=2)
+    sender.submit("test", "report")
+    sender.flush(5)
+    workers = sender.workers
+    del sender
+    gc.collect()
+    for worker in workers:
+        worker.join(5)
+        assert not worker.is_alive()
+    assert connector.reports == ["report"]
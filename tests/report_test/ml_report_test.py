@@ -0,0 +1,78 @@
+import uuid
+
+import pytest
+from pydantic import ValidationError
+
+from qoa4ml.config.configs import ClientInfo
+from qoa4ml.lang.common_models import Metric
+from qoa4ml.lang.datamodel_enum import ReportTypeEnum
+from qoa4ml.reports.ml_reports import MLReport
+from qoa4ml.reports.rohe_reports import RoheReport
+
+client_info = ClientInfo(
+    name="report_test",
+    instance_id=str(uuid.uuid4()),
+    stage_id="gateway",
+    functionality="REST",
+)
+
+
+def observe(report):
+    report.observe_metric(
+        ReportTypeEnum.service,
+        "gateway",
+        Metric(metric_name="response_time", records=[0.1]),
+    )
+    report.observe_inference({"value": 1.0})
+
+
+def test_ml_report_is_handed_off_on_reset():
+    report = MLReport(client_info)
+    observe(report)
+    active = report.report
+    generated = report.generate_report(reset=True)
+    assert generated is active
+    assert report.report is not active
+    assert not report.report.service and not report.report.ml_inference
+    assert "gateway" in generated.service
+
+
+def test_ml_report_is_copied_without_reset():
+    report = MLReport(client_info)
+    observe(report)
+    generated = report.generate_report(reset=False)
+    assert generated is not report.report
+    report.observe_metric(
+        ReportTypeEnum.data, "gateway", Metric(metric_name="missing", records=[1])
+    )
+    assert not generated.data
+
+
+def test_rohe_report_is_handed_off_on_reset():
+    report = RoheReport(client_info)
+    observe(report)
+    active = report.report
+    generated = report.generate_report(reset=True)
+    assert generated is active
+    assert generated.execution_graph.end_point.id == uuid.UUID(client_info.instance_id)
+    assert report.report.inference_report is None
+    assert not report.inference_report.service
+    second = report.generate_report(reset=True)
+    assert second is not generated
+    assert "gateway" in generated.inference_report.service
+
+
+def test_recorded_metrics_are_added_on_generation():
+    report = MLReport(client_info)
+    for value in (0.3, 0.2, 0.1):
+        report.record_metric(ReportTypeEnum.service, "gateway", "response_time", value)
+    with pytest.raises(ValidationError):
+        report.record_metric(ReportTypeEnum.data, "gateway", 123, 1.0)
+    assert len(report.pending_records) == 1
+    assert not report.report.service
+    generated = report.generate_report(reset=True)
+    metric = generated.service["gateway"].metrics["response_time"]
+    (recorded,) = metric.values()
+    assert recorded.records == [0.1]
+    assert not generated.data
+    assert not report.pending_records